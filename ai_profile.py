@@ -0,0 +1,193 @@
+import hashlib
+import json
+import threading
+
+import requests
+
+OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+JOB_PROFILE_MODEL = "anthropic/claude-3-haiku"
+
+
+def build_job_profile_prompt(role_name, job_level, role_purpose, benchmark_context=""):
+    return f"""
+        Create a comprehensive job profile for a {role_name} position at {job_level} level.
+
+        ROLE PURPOSE: {role_purpose}
+
+        {benchmark_context}
+
+        Format your response EXACTLY like this structure:
+
+        Job requirements
+        • [specific technical skill 1]
+        • [specific technical skill 2]
+        • [specific tool or technology]
+        • [required experience or qualification]
+
+        Job description
+        [1-2 sentences describing the role's core purpose and daily activities]
+
+        Key competencies
+        1. [Technical skill category]: [specific tools/technologies]
+        2. [Analytical skill category]: [specific methodologies]
+        3. [Business skill category]: [specific applications]
+        4. [Soft skill category]: [specific behaviors]
+
+        Be specific, practical, and focus on actionable skills for a {job_level} level {role_name}.
+        """
+
+
+def build_job_profile_request(prompt):
+    """Request body untuk OpenRouter chat completions"""
+    return {
+        "model": JOB_PROFILE_MODEL,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "max_tokens": 800,
+        "temperature": 0.7
+    }
+
+
+def job_profile_fingerprint(data):
+    """Hash stabil dari model, parameter dan prompt (request body)"""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def request_headers(api_key):
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "http://localhost:8501",
+        "X-Title": "AI Talent Dashboard"
+    }
+
+
+def fallback_job_profile(role_name, role_purpose):
+    """Template job profile jika API tidak tersedia"""
+    return f"""Job requirements
+• Technical expertise in {role_name.lower()} domain
+• Data analysis and interpretation skills
+• Problem-solving and critical thinking
+• Communication and collaboration abilities
+
+Job description
+You will be responsible for {role_purpose.lower()} using technical skills and business acumen to drive data-informed decisions.
+
+Key competencies
+1. Technical: Relevant tools and technologies for {role_name}
+2. Analytical: Data-driven decision making and insights generation
+3. Business: Stakeholder management and requirement gathering
+4. Soft skills: Team collaboration and communication"""
+
+
+class StreamInterrupted(Exception):
+    """Stream SSE berhenti sebelum completion selesai"""
+
+
+def iter_completion_deltas(response):
+    """Parse OpenRouter SSE stream dan yield potongan teks (delta.content)"""
+    finished = False
+    for raw_line in response.iter_lines():
+        line = raw_line.decode('utf-8') if isinstance(raw_line, bytes) else raw_line
+        # Baris kosong memisahkan event; ':' adalah comment / keep-alive
+        if not line or line.startswith(':') or not line.startswith('data:'):
+            continue
+
+        payload = line[len('data:'):].strip()
+        if payload == '[DONE]':
+            finished = True
+            break
+
+        chunk = json.loads(payload)
+        if 'error' in chunk:
+            raise StreamInterrupted(chunk['error'].get('message', 'stream error'))
+
+        choice = chunk['choices'][0]
+        content = (choice.get('delta') or {}).get('content')
+        if content:
+            yield content
+        if choice.get('finish_reason'):
+            finished = True
+
+    if not finished:
+        raise StreamInterrupted("stream ended before completion finished")
+
+
+def stream_job_profile(api_key, role_name, job_level, role_purpose, benchmark_context="",
+                       api_url=OPENROUTER_API_URL, timeout=60, cache=None, pin=False):
+    """Streaming mode: yield snapshot teks profile yang sudah diterima sejauh ini.
+
+    Jika stream gagal (di awal maupun di tengah), snapshot terakhir adalah
+    fallback template. Hanya completion yang lengkap yang disimpan di cache.
+    """
+    prompt = build_job_profile_prompt(role_name, job_level, role_purpose, benchmark_context)
+    data = build_job_profile_request(prompt)
+
+    fingerprint = job_profile_fingerprint(data)
+    if cache is not None:
+        cached = cache.get(fingerprint)
+        if cached is not None:
+            if pin:
+                cache.pin(fingerprint)
+            yield cached
+            return
+
+    text = ""
+    try:
+        with requests.post(api_url, headers=request_headers(api_key), json={**data, "stream": True},
+                           stream=True, timeout=timeout) as response:
+            if response.status_code != 200:
+                yield fallback_job_profile(role_name, role_purpose)
+                return
+
+            for delta in iter_completion_deltas(response):
+                text += delta
+                yield text
+    except Exception:
+        yield fallback_job_profile(role_name, role_purpose)
+        return
+
+    if not text:
+        yield fallback_job_profile(role_name, role_purpose)
+        return
+
+    if cache is not None:
+        cache.put(fingerprint, text, pinned=pin)
+
+
+class StreamBuffer:
+    """Snapshot terakhir dari stream yang dikonsumsi di background thread"""
+
+    def __init__(self, text=""):
+        self._text = text
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def text(self):
+        with self._lock:
+            return self._text
+
+    def set_text(self, text):
+        with self._lock:
+            self._text = text
+
+    def consume(self, snapshots):
+        for text in snapshots:
+            self.set_text(text)
+        self._done.set()
+
+    def finish(self, text):
+        self.set_text(text)
+        self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
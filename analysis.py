@@ -0,0 +1,97 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+# =============================================================================
+# ANALYSIS SESSIONS: hasil analysis per session, di-render ulang tanpa recompute
+# =============================================================================
+
+
+def analysis_key(**inputs):
+    """ID analysis dari semua input yang mempengaruhi hasil; input sama -> ID sama"""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+class Analysis:
+    """Satu analysis yang sudah selesai: input, ranking, tabel dan AI job profile.
+
+    ``ai_stream`` adalah StreamBuffer dari background LLM call; jika rerun
+    terjadi sebelum stream selesai, render berikutnya melanjutkan dari buffer
+    yang sama tanpa memanggil LLM lagi.
+    """
+
+    def __init__(self, analysis_id, inputs, baseline, ranking, rankings, ai_stream=None, **artifacts):
+        self.analysis_id = analysis_id
+        self.inputs = inputs
+        self.baseline = baseline
+        self.ranking = ranking
+        self.rankings = rankings
+        self.ai_stream = ai_stream
+        # Turunan yang mahal (talent table, insights markdown) dihitung sekali
+        self.artifacts = artifacts
+        self.created_at = time.time()
+
+    @property
+    def ai_profile(self):
+        return None if self.ai_stream is None else self.ai_stream.text
+
+    def label(self):
+        """Display string untuk history picker, mis. 'Data Analyst - Senior (2 benchmarks, 14:05:31)'"""
+        stamp = time.strftime('%H:%M:%S', time.localtime(self.created_at))
+        title = ' - '.join(str(self.inputs[key]) for key in ('role_name', 'job_level') if self.inputs.get(key))
+        benchmarks = len(self.inputs.get('benchmark_ids') or [])
+        return f"{title or self.analysis_id} ({benchmarks} benchmarks, {stamp})"
+
+
+class AnalysisStore:
+    """Bounded LRU store analysis_id -> Analysis untuk satu Streamlit session.
+
+    ``active`` adalah analysis yang sedang ditampilkan; store bertahan lintas
+    rerun karena disimpan di ``st.session_state``.
+    """
+
+    def __init__(self, max_entries=5):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.active_id = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, analysis_id):
+        return analysis_id in self._entries
+
+    def get(self, analysis_id):
+        analysis = self._entries.get(analysis_id)
+        if analysis is not None:
+            self._entries.move_to_end(analysis_id)
+        return analysis
+
+    def put(self, analysis):
+        """Simpan analysis dan jadikan active; analysis paling lama tidak dipakai dibuang"""
+        self._entries[analysis.analysis_id] = analysis
+        self._entries.move_to_end(analysis.analysis_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.active_id = analysis.analysis_id
+        return analysis
+
+    def activate(self, analysis_id):
+        analysis = self.get(analysis_id)
+        if analysis is not None:
+            self.active_id = analysis_id
+        return analysis
+
+    @property
+    def active(self):
+        return self._entries.get(self.active_id)
+
+    def ids(self):
+        """Analysis IDs, terbaru dulu"""
+        return sorted(self._entries, key=lambda analysis_id: self._entries[analysis_id].created_at, reverse=True)
+
+    def clear(self):
+        self._entries.clear()
+        self.active_id = None
@@ -1,13 +1,22 @@
 import streamlit as st
-import psycopg2
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import requests
-import json
-import uuid
-from plotly.subplots import make_subplots
-import numpy as np
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import ai_profile
+from ai_profile import OPENROUTER_API_URL, StreamBuffer
+from analysis import Analysis, AnalysisStore, analysis_key
+from batch import load_vacancy_benchmarks, match_vacancies, write_match_results
+from cache import JobProfileCache, RankingCache, ranking_cache_key
+from charts import (create_benchmark_comparison_radar, create_match_rate_distribution, create_tgv_correlation_heatmap,
+                    create_tgv_heatmap_comparison, create_tgv_strengths_gaps_chart)
+from db import ConnectionPool
+from directory import EmployeeDirectory, load_employee_directory
+from features import source_data_version
+from insights import build_ranked_talent_table, generate_detailed_insights
+from pipeline import load_scoring_engine
+from scoring import TGV_COLUMNS, TGV_NAMES, IncrementalBaseline, PopulationStats, compile_weights
+from streaming import prepare_feature_source, stream_baseline, stream_ranking
 
 # Initialize session state
 if 'role_info_generated' not in st.session_state:
@@ -27,962 +36,395 @@ if 'job_details' not in st.session_state:
         'competencies': [""]
     }
 
-# DB Connection
-try:
-    conn = psycopg2.connect(
-        host=st.secrets["postgres"]["host"],
-        port=st.secrets["postgres"]["port"],
-        database=st.secrets["postgres"]["database"],
-        user=st.secrets["postgres"]["user"],
-        password=st.secrets["postgres"]["password"],
-        sslmode="require",
-        client_encoding='utf8'
+# DB Connection pool: dibuat sekali per server process, di-share semua session
+@st.cache_resource(show_spinner=False)
+def get_db_pool():
+    """Bounded connection pool ke Supabase dengan health check dan reconnect"""
+    config = st.secrets["postgres"]
+    return ConnectionPool(
+        config,
+        minconn=1,
+        maxconn=int(config.get("pool_size", 10))
     )
+
+try:
+    get_db_pool()
 except Exception as e:
     st.error(f"Database connection failed: {e}")
     st.stop()
 
-# Helper functions
-def get_employee_options():
+# Employee directory: di-load sekali per TTL, search dilakukan di server
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_employee_directory():
+    """Directory + search index (name, position, ID) untuk benchmark picker"""
+    with get_db_pool().connection() as conn:
+        return EmployeeDirectory(load_employee_directory(conn))
+
+def search_employee_options(query, selected, limit=50):
+    """Employee IDs untuk multiselect: pilihan saat ini + hasil type-ahead search"""
     try:
-        query = """
-        SELECT e.employee_id, e.fullname, p.name as position
-        FROM employees e
-        LEFT JOIN dim_positions p ON e.position_id = p.position_id
-        WHERE e.fullname IS NOT NULL
-        """
-        df = pd.read_sql(query, conn)
-        return [f"{row['fullname']} - {row['position']} ({row['employee_id']})" for _, row in df.iterrows()]
+        directory = get_employee_directory()
     except Exception as e:
         st.error(f"Error loading employees: {e}")
-        return []
-
-def extract_employee_ids(selections):
-    return [sel.split('(')[-1].strip(')') for sel in selections]
+        return list(selected), str
+
+    matches = directory.search(query, limit=limit) if query else []
+    options = list(selected) + [employee_id for employee_id in matches if employee_id not in selected]
+    return options, directory.label
+
+# Scoring engine: TV/TGV matrix untuk seluruh employee, di-load sekali per TTL
+@st.cache_resource(ttl=600, show_spinner=False)
+def get_scoring_engine():
+    """Load raw employee features sekali dan bangun vectorized TGV scoring engine"""
+    engine = load_scoring_engine(get_db_pool(), get_population_stats())
+    # Hasil ranking dari data versi lama tidak boleh dipakai lagi
+    get_ranking_cache().discard_stale(engine.data_version)
+    return engine
+
+# Kolom organisasi yang punya TGV correlation per grup
+CORRELATION_GROUP_COLUMNS = ('directorate', 'grade')
+
+# Population TGV statistics: bertahan lintas reload engine, di-sync incremental
+@st.cache_resource(show_spinner=False)
+def get_population_stats():
+    return PopulationStats(group_columns=CORRELATION_GROUP_COLUMNS)
+
+# Result cache ranking lintas session: key = benchmark set + data version
+@st.cache_resource(show_spinner=False)
+def get_ranking_cache():
+    return RankingCache(max_bytes=256 * 1024 * 1024, ttl=1800)
+
+# Incremental baseline per session: pilihan benchmark biasanya berubah satu per satu
+def get_incremental_baseline(engine, weights=None):
+    """IncrementalBaseline milik session ini (dibuat ulang jika data version / weights berubah)"""
+    fingerprint = (engine.data_version, None if weights is None else weights.fingerprint)
+    state = st.session_state.get('incremental_baseline')
+    if state is None or state[0] != fingerprint:
+        state = (fingerprint, IncrementalBaseline(engine, weights=weights))
+        st.session_state.incremental_baseline = state
+    return state[1]
 
 # TGV Baseline Computation dengan mapping yang dikoreksi
-def compute_tgv_baselines(benchmark_ids):
+def compute_tgv_baselines(benchmark_ids, weights=None):
     """Compute TGV baselines menggunakan mapping 8 TGV dan 38 TV yang dikoreksi"""
     if not benchmark_ids:
         return {}
     
-    query = """
-    WITH employee_data AS (
-        SELECT 
-            e.employee_id,
-            pp.disc,
-            pp.mbti,
-            pp.gtq,
-            pp.tiki,
-            pp.iq,
-            pp.pauli,
-            -- Get PAPI scores as key-value pairs
-            MAX(CASE WHEN ps.scale_code = 'Papi_T' THEN ps.score::numeric ELSE NULL END) as papi_t,
-            MAX(CASE WHEN ps.scale_code = 'Papi_E' THEN ps.score::numeric ELSE NULL END) as papi_e,
-            MAX(CASE WHEN ps.scale_code = 'Papi_I' THEN ps.score::numeric ELSE NULL END) as papi_i,
-            MAX(CASE WHEN ps.scale_code = 'Papi_C' THEN ps.score::numeric ELSE NULL END) as papi_c,
-            MAX(CASE WHEN ps.scale_code = 'Papi_D' THEN ps.score::numeric ELSE NULL END) as papi_d,
-            MAX(CASE WHEN ps.scale_code = 'Papi_Z' THEN ps.score::numeric ELSE NULL END) as papi_z,
-            MAX(CASE WHEN ps.scale_code = 'Papi_L' THEN ps.score::numeric ELSE NULL END) as papi_l,
-            MAX(CASE WHEN ps.scale_code = 'Papi_P' THEN ps.score::numeric ELSE NULL END) as papi_p,
-            MAX(CASE WHEN ps.scale_code = 'Papi_A' THEN ps.score::numeric ELSE NULL END) as papi_a,
-            MAX(CASE WHEN ps.scale_code = 'Papi_S' THEN ps.score::numeric ELSE NULL END) as papi_s,
-            -- Get strengths as flags
-            MAX(CASE WHEN s.theme = 'Adaptability' THEN 1 ELSE 0 END) as strength_adaptability,
-            MAX(CASE WHEN s.theme = 'Connectedness' THEN 1 ELSE 0 END) as strength_connectedness,
-            MAX(CASE WHEN s.theme = 'Analytical' THEN 1 ELSE 0 END) as strength_analytical,
-            MAX(CASE WHEN s.theme = 'Strategic' THEN 1 ELSE 0 END) as strength_strategic,
-            MAX(CASE WHEN s.theme = 'Deliberative' THEN 1 ELSE 0 END) as strength_deliberative,
-            MAX(CASE WHEN s.theme = 'Discipline' THEN 1 ELSE 0 END) as strength_discipline,
-            MAX(CASE WHEN s.theme = 'Futuristic' THEN 1 ELSE 0 END) as strength_futuristic,
-            MAX(CASE WHEN s.theme = 'Ideation' THEN 1 ELSE 0 END) as strength_ideation,
-            MAX(CASE WHEN s.theme = 'Belief' THEN 1 ELSE 0 END) as strength_belief,
-            MAX(CASE WHEN s.theme = 'Arranger' THEN 1 ELSE 0 END) as strength_arranger,
-            MAX(CASE WHEN s.theme = 'Command' THEN 1 ELSE 0 END) as strength_command,
-            MAX(CASE WHEN s.theme = 'Self-Assurance' THEN 1 ELSE 0 END) as strength_self_assurance,
-            MAX(CASE WHEN s.theme = 'Developer' THEN 1 ELSE 0 END) as strength_developer,
-            MAX(CASE WHEN s.theme = 'Achiever' THEN 1 ELSE 0 END) as strength_achiever,
-            MAX(CASE WHEN s.theme = 'Communication' THEN 1 ELSE 0 END) as strength_communication,
-            MAX(CASE WHEN s.theme = 'Woo' THEN 1 ELSE 0 END) as strength_woo,
-            MAX(CASE WHEN s.theme = 'Relator' THEN 1 ELSE 0 END) as strength_relator
-        FROM employees e
-        LEFT JOIN profiles_psych pp ON e.employee_id = pp.employee_id
-        LEFT JOIN papi_scores ps ON e.employee_id = ps.employee_id
-        LEFT JOIN strengths s ON e.employee_id = s.employee_id
-        WHERE e.employee_id = ANY(%s)
-        GROUP BY e.employee_id, pp.disc, pp.mbti, pp.gtq, pp.tiki, pp.iq, pp.pauli
-    ),
-    tgv_calculations AS (
-        SELECT 
-            employee_id,
-            
-            -- 1. Adaptability & Stress Tolerance (4 TV)
-            (
-                COALESCE((CASE WHEN disc = 'S' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_t/10, 0) +
-                COALESCE(papi_e/10, 0) +
-                COALESCE(strength_adaptability, 0)
-            ) / 4 AS adaptability_stress,
-            
-            -- 2. Cognitive Complexity & Problem-Solving (7 TV)
-            (
-                COALESCE(gtq::numeric/100, 0) +
-                COALESCE(tiki::numeric/100, 0) +
-                COALESCE(iq::numeric/100, 0) +
-                COALESCE(papi_i/10, 0) +
-                COALESCE(strength_connectedness, 0) +
-                COALESCE(strength_analytical, 0) +
-                COALESCE(strength_strategic, 0)
-            ) / 7 AS cognitive_complexity,
-            
-            -- 3. Conscientiousness & Reliability (5 TV)
-            (
-                COALESCE((CASE WHEN disc = 'C' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_c/10, 0) +
-                COALESCE(papi_d/10, 0) +
-                COALESCE(strength_deliberative, 0) +
-                COALESCE(strength_discipline, 0)
-            ) / 5 AS conscientiousness,
-            
-            -- 4. Creativity & Innovation Orientation (4 TV)
-            (
-                COALESCE((CASE WHEN mbti LIKE '%%N%%' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_z/10, 0) +
-                COALESCE(strength_futuristic, 0) +
-                COALESCE(strength_ideation, 0)
-            ) / 4 AS creativity_innovation,
-            
-            -- 5. Cultural & Values Urgency (1 TV)
-            COALESCE(strength_belief, 0) AS cultural_values,
-            
-            -- 6. Leadership & Influence (9 TV)
-            (
-                COALESCE((CASE WHEN mbti LIKE 'E%%' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE((CASE WHEN mbti LIKE 'I%%' THEN 0.5 ELSE 0.0 END), 0) +
-                COALESCE((CASE WHEN disc = 'D' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_l/10, 0) +
-                COALESCE(papi_p/10, 0) +
-                COALESCE(strength_arranger, 0) +
-                COALESCE(strength_command, 0) +
-                COALESCE(strength_self_assurance, 0) +
-                COALESCE(strength_developer, 0)
-            ) / 9 AS leadership_influence,
-            
-            -- 7. Motivation & Drive (3 TV)
-            (
-                COALESCE(pauli::numeric/100, 0) +
-                COALESCE(papi_a/10, 0) +
-                COALESCE(strength_achiever, 0)
-            ) / 3 AS motivation_drive,
-            
-            -- 8. Social Orientation & Collaboration (5 TV)
-            (
-                COALESCE((CASE WHEN disc = 'I' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_s/10, 0) +
-                COALESCE(strength_communication, 0) +
-                COALESCE(strength_woo, 0) +
-                COALESCE(strength_relator, 0)
-            ) / 5 AS social_orientation
-            
-        FROM employee_data
-    )
-    SELECT 
-        AVG(adaptability_stress) as adaptability_stress,
-        AVG(cognitive_complexity) as cognitive_complexity,
-        AVG(conscientiousness) as conscientiousness,
-        AVG(creativity_innovation) as creativity_innovation,
-        AVG(cultural_values) as cultural_values,
-        AVG(leadership_influence) as leadership_influence,
-        AVG(motivation_drive) as motivation_drive,
-        AVG(social_orientation) as social_orientation,
-        COUNT(*) as benchmark_count
-    FROM tgv_calculations
-    """
-    
     try:
-        df = pd.read_sql(query, conn, params=(benchmark_ids,))
-        if df.empty or df.isnull().all().all():
+        # Hanya benchmark yang ditambah / dihapus sejak run sebelumnya yang dihitung
+        incremental = get_incremental_baseline(get_scoring_engine(), weights)
+        incremental.sync(benchmark_ids)
+        baseline_dict = incremental.baseline_dict()
+        if not baseline_dict:
             st.warning("No psychometric data found for selected benchmarks")
             return {}
         
-        baseline_dict = df.iloc[0].to_dict()
         return baseline_dict
         
     except Exception as e:
         st.error(f"Error computing TGV baselines: {e}")
         return {}
 
-# Get ranked talent dengan mapping TGV yang dikoreksi - SEMUA EMPLOYEE
-def get_ranked_talent_with_tv_tgv_details(baseline_dict):
-    """Get ranked talent menggunakan mapping 8 TGV dan 38 TV yang dikoreksi untuk SEMUA EMPLOYEE"""
+# Jumlah kandidat teratas untuk chart dan insights (ranked list di-page dari Ranking)
+RANKING_TOP_K = 500
+
+# Ranking object: scores semua employee dihitung sekali, halaman diambil on demand
+def get_talent_ranking(baseline_dict, weights=None, filters=None):
+    """Score SEMUA EMPLOYEE (atau subset grade / directorate) terhadap baseline; return Ranking"""
+    if not baseline_dict:
+        return None
+    
+    try:
+        return get_scoring_engine().ranking(baseline_dict, weights, filters)
+    except Exception as e:
+        st.error(f"Error ranking employees with TGV mapping: {e}")
+        return None
+
+# Filtered top-K kecil (live preview): nearest-neighbour query di TGV index
+def get_filtered_talent(baseline_dict, filters, top_k=RANKING_TOP_K, weights=None):
+    """Top-K kandidat terdekat ke baseline di dalam subset grade / directorate"""
     if not baseline_dict:
         return pd.DataFrame()
     
-    query = """
-    WITH employee_data AS (
-        SELECT 
-            e.employee_id,
-            e.fullname,
-            p.name as position,
-            d.name as department,
-            div.name as division,
-            dir.name as directorate,
-            g.name as grade,
-            pp.disc,
-            pp.mbti,
-            pp.gtq,
-            pp.tiki,
-            pp.iq,
-            pp.pauli,
-            -- Get PAPI scores as key-value pairs
-            MAX(CASE WHEN ps.scale_code = 'Papi_T' THEN ps.score::numeric ELSE NULL END) as papi_t,
-            MAX(CASE WHEN ps.scale_code = 'Papi_E' THEN ps.score::numeric ELSE NULL END) as papi_e,
-            MAX(CASE WHEN ps.scale_code = 'Papi_I' THEN ps.score::numeric ELSE NULL END) as papi_i,
-            MAX(CASE WHEN ps.scale_code = 'Papi_C' THEN ps.score::numeric ELSE NULL END) as papi_c,
-            MAX(CASE WHEN ps.scale_code = 'Papi_D' THEN ps.score::numeric ELSE NULL END) as papi_d,
-            MAX(CASE WHEN ps.scale_code = 'Papi_Z' THEN ps.score::numeric ELSE NULL END) as papi_z,
-            MAX(CASE WHEN ps.scale_code = 'Papi_L' THEN ps.score::numeric ELSE NULL END) as papi_l,
-            MAX(CASE WHEN ps.scale_code = 'Papi_P' THEN ps.score::numeric ELSE NULL END) as papi_p,
-            MAX(CASE WHEN ps.scale_code = 'Papi_A' THEN ps.score::numeric ELSE NULL END) as papi_a,
-            MAX(CASE WHEN ps.scale_code = 'Papi_S' THEN ps.score::numeric ELSE NULL END) as papi_s,
-            -- Get strengths as flags
-            MAX(CASE WHEN s.theme = 'Adaptability' THEN 1 ELSE 0 END) as strength_adaptability,
-            MAX(CASE WHEN s.theme = 'Connectedness' THEN 1 ELSE 0 END) as strength_connectedness,
-            MAX(CASE WHEN s.theme = 'Analytical' THEN 1 ELSE 0 END) as strength_analytical,
-            MAX(CASE WHEN s.theme = 'Strategic' THEN 1 ELSE 0 END) as strength_strategic,
-            MAX(CASE WHEN s.theme = 'Deliberative' THEN 1 ELSE 0 END) as strength_deliberative,
-            MAX(CASE WHEN s.theme = 'Discipline' THEN 1 ELSE 0 END) as strength_discipline,
-            MAX(CASE WHEN s.theme = 'Futuristic' THEN 1 ELSE 0 END) as strength_futuristic,
-            MAX(CASE WHEN s.theme = 'Ideation' THEN 1 ELSE 0 END) as strength_ideation,
-            MAX(CASE WHEN s.theme = 'Belief' THEN 1 ELSE 0 END) as strength_belief,
-            MAX(CASE WHEN s.theme = 'Arranger' THEN 1 ELSE 0 END) as strength_arranger,
-            MAX(CASE WHEN s.theme = 'Command' THEN 1 ELSE 0 END) as strength_command,
-            MAX(CASE WHEN s.theme = 'Self-Assurance' THEN 1 ELSE 0 END) as strength_self_assurance,
-            MAX(CASE WHEN s.theme = 'Developer' THEN 1 ELSE 0 END) as strength_developer,
-            MAX(CASE WHEN s.theme = 'Achiever' THEN 1 ELSE 0 END) as strength_achiever,
-            MAX(CASE WHEN s.theme = 'Communication' THEN 1 ELSE 0 END) as strength_communication,
-            MAX(CASE WHEN s.theme = 'Woo' THEN 1 ELSE 0 END) as strength_woo,
-            MAX(CASE WHEN s.theme = 'Relator' THEN 1 ELSE 0 END) as strength_relator,
-            -- Strengths (Top 3)
-            (SELECT STRING_AGG(theme, ', ' ORDER BY rank) 
-             FROM strengths s2 
-             WHERE s2.employee_id = e.employee_id AND s2.rank <= 3) as top_strengths,
-            -- Performance Rating
-            (SELECT rating FROM performance_yearly py 
-             WHERE py.employee_id = e.employee_id 
-             ORDER BY year DESC LIMIT 1) as latest_performance
-        FROM employees e
-        LEFT JOIN profiles_psych pp ON e.employee_id = pp.employee_id
-        LEFT JOIN papi_scores ps ON e.employee_id = ps.employee_id
-        LEFT JOIN strengths s ON e.employee_id = s.employee_id
-        LEFT JOIN dim_positions p ON e.position_id = p.position_id
-        LEFT JOIN dim_departments d ON e.department_id = d.department_id
-        LEFT JOIN dim_divisions div ON e.division_id = div.division_id
-        LEFT JOIN dim_directorates dir ON e.directorate_id = dir.directorate_id
-        LEFT JOIN dim_grades g ON e.grade_id = g.grade_id
-        WHERE e.fullname IS NOT NULL
-        GROUP BY e.employee_id, e.fullname, p.name, d.name, div.name, dir.name, g.name, 
-                 pp.disc, pp.mbti, pp.gtq, pp.tiki, pp.iq, pp.pauli
-    ),
-    tgv_calculations AS (
-        SELECT 
-            *,
-            -- Calculate each TGV score menggunakan mapping yang dikoreksi
-            -- 1. Adaptability & Stress Tolerance (4 TV)
-            (
-                COALESCE((CASE WHEN disc = 'S' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_t/10, 0) +
-                COALESCE(papi_e/10, 0) +
-                COALESCE(strength_adaptability, 0)
-            ) / 4 AS tv_adaptability,
-            
-            -- 2. Cognitive Complexity & Problem-Solving (7 TV)
-            (
-                COALESCE(gtq::numeric/100, 0) +
-                COALESCE(tiki::numeric/100, 0) +
-                COALESCE(iq::numeric/100, 0) +
-                COALESCE(papi_i/10, 0) +
-                COALESCE(strength_connectedness, 0) +
-                COALESCE(strength_analytical, 0) +
-                COALESCE(strength_strategic, 0)
-            ) / 7 AS tv_cognitive,
-            
-            -- 3. Conscientiousness & Reliability (5 TV)
-            (
-                COALESCE((CASE WHEN disc = 'C' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_c/10, 0) +
-                COALESCE(papi_d/10, 0) +
-                COALESCE(strength_deliberative, 0) +
-                COALESCE(strength_discipline, 0)
-            ) / 5 AS tv_conscientiousness,
-            
-            -- 4. Creativity & Innovation Orientation (4 TV)
-            (
-                COALESCE((CASE WHEN mbti LIKE '%%N%%' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_z/10, 0) +
-                COALESCE(strength_futuristic, 0) +
-                COALESCE(strength_ideation, 0)
-            ) / 4 AS tv_creativity,
-            
-            -- 5. Cultural & Values Urgency (1 TV)
-            COALESCE(strength_belief, 0) AS tv_cultural_values,
-            
-            -- 6. Leadership & Influence (9 TV)
-            (
-                COALESCE((CASE WHEN mbti LIKE 'E%%' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE((CASE WHEN mbti LIKE 'I%%' THEN 0.5 ELSE 0.0 END), 0) +
-                COALESCE((CASE WHEN disc = 'D' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_l/10, 0) +
-                COALESCE(papi_p/10, 0) +
-                COALESCE(strength_arranger, 0) +
-                COALESCE(strength_command, 0) +
-                COALESCE(strength_self_assurance, 0) +
-                COALESCE(strength_developer, 0)
-            ) / 9 AS tv_leadership,
-            
-            -- 7. Motivation & Drive (3 TV)
-            (
-                COALESCE(pauli::numeric/100, 0) +
-                COALESCE(papi_a/10, 0) +
-                COALESCE(strength_achiever, 0)
-            ) / 3 AS tv_motivation,
+    try:
+        return get_scoring_engine().nearest(baseline_dict, k=top_k, filters=filters, weights=weights)
+    except Exception as e:
+        st.error(f"Error searching filtered candidates: {e}")
+        return pd.DataFrame()
+
+# Streaming mode ([ranking] streaming = true di secrets): populasi tidak pernah di-load utuh
+def get_streaming_config():
+    """(enabled, chunk_size) dari st.secrets; untuk container kecil dengan tabel besar"""
+    config = st.secrets.get("ranking", {})
+    return bool(config.get("streaming", False)), int(config.get("chunk_size", 5000))
+
+def get_streaming_data_version():
+    """Data version source tables (write counters) untuk streaming mode, setelah feature store di-refresh"""
+    with get_db_pool().connection() as conn:
+        prepare_feature_source(conn)
+        return source_data_version(conn)
+
+def run_streaming_matching(benchmark_ids, weights=None, chunk_size=5000):
+    """Baseline + top-K via server-side cursor; memory terbatas pada chunk + top-K"""
+    cache = get_ranking_cache()
+    try:
+        with get_db_pool().connection() as conn:
+            # Drain dirty queue feature store dulu: version dan ranking dari store yang fresh
+            stored = prepare_feature_source(conn)
+            data_version = source_data_version(conn)
             
-            -- 8. Social Orientation & Collaboration (5 TV)
-            (
-                COALESCE((CASE WHEN disc = 'I' THEN 1.0 ELSE 0.0 END), 0) +
-                COALESCE(papi_s/10, 0) +
-                COALESCE(strength_communication, 0) +
-                COALESCE(strength_woo, 0) +
-                COALESCE(strength_relator, 0)
-            ) / 5 AS tv_social
+            # Hasil streaming dari data versi lama tidak boleh dipakai lagi
+            cache.discard_stale(data_version)
+            key = ranking_cache_key(benchmark_ids, data_version, weights)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
             
-        FROM employee_data
-    ),
-    match_calculations AS (
-        SELECT *,
-            -- Final Match Rate calculation menggunakan semua 8 TGV
-            (1 - (SQRT(
-                POW(COALESCE(tv_adaptability, 0) - %s, 2) + 
-                POW(COALESCE(tv_cognitive, 0) - %s, 2) + 
-                POW(COALESCE(tv_conscientiousness, 0) - %s, 2) + 
-                POW(COALESCE(tv_creativity, 0) - %s, 2) + 
-                POW(COALESCE(tv_cultural_values, 0) - %s, 2) + 
-                POW(COALESCE(tv_leadership, 0) - %s, 2) + 
-                POW(COALESCE(tv_motivation, 0) - %s, 2) + 
-                POW(COALESCE(tv_social, 0) - %s, 2)
-            ) / 8)) * 100 AS final_match_rate
-        FROM tgv_calculations
-    )
-    SELECT * FROM match_calculations
-    WHERE final_match_rate IS NOT NULL
-    ORDER BY final_match_rate DESC
-    """
+            baseline = stream_baseline(conn, benchmark_ids, weights, stored)
+            if not baseline:
+                st.warning("No psychometric data found for selected benchmarks")
+                return {}, None
+            ranking = stream_ranking(conn, baseline, k=RANKING_TOP_K, chunk_size=chunk_size, weights=weights, stored=stored)
+    except Exception as e:
+        st.error(f"Error streaming talent ranking: {e}")
+        return {}, None
     
-    # Prepare parameters untuk 8 TGV
-    tgv_keys = [
-        'adaptability_stress', 'cognitive_complexity', 'conscientiousness',
-        'creativity_innovation', 'cultural_values', 'leadership_influence', 
-        'motivation_drive', 'social_orientation'
-    ]
-    params = [baseline_dict.get(key, 0) for key in tgv_keys]
+    cache.put(key, (baseline, ranking), size=ranking.nbytes)
+    return baseline, ranking
+
+# Baseline + ranking untuk satu benchmark set (cached)
+def run_talent_matching(benchmark_ids, weights=None):
+    """Return (baseline_dict, Ranking); benchmark set + weights yang sama dipakai ulang dari cache"""
+    streaming, chunk_size = get_streaming_config()
+    if streaming:
+        return run_streaming_matching(benchmark_ids, weights, chunk_size)
     
     try:
-        df = pd.read_sql(query, conn, params=params)
-        return df
+        engine = get_scoring_engine()
     except Exception as e:
-        st.error(f"Error ranking employees with TGV mapping: {e}")
+        st.error(f"Error loading employee features: {e}")
+        return {}, None
+    
+    cache = get_ranking_cache()
+    key = ranking_cache_key(benchmark_ids, engine.data_version, weights)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    
+    baseline = compute_tgv_baselines(benchmark_ids, weights)
+    ranking = get_talent_ranking(baseline, weights)
+    if ranking is not None:
+        cache.put(key, (baseline, ranking), size=ranking.nbytes)
+    return baseline, ranking
+
+# Batch matching: semua vacancy di talent_benchmarks dalam satu pass
+def run_batch_matching(vacancy_ids=None, top_k=100):
+    """Top-K kandidat per job_vacancy_id, disimpan ke talent_match_results"""
+    try:
+        engine = get_scoring_engine()
+        with get_db_pool().connection() as conn:
+            benchmark_sets, weights = load_vacancy_benchmarks(conn, vacancy_ids)
+            results = match_vacancies(engine, benchmark_sets, top_k=top_k, weights=weights)
+            if not results.empty:
+                write_match_results(conn, results)
+        return results
+    except Exception as e:
+        st.error(f"Batch matching failed: {e}")
         return pd.DataFrame()
 
 # AI Job Profile Generation
-def generate_job_profile(role_name, job_level, role_purpose, benchmark_ids):
-    try:
-        api_key = st.secrets["openai"]["api_key"]
-        api_url = "https://openrouter.ai/api/v1/chat/completions"
-        
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:8501",
-            "X-Title": "AI Talent Dashboard"
-        }
-        
-        # Get benchmark employee details for context
-        benchmark_context = ""
-        if benchmark_ids:
-            placeholders = ','.join(['%s'] * len(benchmark_ids))
-            query = f"""
-            SELECT e.fullname, p.name as position, d.name as department
-            FROM employees e
-            LEFT JOIN dim_positions p ON e.position_id = p.position_id
-            LEFT JOIN dim_departments d ON e.department_id = d.department_id
-            WHERE e.employee_id IN ({placeholders})
-            """
-            df = pd.read_sql(query, conn, params=benchmark_ids)
-            if not df.empty:
-                benchmark_context = "Benchmark employees:\n" + "\n".join(
-                    [f"• {row['fullname']} - {row['position']} ({row['department']})" 
-                     for _, row in df.iterrows()]
-                )
-        
-        prompt = f"""
-        Create a comprehensive job profile for a {role_name} position at {job_level} level.
-
-        ROLE PURPOSE: {role_purpose}
-
-        {benchmark_context}
-
-        Format your response EXACTLY like this structure:
-
-        Job requirements
-        • [specific technical skill 1]
-        • [specific technical skill 2] 
-        • [specific tool or technology]
-        • [required experience or qualification]
-
-        Job description
-        [1-2 sentences describing the role's core purpose and daily activities]
-
-        Key competencies
-        1. [Technical skill category]: [specific tools/technologies]
-        2. [Analytical skill category]: [specific methodologies]
-        3. [Business skill category]: [specific applications]
-        4. [Soft skill category]: [specific behaviors]
-
-        Be specific, practical, and focus on actionable skills for a {job_level} level {role_name}.
-        """
-        
-        data = {
-            "model": "anthropic/claude-3-haiku",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": 800,
-            "temperature": 0.7
-        }
-        
-        response = requests.post(api_url, headers=headers, json=data, timeout=60)
-        
-        if response.status_code == 200:
-            result = response.json()
-            content = result['choices'][0]['message']['content']
-            return content
-        else:
-            # Fallback template
-            return f"""Job requirements
-• Technical expertise in {role_name.lower()} domain
-• Data analysis and interpretation skills  
-• Problem-solving and critical thinking
-• Communication and collaboration abilities
+JOB_PROFILE_CACHE_PATH = ".cache/job_profiles.sqlite3"
+
+def get_openrouter_config():
+    config = st.secrets["openai"]
+    return config["api_key"], config.get("api_url", OPENROUTER_API_URL)
+
+# Persistent cache AI job profile (SQLite), keyed by prompt fingerprint
+@st.cache_resource(show_spinner=False)
+def get_job_profile_cache():
+    return JobProfileCache(
+        JOB_PROFILE_CACHE_PATH,
+        ttl=7 * 24 * 3600,
+        max_entries=1000,
+        max_bytes=20 * 1024 * 1024
+    )
 
-Job description
-You will be responsible for {role_purpose.lower()} using technical skills and business acumen to drive data-informed decisions.
+def get_benchmark_context(benchmark_ids, pool=None):
+    """Nama, posisi dan departemen benchmark employees sebagai konteks prompt"""
+    if not benchmark_ids:
+        return ""
+    
+    placeholders = ','.join(['%s'] * len(benchmark_ids))
+    query = f"""
+    SELECT e.fullname, p.name as position, d.name as department
+    FROM employees e
+    LEFT JOIN dim_positions p ON e.position_id = p.position_id
+    LEFT JOIN dim_departments d ON e.department_id = d.department_id
+    WHERE e.employee_id IN ({placeholders})
+    """
+    with (pool or get_db_pool()).connection() as conn:
+        df = pd.read_sql(query, conn, params=benchmark_ids)
+    if df.empty:
+        return ""
+    return "Benchmark employees:\n" + "\n".join(
+        [f"• {row['fullname']} - {row['position']} ({row['department']})" 
+         for _, row in df.iterrows()]
+    )
 
-Key competencies
-1. Technical: Relevant tools and technologies for {role_name}
-2. Analytical: Data-driven decision making and insights generation
-3. Business: Stakeholder management and requirement gathering
-4. Soft skills: Team collaboration and communication"""
-            
+def _job_profile_task(role_name, job_level, role_purpose, benchmark_ids, pin=False):
+    """Bind secrets, pool dan cache di script thread; return callable tanpa akses st.*"""
+    api_key, api_url = get_openrouter_config()
+    pool = get_db_pool()
+    cache = get_job_profile_cache()
+    
+    def task(buffer):
+        # Snapshot teks ditulis ke buffer token demi token
+        try:
+            benchmark_context = get_benchmark_context(benchmark_ids, pool)
+            buffer.consume(ai_profile.stream_job_profile(
+                api_key, role_name, job_level, role_purpose, benchmark_context,
+                api_url=api_url, cache=cache, pin=pin
+            ))
+        except Exception as e:
+            buffer.finish(f"AI generation failed: {e}")
+    
+    return task
+
+# Background executor untuk LLM call, di-share lintas session
+@st.cache_resource(show_spinner=False)
+def get_ai_executor():
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="job-profile")
+
+def submit_job_profile(role_name, job_level, role_purpose, benchmark_ids, pin=False):
+    """Stream AI job profile di background; return StreamBuffer berisi snapshot teks terbaru"""
+    buffer = StreamBuffer()
+    try:
+        task = _job_profile_task(role_name, job_level, role_purpose, benchmark_ids, pin)
+        get_ai_executor().submit(task, buffer)
     except Exception as e:
-        return f"AI generation failed: {e}"
+        buffer.finish(f"AI generation failed: {e}")
+    return buffer
+
+def render_job_profile_stream(buffer, placeholder, refresh_interval=0.1):
+    """Render snapshot stream ke placeholder sampai selesai; return teks final"""
+    rendered = None
+    while True:
+        finished = buffer.wait(refresh_interval)
+        text = buffer.text
+        if text and text != rendered:
+            placeholder.markdown(text)
+            rendered = text
+        if finished:
+            return text
 
 # =============================================================================
-# VISUALIZATION FUNCTIONS FOR TAB 1 - DASHBOARD COMPONENTS
+# LAZY DASHBOARD PANELS: figure dibangun saat panel dibuka, cached per analysis
 # =============================================================================
 
-def create_tgv_strengths_gaps_chart(rankings, baseline_dict):
-    """Top Strengths & Gaps across TGVs - Bar Plot"""
-    if len(rankings) == 0 or not baseline_dict:
-        return go.Figure()
-    
-    top_candidate = rankings.iloc[0]
-    
-    # TGV mapping untuk display
-    tgv_display_names = {
-        'tv_cognitive': 'Cognitive Complexity',
-        'tv_leadership': 'Leadership & Influence', 
-        'tv_adaptability': 'Adaptability & Stress',
-        'tv_motivation': 'Motivation & Drive',
-        'tv_creativity': 'Creativity & Innovation',
-        'tv_conscientiousness': 'Conscientiousness',
-        'tv_social': 'Social Orientation',
-        'tv_cultural_values': 'Cultural Values'
-    }
-    
-    gap_data = []
-    
-    for tv_key, display_name in tgv_display_names.items():
-        if tv_key in top_candidate:
-            baseline_key = tv_key.replace('tv_', '')
-            if baseline_key in baseline_dict:
-                candidate_score = top_candidate[tv_key]
-                baseline_score = baseline_dict[baseline_key]
-                gap = candidate_score - baseline_score
-                
-                gap_data.append({
-                    'TGV': display_name,
-                    'Candidate_Score': candidate_score,
-                    'Benchmark_Score': baseline_score,
-                    'Gap': gap,
-                    'Type': 'Strength' if gap > 0 else 'Gap'
-                })
-    
-    if not gap_data:
-        return go.Figure()
-        
-    df = pd.DataFrame(gap_data)
-    
-    fig = go.Figure()
-    
-    # Add benchmark bars
-    fig.add_trace(go.Bar(
-        name='Benchmark',
-        x=df['TGV'],
-        y=df['Benchmark_Score'],
-        marker_color='lightblue',
-        opacity=0.7,
-        text=df['Benchmark_Score'].round(3),
-        textposition='auto'
-    ))
-    
-    # Add candidate bars
-    fig.add_trace(go.Bar(
-        name='Top Candidate',
-        x=df['TGV'],
-        y=df['Candidate_Score'],
-        marker_color='lightcoral',
-        opacity=0.7,
-        text=df['Candidate_Score'].round(3),
-        textposition='auto'
-    ))
-    
-    fig.update_layout(
-        title='Top Candidate vs Benchmark: TGV Comparison',
-        xaxis_tickangle=-45,
-        yaxis_title="Score",
-        barmode='group',
-        showlegend=True,
-        height=500
-    )
-    
-    return fig
-
-def create_benchmark_comparison_radar(rankings, baseline_dict, top_n=3):
-    """Benchmark vs Candidate Comparisons - Radar Chart"""
-    if len(rankings) == 0 or not baseline_dict:
-        return go.Figure()
-    
-    # Select top N candidates
-    top_candidates = rankings.head(top_n)
-    
-    # TGV categories untuk radar chart
-    radar_categories = [
-        'Cognitive', 'Leadership', 'Adaptability', 
-        'Motivation', 'Creativity', 'Conscientiousness'
-    ]
-    
-    radar_keys = [
-        'cognitive_complexity', 'leadership_influence', 'adaptability_stress',
-        'motivation_drive', 'creativity_innovation', 'conscientiousness'
-    ]
-    
-    fig = go.Figure()
-    
-    # Add benchmark trace
-    benchmark_scores = [baseline_dict.get(key, 0) for key in radar_keys]
-    fig.add_trace(go.Scatterpolar(
-        r=benchmark_scores + [benchmark_scores[0]],
-        theta=radar_categories + [radar_categories[0]],
-        fill='toself',
-        name='Benchmark Profile',
-        line=dict(color='blue', width=3),
-        opacity=0.3
-    ))
-    
-    # Colors for top candidates
-    colors = ['red', 'orange', 'green']
-    
-    # Add top candidates traces
-    for i, (_, candidate) in enumerate(top_candidates.iterrows()):
-        candidate_scores = []
-        for key in radar_keys:
-            candidate_key = f"tv_{key.split('_')[0]}"
-            candidate_scores.append(candidate.get(candidate_key, 0))
-        
-        fig.add_trace(go.Scatterpolar(
-            r=candidate_scores + [candidate_scores[0]],
-            theta=radar_categories + [radar_categories[0]],
-            fill='toself',
-            name=f"{candidate['fullname']} ({candidate['final_match_rate']:.1f}%)",
-            line=dict(color=colors[i], width=2),
-            opacity=0.5
-        ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 1]
-            )),
-        showlegend=True,
-        title="Benchmark vs Top Candidates - Radar Comparison",
-        height=500
-    )
-    
-    return fig
-
-def create_tgv_heatmap_comparison(rankings, baseline_dict, top_n=5):
-    """TGV Heatmap - Candidate vs Benchmark Comparison"""
-    if len(rankings) == 0 or not baseline_dict:
-        return go.Figure()
-    
-    top_candidates = rankings.head(top_n)
-    
-    # TGV mapping
-    tgv_mapping = {
-        'tv_cognitive': 'Cognitive',
-        'tv_leadership': 'Leadership',
-        'tv_adaptability': 'Adaptability',
-        'tv_motivation': 'Motivation',
-        'tv_creativity': 'Creativity',
-        'tv_conscientiousness': 'Conscientiousness',
-        'tv_social': 'Social',
-        'tv_cultural_values': 'Cultural'
-    }
-    
-    # Prepare data for heatmap
-    candidates_data = []
-    candidate_names = []
-    
-    for _, candidate in top_candidates.iterrows():
-        candidate_scores = []
-        for tv_key, tgv_name in tgv_mapping.items():
-            if tv_key in candidate:
-                baseline_key = tv_key.replace('tv_', '')
-                baseline_score = baseline_dict.get(baseline_key, 0)
-                candidate_score = candidate[tv_key]
-                
-                # Calculate gap percentage
-                if baseline_score > 0:
-                    gap_pct = ((candidate_score - baseline_score) / baseline_score) * 100
-                else:
-                    gap_pct = 0
-                
-                candidate_scores.append(gap_pct)
-        
-        candidates_data.append(candidate_scores)
-        candidate_names.append(f"{candidate['fullname']} ({candidate['final_match_rate']:.1f}%)")
-    
-    if not candidates_data:
-        return go.Figure()
-    
-    # Create heatmap
-    fig = go.Figure(data=go.Heatmap(
-        z=candidates_data,
-        x=list(tgv_mapping.values()),
-        y=candidate_names,
-        colorscale='RdBu',
-        zmid=0,
-        text=[[f"{val:.1f}%" for val in row] for row in candidates_data],
-        texttemplate="%{text}",
-        textfont={"size": 10},
-        hoverinfo="text",
-        hovertemplate="Candidate: %{y}<br>TGV: %{x}<br>Gap: %{z:.1f}%<extra></extra>"
-    ))
-    
-    fig.update_layout(
-        title='TGV Gap Analysis: Candidates vs Benchmark (%)',
-        xaxis_title="Talent Group Variables (TGV)",
-        yaxis_title="Top Candidates",
-        height=400
-    )
-    
-    return fig
-
-def create_match_rate_distribution(rankings):
-    """Match Rate Distribution - Histogram"""
-    if len(rankings) == 0:
-        return go.Figure()
-    
-    fig = px.histogram(
-        rankings, 
-        x='final_match_rate',
-        title="Match Rate Distribution Across Candidates",
-        nbins=20,
-        color_discrete_sequence=['#1f77b4'],
-        opacity=0.7
-    )
-    
-    # Add vertical line for average
-    avg_match_rate = rankings['final_match_rate'].mean()
-    fig.add_vline(
-        x=avg_match_rate, 
-        line_dash="dash", 
-        line_color="red",
-        annotation_text=f"Avg: {avg_match_rate:.1f}%"
-    )
-    
-    fig.update_layout(
-        xaxis_title="Match Rate (%)",
-        yaxis_title="Number of Candidates",
-        showlegend=False,
-        height=400
-    )
-    
+# Figure cache lintas session: key = (analysis fingerprint, nama panel). Dibatasi per jumlah
+# figure: mengukur bytes figure butuh serialisasi penuh (fig.to_json) di setiap insert
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    return RankingCache(ttl=1800, max_entries=128)
+
+def analysis_fingerprint(ranking, rankings, baseline_dict):
+    """Hash isi hasil analysis: top-K rankings, ukuran populasi dan baseline"""
+    columns = [column for column in ['employee_id', 'final_match_rate'] + TGV_COLUMNS if column in rankings]
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(rankings[columns], index=False).to_numpy().tobytes())
+    digest.update(repr(sorted((key, float(value)) for key, value in baseline_dict.items())).encode())
+    digest.update(str(len(ranking)).encode())
+    return digest.hexdigest()
+
+def get_dashboard_figure(fingerprint, name, build_figure):
+    """Figure dari cache; ``build_figure`` hanya dipanggil jika belum pernah dibangun"""
+    cache = get_figure_cache()
+    key = (fingerprint, name)
+    fig = cache.get(key)
+    if fig is None:
+        fig = build_figure()
+        cache.put(key, fig)
     return fig
 
-def create_tgv_correlation_heatmap(rankings):
-    """TGV Correlation Matrix - Heatmap"""
-    if len(rankings) == 0:
-        return go.Figure()
-    
-    # Select TGV columns
-    tgv_columns = [col for col in rankings.columns if col.startswith('tv_')]
-    
-    if len(tgv_columns) < 2:
-        return go.Figure()
-    
-    # Calculate correlation matrix
-    corr_matrix = rankings[tgv_columns].corr()
-    
-    # Rename columns for display
-    display_names = {
-        'tv_cognitive': 'Cognitive',
-        'tv_leadership': 'Leadership',
-        'tv_adaptability': 'Adaptability',
-        'tv_motivation': 'Motivation',
-        'tv_creativity': 'Creativity',
-        'tv_conscientiousness': 'Conscientiousness',
-        'tv_social': 'Social',
-        'tv_cultural_values': 'Cultural'
-    }
+# Fragment: toggle panel hanya me-rerun panel ini, bukan seluruh app
+@st.fragment
+def render_dashboard_panel(title, name, fingerprint, build_figure, expanded=False):
+    """Satu panel dashboard; chart dihitung hanya saat panel dibuka"""
+    if st.toggle(title, value=expanded, key=f"dashboard_panel_{name}"):
+        st.plotly_chart(
+            get_dashboard_figure(fingerprint, name, build_figure),
+            use_container_width=True,
+            key=f"dashboard_chart_{name}"
+        )
+
+@st.fragment
+def render_correlation_panel(ranking, fingerprint):
+    """TGV correlation populasi, opsional per directorate / grade (dari population statistics)"""
+    if not st.toggle("TGV Correlation Matrix", value=False, key="dashboard_panel_tgv_correlation"):
+        return
     
-    corr_matrix_display = corr_matrix.rename(
-        index=display_names, 
-        columns=display_names
+    # Streaming ranking hanya punya statistik seluruh populasi
+    groups = [None]
+    engine = getattr(ranking, 'engine', None)
+    if engine is not None:
+        groups += [(column, value) for column in CORRELATION_GROUP_COLUMNS for value in engine.filter_values(column)]
+    group = st.selectbox(
+        "Population",
+        options=groups,
+        format_func=lambda group: "All employees" if group is None else f"{group[0].title()}: {group[1]}",
+        key="dashboard_correlation_group"
     )
     
-    fig = go.Figure(data=go.Heatmap(
-        z=corr_matrix_display.values,
-        x=corr_matrix_display.columns,
-        y=corr_matrix_display.index,
-        colorscale='RdBu',
-        zmin=-1,
-        zmax=1,
-        text=corr_matrix_display.round(2).values,
-        texttemplate="%{text}",
-        textfont={"size": 12},
-        hoverinfo="text",
-        hovertemplate="TGV1: %{y}<br>TGV2: %{x}<br>Correlation: %{z:.2f}<extra></extra>"
-    ))
-    
-    fig.update_layout(
-        title='TGV Correlation Matrix',
-        xaxis_title="Talent Group Variables",
-        yaxis_title="Talent Group Variables",
-        height=500
+    name = "tgv_correlation" if group is None else f"tgv_correlation:{group[0]}:{group[1]}"
+    st.plotly_chart(
+        get_dashboard_figure(fingerprint, name, lambda: create_tgv_correlation_heatmap(ranking.tgv_correlation(group))),
+        use_container_width=True,
+        key="dashboard_chart_tgv_correlation"
     )
-    
-    return fig
 
-def generate_detailed_insights(rankings, baseline_dict):
-    """Generate Detailed Insights dengan Top Strengths & Gaps"""
-    if len(rankings) == 0:
-        return "No data available for insights."
-    
-    top_candidate = rankings.iloc[0]
-    
-    insights = []
-    insights.append(f"## Detailed Analysis: {top_candidate['fullname']}")
-    insights.append(f"**Overall Match Rate:** {top_candidate['final_match_rate']:.1f}%")
-    insights.append(f"**Position:** {top_candidate.get('position', 'N/A')}")
-    insights.append(f"**Department:** {top_candidate.get('department', 'N/A')}")
-    insights.append("")
-    
-    # Top Strengths Analysis
-    strengths = []
-    gaps = []
-    
-    tgv_analysis = {
-        'tv_cognitive': 'Cognitive Complexity',
-        'tv_leadership': 'Leadership & Influence',
-        'tv_adaptability': 'Adaptability & Stress Tolerance',
-        'tv_motivation': 'Motivation & Drive',
-        'tv_creativity': 'Creativity & Innovation',
-        'tv_conscientiousness': 'Conscientiousness & Reliability'
-    }
+def render_talent_dashboard(ranking, rankings, baseline_dict):
+    """Comprehensive dashboard: setiap chart di panel lazy dengan figure cache"""
+    fingerprint = analysis_fingerprint(ranking, rankings, baseline_dict)
     
-    for tv_key, tgv_name in tgv_analysis.items():
-        if tv_key in top_candidate:
-            baseline_key = tv_key.replace('tv_', '')
-            if baseline_key in baseline_dict:
-                gap = top_candidate[tv_key] - baseline_dict[baseline_key]
-                if gap > 0.15:
-                    strengths.append(f"**{tgv_name}**: +{gap:.3f} above benchmark")
-                elif gap < -0.15:
-                    gaps.append(f"**{tgv_name}**: {gap:.3f} below benchmark")
-    
-    if strengths:
-        insights.append("### Top Strengths vs Benchmark:")
-        insights.extend([f"• {strength}" for strength in strengths])
-        insights.append("")
-    
-    if gaps:
-        insights.append("### Development Areas:")
-        insights.extend([f"• {gap}" for gap in gaps])
-        insights.append("")
-    
-    # Behavioral Insights
-    if 'top_strengths' in top_candidate and pd.notna(top_candidate['top_strengths']):
-        insights.append("### Behavioral Strengths Profile:")
-        insights.append(f"**Top CliftonStrengths:** {top_candidate['top_strengths']}")
-        insights.append("")
-    
-    # Performance Context
-    if 'latest_performance' in top_candidate and pd.notna(top_candidate['latest_performance']):
-        insights.append("### Performance Context:")
-        insights.append(f"**Latest Performance Rating:** {top_candidate['latest_performance']}")
-        insights.append("")
-    
-    # Recommendation
-    match_rate = top_candidate['final_match_rate']
-    if match_rate >= 85:
-        insights.append("### Recommendation: STRONG MATCH")
-        insights.append("Excellent alignment with benchmark profiles across multiple TGVs.")
-    elif match_rate >= 70:
-        insights.append("### Recommendation: GOOD MATCH")
-        insights.append("Solid alignment with key competencies, some development areas identified.")
-    else:
-        insights.append("### Recommendation: MODERATE MATCH")
-        insights.append("Some alignment present but significant gaps require development.")
+    st.header("Talent Match Dashboard - Comprehensive Analysis")
     
-    return "\n".join(insights)
-
-# NEW FUNCTION: Get Top TVs (Specific Assessments)
-def get_top_tvs(candidate):
-    """Get top 3 Talent Variables (specific assessments) for a candidate"""
-    tv_scores = []
-    
-    # Cognitive assessments
-    if pd.notna(candidate.get('gtq')) and candidate['gtq'] > 0:
-        tv_scores.append(('GTQ', candidate['gtq']/100))
-    if pd.notna(candidate.get('tiki')) and candidate['tiki'] > 0:
-        tv_scores.append(('TIKI', candidate['tiki']/100))
-    if pd.notna(candidate.get('iq')) and candidate['iq'] > 0:
-        tv_scores.append(('IQ', candidate['iq']/100))
-    if pd.notna(candidate.get('pauli')) and candidate['pauli'] > 0:
-        tv_scores.append(('Pauli', candidate['pauli']/100))
-    
-    # DISC profile scores
-    if pd.notna(candidate.get('disc')):
-        disc = candidate['disc']
-        if 'D' in disc:
-            tv_scores.append(('DISC-D', 1.0))
-        if 'I' in disc:
-            tv_scores.append(('DISC-I', 1.0))
-        if 'S' in disc:
-            tv_scores.append(('DISC-S', 1.0))
-        if 'C' in disc:
-            tv_scores.append(('DISC-C', 1.0))
-    
-    # MBTI dimensions
-    if pd.notna(candidate.get('mbti')):
-        mbti = str(candidate['mbti'])
-        if 'E' in mbti:
-            tv_scores.append(('MBTI-E', 1.0))
-        if 'I' in mbti:
-            tv_scores.append(('MBTI-I', 0.8))
-        if 'S' in mbti:
-            tv_scores.append(('MBTI-S', 1.0))
-        if 'N' in mbti:
-            tv_scores.append(('MBTI-N', 1.0))
-        if 'T' in mbti:
-            tv_scores.append(('MBTI-T', 1.0))
-        if 'F' in mbti:
-            tv_scores.append(('MBTI-F', 1.0))
-        if 'J' in mbti:
-            tv_scores.append(('MBTI-J', 1.0))
-        if 'P' in mbti:
-            tv_scores.append(('MBTI-P', 1.0))
-    
-    # PAPI scores
-    papi_mapping = {
-        'papi_t': 'PAPI-T', 'papi_e': 'PAPI-E', 'papi_i': 'PAPI-I',
-        'papi_c': 'PAPI-C', 'papi_d': 'PAPI-D', 'papi_z': 'PAPI-Z',
-        'papi_l': 'PAPI-L', 'papi_p': 'PAPI-P', 'papi_a': 'PAPI-A',
-        'papi_s': 'PAPI-S'
-    }
+    # ROW 1: Match Distribution & Top Strengths Gaps
+    col1, col2 = st.columns(2)
     
-    for papi_key, papi_name in papi_mapping.items():
-        if pd.notna(candidate.get(papi_key)) and candidate[papi_key] > 0:
-            tv_scores.append((papi_name, candidate[papi_key]/10))
-    
-    # Strengths
-    strength_mapping = {
-        'strength_adaptability': 'Str-Adaptability',
-        'strength_connectedness': 'Str-Connectedness',
-        'strength_analytical': 'Str-Analytical',
-        'strength_strategic': 'Str-Strategic',
-        'strength_deliberative': 'Str-Deliberative',
-        'strength_discipline': 'Str-Discipline',
-        'strength_futuristic': 'Str-Futuristic',
-        'strength_ideation': 'Str-Ideation',
-        'strength_belief': 'Str-Belief',
-        'strength_arranger': 'Str-Arranger',
-        'strength_command': 'Str-Command',
-        'strength_self_assurance': 'Str-SelfAssurance',
-        'strength_developer': 'Str-Developer',
-        'strength_achiever': 'Str-Achiever',
-        'strength_communication': 'Str-Communication',
-        'strength_woo': 'Str-Woo',
-        'strength_relator': 'Str-Relator'
-    }
+    with col1:
+        render_dashboard_panel(
+            "Match Rate Distribution", "match_rate_distribution", fingerprint,
+            lambda: create_match_rate_distribution(ranking.distribution()),
+            expanded=True
+        )
     
-    for strength_key, strength_name in strength_mapping.items():
-        if pd.notna(candidate.get(strength_key)) and candidate[strength_key] > 0:
-            tv_scores.append((strength_name, 1.0))
+    with col2:
+        render_dashboard_panel(
+            "Top Strengths & Gaps", "tgv_strengths_gaps", fingerprint,
+            lambda: create_tgv_strengths_gaps_chart(rankings, baseline_dict),
+            expanded=True
+        )
     
-    # Sort by score and get top 3
-    tv_scores.sort(key=lambda x: x[1], reverse=True)
-    top_tvs = tv_scores[:3]
+    # ROW 2: Benchmark Comparisons (Radar + Heatmap)
+    st.subheader("Benchmark vs Candidate Comparisons")
     
-    # Format as string
-    if top_tvs:
-        return ', '.join([f"{name}({score:.2f})" for name, score in top_tvs])
-    else:
-        return "No TV data"
-
-# NEW FUNCTION: Get Top TGVs
-def get_top_tgvs(candidate):
-    """Get top 3 Talent Group Variables for a candidate"""
-    tgv_mapping = {
-        'tv_cognitive': 'Cognitive',
-        'tv_leadership': 'Leadership',
-        'tv_adaptability': 'Adaptability',
-        'tv_motivation': 'Motivation',
-        'tv_creativity': 'Creativity',
-        'tv_conscientiousness': 'Conscientiousness',
-        'tv_social': 'Social',
-        'tv_cultural_values': 'Cultural'
-    }
+    col3, col4 = st.columns(2)
     
-    tgv_scores = []
-    for tgv_key, tgv_name in tgv_mapping.items():
-        if pd.notna(candidate.get(tgv_key)) and candidate[tgv_key] > 0:
-            tgv_scores.append((tgv_name, candidate[tgv_key]))
+    with col3:
+        render_dashboard_panel(
+            "Radar Comparison", "benchmark_comparison_radar", fingerprint,
+            lambda: create_benchmark_comparison_radar(rankings, baseline_dict)
+        )
     
-    # Sort by score and get top 3
-    tgv_scores.sort(key=lambda x: x[1], reverse=True)
-    top_tgvs = tgv_scores[:3]
+    with col4:
+        render_dashboard_panel(
+            "TGV Gap Heatmap", "tgv_heatmap_comparison", fingerprint,
+            lambda: create_tgv_heatmap_comparison(rankings, baseline_dict)
+        )
     
-    # Format as string
-    if top_tgvs:
-        return ', '.join([f"{name}({score:.2f})" for name, score in top_tgvs])
-    else:
-        return "No TGV data"
+    # ROW 3: Correlation Analysis
+    st.subheader("TGV Relationship Analysis")
+    render_correlation_panel(ranking, fingerprint)
 
 # Form functions
 def render_role_information_form():
@@ -1003,23 +445,83 @@ def render_role_information_form():
     st.subheader("Employee Benchmarking")
     st.caption("Select high-performing employees as benchmarks (max 3)")
     
-    employee_options = get_employee_options()
-    selected_benchmarks = st.multiselect(
+    search_query = st.text_input(
+        "Search Employees",
+        placeholder="Type a name, position or employee ID...",
+        key="benchmark_search_tab1"
+    )
+    selected_ids = st.session_state.get("benchmarks_tab1", [])
+    employee_options, format_employee = search_employee_options(search_query, selected_ids)
+    benchmark_ids = st.multiselect(
         "Select Benchmark Employees", 
         options=employee_options, 
+        format_func=format_employee,
         max_selections=3,
         placeholder="Choose 1-3 top performers...",
         key="benchmarks_tab1"
     )
     
-    benchmark_ids = extract_employee_ids(selected_benchmarks)
+    candidate_filters = render_candidate_filters()
+    match_weights = render_match_weights()
+    
+    if benchmark_ids and st.checkbox("Live preview: top matches for current selection", key="live_preview_tab1"):
+        render_benchmark_preview(benchmark_ids, match_weights, candidate_filters)
+    
+    pin_profile = st.checkbox("Keep this AI job profile in cache (pin)", key="pin_profile_tab1")
     
     generate_btn = st.button("Generate Talent Analysis", 
                            type="primary", 
                            use_container_width=True,
                            key="generate_tab1")
     
-    return generate_btn, role_name, job_level, role_purpose, benchmark_ids
+    return generate_btn, role_name, job_level, role_purpose, benchmark_ids, pin_profile, candidate_filters, match_weights
+
+def render_candidate_filters():
+    """Optional filter kandidat (grade / directorate) untuk ranked talent list"""
+    # Filter memakai in-memory engine; tidak tersedia di streaming mode
+    if get_streaming_config()[0]:
+        return {}
+    
+    try:
+        engine = get_scoring_engine()
+    except Exception:
+        return {}
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        grades = st.multiselect("Filter by Grade", options=engine.filter_values('grade'), key="grade_filter_tab1")
+    with col2:
+        directorates = st.multiselect("Filter by Directorate", options=engine.filter_values('directorate'), key="directorate_filter_tab1")
+    
+    return {column: values for column, values in [('grade', grades), ('directorate', directorates)] if values}
+
+def render_benchmark_preview(benchmark_ids, weights=None, candidate_filters=None, top_n=5):
+    """Top kandidat untuk pilihan benchmark saat ini (incremental baseline + ranking cache)"""
+    baseline, ranking = run_talent_matching(benchmark_ids, weights)
+    if ranking is None:
+        return
+    
+    if candidate_filters:
+        preview = get_filtered_talent(baseline, candidate_filters, top_n, weights)
+    else:
+        preview = ranking.top(top_n)
+    if preview.empty:
+        return
+    columns = [column for column in ['employee_id', 'fullname', 'position', 'final_match_rate'] if column in preview]
+    st.dataframe(preview[columns].round({'final_match_rate': 1}), hide_index=True, use_container_width=True)
+
+def render_match_weights():
+    """Optional bobot per TGV (format weights_config); None jika semua bobot sama"""
+    with st.expander("TGV weights (optional)"):
+        st.caption("Relative importance of each TGV in the match rate (1.0 = default)")
+        cols = st.columns(2)
+        tgv_weights = {}
+        for i, tgv_name in enumerate(TGV_NAMES):
+            with cols[i % 2]:
+                tgv_weights[tgv_name] = st.number_input(
+                    tgv_name, min_value=0.0, max_value=10.0, value=1.0, step=0.1, key=f"tgv_weight_{i}_tab1"
+                )
+    return compile_weights({'TGV': tgv_weights})
 
 def render_job_details_form():
     st.header("Job Details")
@@ -1079,61 +581,55 @@ def render_job_details_form():
     
     return generate_btn
 
-def display_ranked_talent_list_tab1(rankings, baseline_dict):
-    """Display Ranked Talent List untuk Tab 1 dengan kolom yang diminta"""
+# Pilihan jumlah baris per halaman ranked talent list
+PAGE_SIZES = [25, 50, 100, 200]
+
+def _shift_page(state_key, step):
+    st.session_state[state_key] = max(st.session_state.get(state_key, 0) + step, 0)
+
+def render_page_control(ranking, key):
+    """Page size + Previous / Next untuk ranked list; return (offset, limit) untuk ``ranking.page``"""
+    total = len(ranking)
+    available = ranking.available
+    page_key = f"ranking_page_{key}"
+    
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 4])
+    with col1:
+        limit = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"ranking_page_size_{key}")
+    pages = max(-(-available // limit), 1)
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+    st.session_state[page_key] = page
+    
+    with col2:
+        st.button("Previous", key=f"ranking_prev_{key}", disabled=page == 0,
+                  on_click=_shift_page, args=(page_key, -1), use_container_width=True)
+    with col3:
+        st.button("Next", key=f"ranking_next_{key}", disabled=page >= pages - 1,
+                  on_click=_shift_page, args=(page_key, 1), use_container_width=True)
+    
+    offset = page * limit
+    caption = f"Candidates {offset + 1:,}-{min(offset + limit, available):,} of {total:,} (page {page + 1} of {pages:,})"
+    if available < total:
+        caption += f". Streaming mode keeps only the top {available:,}."
+    with col4:
+        st.caption(caption)
+    return offset, limit
+
+def display_ranked_talent_list_tab1(ranking, baseline_dict, key="tab1"):
+    """Display Ranked Talent List untuk Tab 1 dengan kolom yang diminta
+
+    Hanya halaman yang dipilih yang diambil dari ``ranking`` (``Ranking.page``), tanpa re-score.
+    """
     st.header("Ranked Talent List")
     
-    if len(rankings) == 0:
+    if ranking is None or ranking.available == 0:
         st.warning("No data available for display")
         return
     
-    # Buat dataframe untuk display dengan kolom yang diminta
-    display_data = []
+    offset, limit = render_page_control(ranking, key)
     
-    for _, candidate in rankings.iterrows():
-        # Get top TGVs dan top TVs menggunakan fungsi baru
-        top_tgvs = get_top_tgvs(candidate)
-        top_tvs = get_top_tvs(candidate)
-        
-        # Identifikasi strengths dan gaps
-        strengths = []
-        gaps = []
-        
-        tgv_mapping = {
-            'tv_cognitive': 'Cognitive',
-            'tv_leadership': 'Leadership',
-            'tv_adaptability': 'Adaptability',
-            'tv_motivation': 'Motivation',
-            'tv_creativity': 'Creativity',
-            'tv_conscientiousness': 'Conscientiousness',
-            'tv_social': 'Social',
-            'tv_cultural_values': 'Cultural'
-        }
-        
-        for tv_key, tgv_name in tgv_mapping.items():
-            if tv_key in candidate:
-                baseline_key = tv_key.replace('tv_', '')
-                if baseline_key in baseline_dict:
-                    gap = candidate[tv_key] - baseline_dict[baseline_key]
-                    if gap > 0.1:
-                        strengths.append(f"{tgv_name}(+{gap:.2f})")
-                    elif gap < -0.1:
-                        gaps.append(f"{tgv_name}({gap:.2f})")
-        
-        candidate_data = {
-            'employee_id': candidate['employee_id'],
-            'name': candidate['fullname'],
-            'final_match_rate': candidate['final_match_rate'],
-            'top_tgvs': top_tgvs,
-            'top_tvs': top_tvs,
-            'strengths': ', '.join(strengths) if strengths else 'None',
-            'gaps': ', '.join(gaps) if gaps else 'None',
-            'position': candidate.get('position', 'N/A'),
-            'department': candidate.get('department', 'N/A')
-        }
-        display_data.append(candidate_data)
-    
-    display_df = pd.DataFrame(display_data)
+    # Buat dataframe untuk display dengan kolom yang diminta (columnar, tanpa iterrows)
+    display_df = build_ranked_talent_table(ranking.page(offset, limit), baseline_dict)
     
     # Format display
     display_df['final_match_rate'] = display_df['final_match_rate'].round(1)
@@ -1170,10 +666,17 @@ def display_ranked_talent_list_tab1(rankings, baseline_dict):
     )
 
 # REVISED FUNCTION: Display untuk Tab 2 dengan kolom tambahan
-def display_simple_ranked_talent_list(rankings, title="Ranked Talent List"):
+def display_simple_ranked_talent_list(ranking, title="Ranked Talent List", key="tab2"):
     """Display sederhana untuk Tab 2 dengan kolom Role, Division, dan Job Level"""
     st.header(title)
     
+    if ranking is None or ranking.available == 0:
+        st.warning("No data available for display")
+        return
+    
+    offset, limit = render_page_control(ranking, key)
+    rankings = ranking.page(offset, limit)
+    
     # Kolom untuk Tab 2 - ditambah Role, Division, Job Level
     display_columns = [
         'employee_id', 'fullname', 'final_match_rate', 'position', 'department',
@@ -1215,6 +718,132 @@ def display_simple_ranked_talent_list(rankings, title="Ranked Talent List"):
         }
     )
 
+# =============================================================================
+# ANALYSIS SESSIONS: hasil tersimpan per session, di-render ulang pada rerun
+# =============================================================================
+
+# Jumlah analysis yang disimpan per session (per tab)
+ANALYSIS_HISTORY_SIZE = 5
+
+def get_analysis_store(name):
+    """AnalysisStore per session di st.session_state, bertahan lintas rerun"""
+    key = f"analysis_store_{name}"
+    if key not in st.session_state:
+        st.session_state[key] = AnalysisStore(max_entries=ANALYSIS_HISTORY_SIZE)
+    return st.session_state[key]
+
+def current_data_version():
+    """Data version engine atau source tables di streaming mode (bagian dari input analysis)"""
+    try:
+        if get_streaming_config()[0]:
+            return get_streaming_data_version()
+        return get_scoring_engine().data_version
+    except Exception:
+        return None
+
+def run_role_analysis(analysis_id, inputs, candidate_filters, match_weights, pin_profile=False):
+    """Ranking + AI job profile untuk Tab 1; return Analysis atau None jika gagal"""
+    benchmark_ids = inputs['benchmark_ids']
+    
+    # Generate AI Job Profile di background, overlap dengan ranking
+    ai_stream = submit_job_profile(inputs['role_name'], inputs['job_level'], inputs['role_purpose'], benchmark_ids, pin=pin_profile)
+    
+    # Compute talent matching dengan mapping TGV yang dikoreksi
+    baseline, ranking = run_talent_matching(benchmark_ids, match_weights)
+    if ranking is None:
+        st.error("Could not compute TGV baselines from selected benchmarks")
+        return None
+    
+    # Filter grade / directorate: Ranking terpisah atas subset kandidat untuk ranked list;
+    # dashboard tetap memakai histogram dan correlation seluruh populasi
+    candidates = ranking
+    if candidate_filters:
+        candidates = get_talent_ranking(baseline, match_weights, candidate_filters)
+        if candidates is None:
+            return None
+    
+    # Hanya top-K yang di-materialize untuk chart dan insights; list di-page dari Ranking
+    rankings = candidates.top(RANKING_TOP_K)
+    if rankings.empty:
+        st.error("No ranking results returned")
+        return None
+    
+    return Analysis(
+        analysis_id, inputs, baseline, ranking, rankings, ai_stream,
+        candidates=candidates,
+        insights=generate_detailed_insights(rankings, baseline)
+    )
+
+def run_job_details_analysis(analysis_id, inputs):
+    """Ranking Tab 2 dengan default benchmark employees; return Analysis atau None"""
+    # Get some default benchmark employees
+    default_query = """
+    SELECT employee_id FROM employees 
+    WHERE fullname IS NOT NULL 
+    LIMIT 3
+    """
+    try:
+        with get_db_pool().connection() as conn:
+            default_benchmarks = pd.read_sql(default_query, conn)['employee_id'].tolist()
+    except Exception as e:
+        st.error(f"Error loading default benchmarks: {e}")
+        return None
+    
+    baseline, ranking = run_talent_matching(default_benchmarks)
+    if ranking is None:
+        st.error("Could not compute TGV baselines")
+        return None
+    
+    rankings = ranking.top(RANKING_TOP_K)
+    if rankings.empty:
+        st.error("No ranking results returned")
+        return None
+    
+    return Analysis(analysis_id, dict(inputs, benchmark_ids=default_benchmarks), baseline, ranking, rankings)
+
+def render_analysis_history(store):
+    """Picker untuk membuka ulang analysis sebelumnya di session ini"""
+    if len(store) < 2:
+        return
+    
+    # Widget mengikuti active analysis (mis. setelah Generate); pilihan user meng-activate lewat callback
+    st.session_state.analysis_history_tab1 = store.active_id
+    st.selectbox(
+        "Previous analyses",
+        options=store.ids(),
+        format_func=lambda analysis_id: store.get(analysis_id).label(),
+        key="analysis_history_tab1",
+        on_change=lambda: store.activate(st.session_state.analysis_history_tab1)
+    )
+
+def render_role_analysis(analysis):
+    """Render Tab 1 output dari analysis yang tersimpan (tanpa recompute)"""
+    st.markdown("---")
+    
+    # OUTPUT 1: AI-Generated Job Profile (di-stream token demi token jika belum selesai)
+    st.header("AI-Generated Job Profile")
+    ai_profile_slot = st.empty()
+    ai_profile_slot.markdown(analysis.ai_profile or "_Generating AI job profile..._")
+    
+    st.markdown("---")
+    
+    # OUTPUT 2: Ranked Talent List - DENGAN KOLOM YANG DIMINTA (paged)
+    display_ranked_talent_list_tab1(
+        analysis.artifacts.get('candidates', analysis.ranking), analysis.baseline, key=f"tab1_{analysis.analysis_id}"
+    )
+    
+    st.markdown("---")
+    
+    # OUTPUT 3: COMPREHENSIVE DASHBOARD VISUALIZATION (lazy panels)
+    render_talent_dashboard(analysis.ranking, analysis.rankings, analysis.baseline)
+    
+    # ROW 4: Detailed Insights
+    st.markdown("---")
+    st.markdown(analysis.artifacts['insights'])
+    
+    if analysis.ai_stream is not None:
+        st.session_state.ai_job_profile = render_job_profile_stream(analysis.ai_stream, ai_profile_slot)
+
 # =============================================================================
 # MAIN APP LAYOUT - REVISED DASHBOARD
 # =============================================================================
@@ -1223,100 +852,73 @@ def main():
     st.set_page_config(page_title="Talent Match Intelligence", layout="wide")
     st.title("Talent Match Intelligence System")
     
+    # Cache statistics untuk sizing result cache
+    with st.sidebar.expander("Ranking cache statistics"):
+        st.json(get_ranking_cache().stats())
+        if st.button("Reload data & invalidate cache", key="invalidate_ranking_cache"):
+            get_employee_directory.clear()
+            get_scoring_engine.clear()
+            get_ranking_cache().invalidate()
+    
+    # Batch mode: top-K per vacancy untuk succession planning
+    with st.sidebar.expander("Batch matching (all vacancies)"):
+        batch_top_k = st.number_input("Top-K per vacancy", min_value=1, max_value=1000, value=100, key="batch_top_k")
+        if st.button("Run batch matching", key="run_batch_matching"):
+            with st.spinner("Scoring all vacancies..."):
+                batch_results = run_batch_matching(top_k=int(batch_top_k))
+            if not batch_results.empty:
+                st.success(
+                    f"{batch_results['job_vacancy_id'].nunique()} vacancies scored, "
+                    f"{len(batch_results)} rows written to talent_match_results"
+                )
+                st.download_button(
+                    "Download results (CSV)",
+                    batch_results.to_csv(index=False),
+                    file_name="talent_match_results.csv",
+                    mime="text/csv"
+                )
+            else:
+                st.warning("No vacancies with valid benchmark employees found")
+    
     # Create tabs
     tab1, tab2 = st.tabs(["Role Information", "Job Details"])
     
     with tab1:
         # TAB 1: Role Information → Output: AI Job Profile + Ranked Talent + COMPREHENSIVE DASHBOARD
-        generate_btn, role_name, job_level, role_purpose, benchmark_ids = render_role_information_form()
+        generate_btn, role_name, job_level, role_purpose, benchmark_ids, pin_profile, candidate_filters, match_weights = render_role_information_form()
+        store = get_analysis_store("role")
         
         if generate_btn:
             if not all([role_name, job_level != "Choose level", role_purpose, benchmark_ids]):
                 st.error("Please complete all Role Information fields and select benchmark employees")
             else:
-                with st.spinner("Generating comprehensive analysis..."):
-                    # Generate AI Job Profile
-                    ai_profile = generate_job_profile(role_name, job_level, role_purpose, benchmark_ids)
-                    st.session_state.ai_job_profile = ai_profile
-                    
-                    # Compute talent matching dengan mapping TGV yang dikoreksi
-                    baseline = compute_tgv_baselines(benchmark_ids)
-                    
-                    if baseline:
-                        rankings = get_ranked_talent_with_tv_tgv_details(baseline)
-                        
-                        if not rankings.empty:
-                            st.session_state.ranked_talent = rankings
-                            st.session_state.baseline = baseline
-                            st.session_state.role_info_generated = True
-                            
-                            st.markdown("---")
-                            
-                            # OUTPUT 1: AI-Generated Job Profile
-                            st.header("AI-Generated Job Profile")
-                            st.markdown(ai_profile)
-                            
-                            st.markdown("---")
-                            
-                            # OUTPUT 2: Ranked Talent List - DENGAN KOLOM YANG DIMINTA
-                            display_ranked_talent_list_tab1(rankings, baseline)
-                            
-                            st.markdown("---")
-                            
-                            # OUTPUT 3: COMPREHENSIVE DASHBOARD VISUALIZATION
-                            st.header("Talent Match Dashboard - Comprehensive Analysis")
-                            
-                            # ROW 1: Match Distribution & Top Strengths Gaps
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.plotly_chart(
-                                    create_match_rate_distribution(rankings), 
-                                    use_container_width=True
-                                )
-                            
-                            with col2:
-                                st.plotly_chart(
-                                    create_tgv_strengths_gaps_chart(rankings, baseline),
-                                    use_container_width=True
-                                )
-                            
-                            # ROW 2: Benchmark Comparisons (Radar + Heatmap)
-                            st.subheader("Benchmark vs Candidate Comparisons")
-                            
-                            col3, col4 = st.columns(2)
-                            
-                            with col3:
-                                st.plotly_chart(
-                                    create_benchmark_comparison_radar(rankings, baseline),
-                                    use_container_width=True
-                                )
-                            
-                            with col4:
-                                st.plotly_chart(
-                                    create_tgv_heatmap_comparison(rankings, baseline),
-                                    use_container_width=True
-                                )
-                            
-                            # ROW 3: Correlation Analysis
-                            st.subheader("TGV Relationship Analysis")
-                            st.plotly_chart(
-                                create_tgv_correlation_heatmap(rankings),
-                                use_container_width=True
-                            )
-                            
-                            # ROW 4: Detailed Insights
-                            st.markdown("---")
-                            st.markdown(generate_detailed_insights(rankings, baseline))
-                            
-                        else:
-                            st.error("No ranking results returned")
-                    else:
-                        st.error("Could not compute TGV baselines from selected benchmarks")
+                inputs = {
+                    'role_name': role_name,
+                    'job_level': job_level,
+                    'role_purpose': role_purpose,
+                    'benchmark_ids': sorted(benchmark_ids),
+                    'candidate_filters': {column: sorted(values) for column, values in candidate_filters.items()},
+                    'weights': None if match_weights is None else match_weights.fingerprint,
+                    'data_version': current_data_version()
+                }
+                analysis_id = analysis_key(**inputs)
+                # Input sama dengan analysis sebelumnya: tampilkan ulang tanpa SQL / LLM call
+                if store.activate(analysis_id) is None:
+                    with st.spinner("Generating comprehensive analysis..."):
+                        analysis = run_role_analysis(analysis_id, inputs, candidate_filters, match_weights, pin_profile)
+                    if analysis is not None:
+                        store.put(analysis)
+                        st.session_state.role_info_generated = True
+        
+        # Hasil analysis di-render dari store pada setiap rerun
+        render_analysis_history(store)
+        if store.active is not None:
+            render_role_analysis(store.active)
     
     with tab2:
         # TAB 2: Job Details → Output: HANYA Ranked Talent List (sederhana)
         generate_btn = render_job_details_form()
+        store = get_analysis_store("job_details")
         
         if generate_btn:
             # Validate job details
@@ -1330,36 +932,26 @@ def main():
             if not valid_job_details:
                 st.error("Please add at least one valid item for each category in Job Details")
             else:
-                with st.spinner("Computing talent matches..."):
-                    # For Tab 2, use default benchmark employees
-                    st.info("Using default benchmark employees for talent matching")
-                    
-                    # Get some default benchmark employees
-                    default_query = """
-                    SELECT employee_id FROM employees 
-                    WHERE fullname IS NOT NULL 
-                    LIMIT 3
-                    """
-                    default_benchmarks = pd.read_sql(default_query, conn)['employee_id'].tolist()
-                    
-                    baseline = compute_tgv_baselines(default_benchmarks)
-                    
-                    if baseline:
-                        rankings = get_ranked_talent_with_tv_tgv_details(baseline)
-                        
-                        if not rankings.empty:
-                            st.session_state.ranked_talent = rankings
-                            st.session_state.job_details_generated = True
-                            
-                            st.markdown("---")
-                            
-                            # OUTPUT: HANYA Ranked Talent List (sederhana) dengan kolom tambahan
-                            display_simple_ranked_talent_list(rankings, "Ranked Talent List")
-                            
-                        else:
-                            st.error("No ranking results returned")
-                    else:
-                        st.error("Could not compute TGV baselines")
+                inputs = {
+                    'job_details': {field: list(st.session_state.job_details.get(field, [])) for field in required_fields},
+                    'data_version': current_data_version()
+                }
+                analysis_id = analysis_key(**inputs)
+                if store.activate(analysis_id) is None:
+                    with st.spinner("Computing talent matches..."):
+                        analysis = run_job_details_analysis(analysis_id, inputs)
+                    if analysis is not None:
+                        store.put(analysis)
+                        st.session_state.job_details_generated = True
+        
+        if store.active is not None:
+            st.info("Using default benchmark employees for talent matching")
+            st.markdown("---")
+            
+            # OUTPUT: HANYA Ranked Talent List (sederhana) dengan kolom tambahan
+            display_simple_ranked_talent_list(
+                store.active.ranking, "Ranked Talent List", key=f"tab2_{store.active.analysis_id}"
+            )
 
 if __name__ == "__main__":
 
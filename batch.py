@@ -0,0 +1,118 @@
+import os
+
+import pandas as pd
+
+from scoring import TGV_COLUMNS, compile_weights
+
+# =============================================================================
+# BATCH MATCHING: top-K kandidat untuk banyak job vacancy sekaligus
+# =============================================================================
+
+VACANCY_BENCHMARKS_QUERY = """
+SELECT job_vacancy_id, role_name, job_level, selected_talent_ids, weights_config
+FROM talent_benchmarks
+{where}
+ORDER BY job_vacancy_id
+"""
+
+MATCH_RESULTS_DDL = """
+CREATE TABLE IF NOT EXISTS talent_match_results (
+    job_vacancy_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    employee_id TEXT NOT NULL,
+    final_match_rate REAL,
+    tv_adaptability REAL,
+    tv_cognitive REAL,
+    tv_conscientiousness REAL,
+    tv_creativity REAL,
+    tv_cultural_values REAL,
+    tv_leadership REAL,
+    tv_motivation REAL,
+    tv_social REAL,
+    data_version TEXT,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (job_vacancy_id, rank)
+);
+"""
+
+RESULT_COLUMNS = ['job_vacancy_id', 'rank', 'employee_id', 'final_match_rate'] + TGV_COLUMNS + ['data_version']
+
+# Schema tetap hasil match_vacancies: kolom tabel + identitas kandidat untuk export / download
+DISPLAY_COLUMNS = ['fullname', 'position', 'department', 'directorate', 'grade']
+OUTPUT_COLUMNS = RESULT_COLUMNS[:3] + DISPLAY_COLUMNS + RESULT_COLUMNS[3:]
+
+
+def load_vacancy_benchmarks(conn, vacancy_ids=None):
+    """Benchmark sets dan weights dari talent_benchmarks.
+
+    Return ``(benchmark_sets, weights)``: dict job_vacancy_id -> selected_talent_ids
+    dan dict job_vacancy_id -> MatchWeights (hanya vacancy dengan weights_config
+    yang mengubah hasil).
+    """
+    if vacancy_ids:
+        query = VACANCY_BENCHMARKS_QUERY.format(where="WHERE job_vacancy_id = ANY(%(vacancy_ids)s)")
+        vacancies = pd.read_sql(query, conn, params={'vacancy_ids': list(vacancy_ids)})
+    else:
+        vacancies = pd.read_sql(VACANCY_BENCHMARKS_QUERY.format(where=""), conn)
+    benchmark_sets, weights = {}, {}
+    for row in vacancies.itertuples(index=False):
+        benchmark_sets[row.job_vacancy_id] = list(row.selected_talent_ids or [])
+        compiled = compile_weights(row.weights_config)
+        if compiled is not None:
+            weights[row.job_vacancy_id] = compiled
+    return benchmark_sets, weights
+
+
+def match_vacancies(engine, benchmark_sets, top_k=100, weights=None):
+    """Score semua employee terhadap semua vacancy dalam satu pass; return top-K per vacancy
+
+    Kolom selalu ``OUTPUT_COLUMNS``, apa pun kolom tambahan di employee data.
+    """
+    results = engine.batch_rank(benchmark_sets, k=top_k, weights=weights)
+    if results.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    results = results.rename(columns={'key': 'job_vacancy_id'})
+    results['data_version'] = engine.data_version
+    return results.reindex(columns=OUTPUT_COLUMNS)
+
+
+def write_match_results(conn, results):
+    """Ganti hasil lama untuk vacancy yang sama di talent_match_results (satu transaksi)"""
+    # Import di sini agar modul ini bisa di-import tanpa driver database
+    from psycopg2.extras import execute_values
+
+    rows = results[RESULT_COLUMNS].astype(object).where(results[RESULT_COLUMNS].notna(), None)
+    with conn.cursor() as cur:
+        cur.execute(MATCH_RESULTS_DDL)
+        cur.execute(
+            "DELETE FROM talent_match_results WHERE job_vacancy_id = ANY(%s)",
+            (results['job_vacancy_id'].unique().tolist(),)
+        )
+        execute_values(
+            cur,
+            f"INSERT INTO talent_match_results ({', '.join(RESULT_COLUMNS)}) VALUES %s",
+            rows.itertuples(index=False, name=None),
+            page_size=1000
+        )
+    conn.commit()
+    return len(results)
+
+
+def export_match_results(results, path, fmt=None):
+    """Tulis hasil ke file; format ('csv', 'parquet', 'json') default dari extension"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower() or 'csv'
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if fmt == 'parquet':
+        # Butuh pyarrow atau fastparquet
+        results.to_parquet(path, index=False)
+    elif fmt == 'json':
+        results.to_json(path, orient='records', indent=2, force_ascii=False)
+    elif fmt == 'csv':
+        results.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    return path
@@ -0,0 +1,386 @@
+"""Performance benchmark untuk matching pipeline dengan synthetic data.
+
+Setiap skala: generate data -> load ke database -> employee features ->
+scoring engine -> baseline -> ranking -> KD-tree vs scan top-K (``nearest_*``) ->
+top TVs/TGVs -> tabel, insights dan charts. Waktu (best of ``--repeat``) dan peak memory (tracemalloc) dicatat per
+stage, lalu dibandingkan dengan baseline JSON::
+
+    python benchmark.py --scales 1k 10k 100k --update-baseline
+    python benchmark.py --scales 1k 10k 100k            # exit 1 jika ada regression
+    python benchmark.py --scales 1m --backend postgres --secrets .streamlit/secrets.toml
+
+Backend ``sqlite`` (default) adalah stand-in lokal: tabel ditulis ke SQLite
+dan employee features dibentuk di pandas (query app memakai syntax PostgreSQL).
+Backend ``postgres`` memuat tabel ke schema terpisah dan menjalankan query asli.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from features import load_employee_features
+from insights import (build_ranked_talent_table, generate_detailed_insights, get_top_tgvs, get_top_tvs,
+                      top_tgv_strings, top_tv_strings)
+from scoring import TGV_COLUMNS, TGV_KEYS, TGVIndex, TGVScoringEngine, baseline_vector
+from synthetic import (employee_features_from_tables, generate_tables, load_postgres, load_sqlite, parse_scale,
+                       read_sqlite)
+
+DEFAULT_BASELINE_PATH = os.path.join(".benchmarks", "baseline.json")
+
+DEFAULT_SCALES = ['1k', '10k', '100k']
+
+# Stage yang hanya dijalankan sekali (setup mahal); sisanya best of --repeat.
+# Satu run (I/O, allocator) jauh lebih noisy dari best of N: dibandingkan dengan
+# --setup-tolerance yang lebih lebar (unchanged rerun terukur +40-50%)
+SINGLE_RUN_STAGES = {'generate', 'load', 'load_employee_features', 'scoring_engine'}
+
+# Regression: lebih lambat / lebih boros dari baseline * (1 + tolerance) DAN selisih absolut
+# di atas batas ini (stage yang sangat cepat terlalu noisy untuk dibandingkan relatif saja)
+MIN_SECONDS_DELTA = 0.005
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+# =============================================================================
+# STAGES
+# =============================================================================
+
+def _digest(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _stage_charts(context):
+    # Plotly hanya dibutuhkan untuk stage ini
+    import charts
+
+    rankings, baseline = context['rankings'], context['baseline']
+    ranking = context['ranking']
+    return [
+        charts.create_match_rate_distribution(ranking.distribution()),
+        charts.create_tgv_strengths_gaps_chart(rankings, baseline),
+        charts.create_benchmark_comparison_radar(rankings, baseline),
+        charts.create_tgv_heatmap_comparison(rankings, baseline),
+        charts.create_tgv_correlation_heatmap(ranking.tgv_correlation()),
+    ]
+
+
+def _load_stage(context):
+    if context['backend'] == 'postgres':
+        with context['pool'].connection() as conn:
+            load_postgres(conn, context['tables'], context['schema'])
+    else:
+        load_sqlite(context['sqlite'], context['tables'])
+    return True
+
+
+def _features_stage(context):
+    if context['backend'] == 'postgres':
+        with context['pool'].connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SET search_path TO {context['schema']}")
+            return load_employee_features(conn)
+    return employee_features_from_tables(read_sqlite(context['sqlite']))
+
+
+def _nearest_filters(engine):
+    """Filter kandidat seperti di app: satu directorate (~1/5 populasi synthetic)"""
+    return {'directorate': engine.filter_values('directorate')[:1]}
+
+
+def _index_top_k(context, filters=None):
+    """Top-k lewat TGVIndex saja (tanpa pilihan otomatis di ``engine.nearest``)"""
+    engine = context['engine']
+    rows, scores = context['index'].query(
+        baseline_vector(context['baseline']), context['top_k'], mask=engine.filter_mask(filters)
+    )
+    return engine.frame_for(rows, scores)
+
+
+def _benchmark_ids(engine, count=3):
+    """Benchmark employees deterministik: rankable employees di posisi tetap"""
+    rows = np.flatnonzero(engine.rankable)
+    picks = rows[np.linspace(0, len(rows) - 1, count + 2).astype(int)[1:-1]]
+    return [str(engine.employee_ids[row]) for row in picks]
+
+
+# (nama, fungsi(context) -> hasil, key context untuk hasil)
+STAGES = [
+    ('generate', lambda c: generate_tables(c['n_employees'], seed=c['seed']), 'tables'),
+    ('load', _load_stage, 'loaded'),
+    ('load_employee_features', _features_stage, 'features'),
+    ('scoring_engine', lambda c: TGVScoringEngine(c['features']), 'engine'),
+    ('compute_tgv_baselines', lambda c: c['engine'].compute_baseline(c['benchmark_ids']), 'baseline'),
+    ('ranking', lambda c: c['engine'].ranking(c['baseline']), 'ranking'),
+    # Ranking baru setiap run: Ranking meng-cache sorted prefix, sehingga top() kedua tidak representatif
+    ('ranking_top_k', lambda c: c['engine'].ranking(c['baseline']).top(c['top_k']), 'rankings'),
+    # KD-tree vs masked Ranking scan pada k = --top-k (500, sama dengan app)
+    ('tgv_index', lambda c: TGVIndex(c['engine'].tgv_matrix), 'index'),
+    ('nearest_index', _index_top_k, 'nearest'),
+    ('nearest_scan', lambda c: c['engine'].ranking(c['baseline']).top(c['top_k']), 'nearest_scan'),
+    ('nearest_filtered_index', lambda c: _index_top_k(c, _nearest_filters(c['engine'])), 'nearest_filtered'),
+    ('nearest_filtered_scan', lambda c: c['engine'].ranking(
+        c['baseline'], filters=_nearest_filters(c['engine'])
+    ).top(c['top_k']), 'nearest_filtered_scan'),
+    ('top_tvs_tgvs', lambda c: (top_tv_strings(c['rankings']), top_tgv_strings(c['rankings'])), 'top_strings'),
+    ('top_tvs_tgvs_per_candidate', lambda c: [
+        (get_top_tvs(candidate), get_top_tgvs(candidate)) for _, candidate in c['rankings'].iterrows()
+    ], None),
+    ('ranked_talent_table', lambda c: build_ranked_talent_table(c['rankings'], c['baseline']), 'table'),
+    ('detailed_insights', lambda c: generate_detailed_insights(c['rankings'], c['baseline']), None),
+    ('charts', _stage_charts, None),
+]
+
+
+def result_checks(context):
+    """Fingerprint hasil (bukan waktu) untuk mendeteksi perubahan output"""
+    rankings = context['rankings']
+    return {
+        'benchmark_ids': context['benchmark_ids'],
+        'baseline': _digest([round(context['baseline'][key], 6) for key in TGV_KEYS]),
+        'population': len(context['ranking']),
+        'top_k': _digest(
+            rankings['employee_id'].astype(str).tolist(),
+            np.round(rankings['final_match_rate'].to_numpy(dtype=np.float64), 3).tolist(),
+            np.round(rankings[TGV_COLUMNS].to_numpy(dtype=np.float64), 4).tolist()
+        ),
+        # Index dan scan harus mengembalikan kandidat dan urutan yang sama
+        'nearest_matches_scan': all(
+            context[index]['employee_id'].tolist() == context[scan]['employee_id'].tolist()
+            for index, scan in [('nearest', 'nearest_scan'), ('nearest_filtered', 'nearest_filtered_scan')]
+        ),
+        'ranked_talent_table': _digest(context['table'].drop(columns=['final_match_rate']).astype(str).values.tolist()),
+    }
+
+
+def measure(stage, context, repeat=3, trace_memory=True):
+    """(hasil, detik terbaik, peak MB); peak diukur di run terpisah agar tracing tidak masuk waktu"""
+    _, fn, _ = stage
+    runs = 1 if stage[0] in SINGLE_RUN_STAGES else max(repeat, 1)
+    best = float('inf')
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(context)
+        best = min(best, time.perf_counter() - start)
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            result = fn(context)
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return result, best, peak_mb
+
+
+def run_scale(scale, args, pool=None):
+    """Jalankan semua stage untuk satu skala; return {'stages': ..., 'checks': ...}"""
+    context = {
+        'n_employees': parse_scale(scale),
+        'seed': args.seed,
+        'top_k': args.top_k,
+        'backend': args.backend,
+        'schema': args.schema,
+        'pool': pool,
+    }
+    selected = set(args.stages or [name for name, _, _ in STAGES])
+
+    workdir = tempfile.mkdtemp(prefix="talent-bench-") if args.backend == 'sqlite' else None
+    if workdir:
+        context['sqlite'] = sqlite3.connect(os.path.join(workdir, f"{scale}.sqlite"))
+
+    stages = {}
+    try:
+        for stage in STAGES:
+            name, _, key = stage
+            # Stage yang tidak dipilih tetap dijalankan jika hasilnya dibutuhkan stage berikutnya
+            if name not in selected and key is None:
+                continue
+            measured = name in selected
+            result, seconds, peak_mb = measure(
+                stage, context, args.repeat if measured else 1, trace_memory=measured and not args.no_memory
+            )
+            if key is not None:
+                context[key] = result
+            if name == 'scoring_engine':
+                context['benchmark_ids'] = _benchmark_ids(result)
+            if measured:
+                stages[name] = {'seconds': seconds, 'peak_mb': peak_mb}
+                memory = "" if peak_mb is None else f"  peak {peak_mb:9.1f} MB"
+                print(f"  {name:<40} {seconds * 1000:10.1f} ms{memory}", file=sys.stderr)
+        checks = result_checks(context)
+    finally:
+        if workdir:
+            context['sqlite'].close()
+            for name in os.listdir(workdir):
+                os.remove(os.path.join(workdir, name))
+            os.rmdir(workdir)
+
+    return {
+        'n_employees': context['n_employees'],
+        'backend': args.backend,
+        'seed': args.seed,
+        'top_k': args.top_k,
+        'stages': stages,
+        'checks': checks
+    }
+
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def compare(results, baseline, tolerance=0.25, memory_tolerance=0.25, setup_tolerance=1.0):
+    """(regressions, skipped): daftar regression dibanding baseline dan skala yang tidak sebanding
+
+    Waktu stage di ``SINGLE_RUN_STAGES`` memakai ``setup_tolerance``; memory memakai
+    ``memory_tolerance`` untuk semua stage.
+    """
+    regressions, skipped = [], []
+    for scale, result in results['scales'].items():
+        expected = baseline.get('scales', {}).get(scale)
+        if expected is None:
+            skipped.append(f"{scale}: not in baseline")
+            continue
+        settings = [key for key in ('backend', 'seed', 'top_k') if expected.get(key) != result[key]]
+        if settings:
+            skipped.append(f"{scale}: baseline recorded with different {', '.join(settings)}")
+            continue
+
+        for key, value in result['checks'].items():
+            if expected['checks'].get(key) != value:
+                regressions.append(f"{scale}: result '{key}' changed ({expected['checks'].get(key)!r} -> {value!r})")
+
+        for name, measured in result['stages'].items():
+            reference = expected['stages'].get(name)
+            if reference is None:
+                continue
+            seconds, base_seconds = measured['seconds'], reference['seconds']
+            time_tolerance = setup_tolerance if name in SINGLE_RUN_STAGES else tolerance
+            if seconds > base_seconds * (1 + time_tolerance) and seconds - base_seconds > MIN_SECONDS_DELTA:
+                regressions.append(
+                    f"{scale}: {name} {seconds * 1000:.1f} ms vs baseline {base_seconds * 1000:.1f} ms "
+                    f"(+{(seconds / base_seconds - 1) * 100:.0f}%)"
+                )
+            peak, base_peak = measured.get('peak_mb'), reference.get('peak_mb')
+            if peak is not None and base_peak is not None:
+                if peak > base_peak * (1 + memory_tolerance) and peak - base_peak > MIN_MEMORY_DELTA_MB:
+                    regressions.append(f"{scale}: {name} peak {peak:.1f} MB vs baseline {base_peak:.1f} MB")
+    return regressions, skipped
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(data, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def environment():
+    """Info mesin: baseline hanya sebanding jika dijalankan di environment yang sama"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def build_parser():
+    stage_names = [name for name, _, _ in STAGES]
+    parser = argparse.ArgumentParser(description="Benchmark talent matching pipeline dengan synthetic data")
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES, help="Jumlah employee, mis. 1k 10k 100k 1m")
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite", help="Database untuk tabel sumber")
+    parser.add_argument("--secrets", help="secrets.toml dengan section [postgres] (backend postgres)")
+    parser.add_argument("--schema", default="talent_bench", help="Schema PostgreSQL untuk synthetic tables")
+    parser.add_argument("--stages", nargs="+", choices=stage_names, help="Hanya ukur stage ini")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N untuk stage komputasi (default 3)")
+    parser.add_argument("--top-k", type=int, default=500, help="Jumlah kandidat untuk tabel / charts")
+    parser.add_argument("--seed", type=int, default=42, help="Seed synthetic data")
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran peak memory")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Path baseline JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Toleransi waktu relatif (default 0.25)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Toleransi peak memory relatif")
+    parser.add_argument("--setup-tolerance", type=float, default=1.0,
+                        help="Toleransi waktu relatif untuk stage setup yang hanya diukur sekali (default 1.0)")
+    parser.add_argument("--output", help="Tulis hasil lengkap ke JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    pool = None
+    if args.backend == 'postgres':
+        from pipeline import DEFAULT_SECRETS_PATH, connect, load_postgres_config
+
+        pool = connect(load_postgres_config(args.secrets or DEFAULT_SECRETS_PATH))
+
+    results = {'environment': environment(), 'backend': args.backend, 'seed': args.seed, 'scales': {}}
+    try:
+        for scale in args.scales:
+            print(f"[{scale}] {parse_scale(scale):,} employees ({args.backend})", file=sys.stderr)
+            results['scales'][scale] = run_scale(scale, args, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    if args.output:
+        save_json(results, args.output)
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline) or {'scales': {}}
+        baseline['scales'].update(results['scales'])
+        baseline['environment'] = results['environment']
+        save_json(baseline, args.baseline)
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        # Tanpa baseline tidak ada yang dibandingkan: gagal, baseline dibuat eksplisit
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one", file=sys.stderr)
+        return 1
+    if baseline.get('environment') != results['environment']:
+        print("WARNING: baseline was recorded in a different environment; timings may not be comparable",
+              file=sys.stderr)
+
+    regressions, skipped = compare(results, baseline, args.tolerance, args.memory_tolerance, args.setup_tolerance)
+    for note in skipped:
+        print(f"Skipped comparison for {note}", file=sys.stderr)
+    if regressions:
+        print(f"\nREGRESSIONS AGAINST BASELINE ({len(regressions)}):", file=sys.stderr)
+        for regression in regressions:
+            print(f"  - {regression}", file=sys.stderr)
+        return 1
+    if len(skipped) == len(results['scales']):
+        print("Nothing compared against baseline; run with --update-baseline for these settings", file=sys.stderr)
+        return 1
+    print("No regressions against baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
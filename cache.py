@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def ranking_cache_key(benchmark_ids, data_version, weights=None):
+    """Key kanonik: data-version stamp + benchmark IDs unik yang di-sort + weights fingerprint"""
+    return (data_version, tuple(sorted(set(benchmark_ids))), None if weights is None else weights.fingerprint)
+
+
+class RankingCache:
+    """Thread-safe LRU cache dengan TTL dan memory budget, di-share lintas session.
+
+    Key berbentuk ``(data_version, benchmark_ids, weights_fingerprint)`` (lihat
+    ``ranking_cache_key``; fingerprint None tanpa weights); entry dengan
+    data_version lama dibuang lewat ``discard_stale``. ``max_entries`` membatasi
+    jumlah entry untuk value yang ukurannya mahal dihitung (``size`` 0).
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, ttl=1800, max_entries=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            value, _, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def put(self, key, value, size=0):
+        """Simpan value; entry paling lama tidak dipakai dibuang sampai muat di budget"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and (
+                self._bytes + size > self.max_bytes
+                or (self.max_entries is not None and len(self._entries) >= self.max_entries)
+            ):
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+
+    def discard_stale(self, data_version):
+        """Buang entry yang dihitung dari data_version lain (source tables berubah)"""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] != data_version]
+            for key in stale:
+                self._remove(key)
+            self._stats['invalidations'] += len(stale)
+
+    def invalidate(self):
+        with self._lock:
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries
+            }
+
+
+class JobProfileCache:
+    """Persistent SQLite cache untuk AI job profiles, keyed by prompt fingerprint.
+
+    Entry kadaluarsa setelah ``ttl`` detik kecuali di-pin. Jika jumlah entry
+    atau total ukuran melewati limit, entry unpinned yang paling lama tidak
+    dipakai dibuang lebih dulu.
+    """
+
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=1000, max_bytes=20 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_profiles (
+                    fingerprint TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    pinned INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def get(self, fingerprint):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content, created_at, pinned FROM job_profiles WHERE fingerprint = ?",
+                (fingerprint,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            content, created_at, pinned = row
+            if not pinned and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM job_profiles WHERE fingerprint = ?", (fingerprint,))
+                return None
+
+            self._conn.execute(
+                "UPDATE job_profiles SET last_used = ? WHERE fingerprint = ?", (now, fingerprint)
+            )
+            return content
+
+    def put(self, fingerprint, content, pinned=False):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO job_profiles (fingerprint, content, size, created_at, last_used, pinned)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (fingerprint) DO UPDATE SET
+                    content = excluded.content,
+                    size = excluded.size,
+                    created_at = excluded.created_at,
+                    last_used = excluded.last_used,
+                    pinned = MAX(job_profiles.pinned, excluded.pinned)
+                """,
+                (fingerprint, content, len(content.encode()), now, now, int(pinned))
+            )
+            self._enforce_limits(now)
+
+    def pin(self, fingerprint, pinned=True):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_profiles SET pinned = ? WHERE fingerprint = ?", (int(pinned), fingerprint)
+            )
+
+    def _enforce_limits(self, now):
+        self._conn.execute(
+            "DELETE FROM job_profiles WHERE pinned = 0 AND created_at < ?", (now - self.ttl,)
+        )
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM job_profiles"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        unpinned = self._conn.execute(
+            "SELECT fingerprint, size FROM job_profiles WHERE pinned = 0 ORDER BY last_used"
+        ).fetchall()
+        evicted = []
+        for fingerprint, size in unpinned:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((fingerprint,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM job_profiles WHERE fingerprint = ?", evicted)
+
+    def stats(self):
+        with self._lock:
+            count, total, pinned = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(pinned), 0) FROM job_profiles"
+            ).fetchone()
+        return {'entries': count, 'bytes': total, 'pinned': pinned}
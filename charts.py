@@ -0,0 +1,294 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# =============================================================================
+# VISUALIZATION FUNCTIONS FOR TAB 1 - DASHBOARD COMPONENTS
+# =============================================================================
+
+def create_tgv_strengths_gaps_chart(rankings, baseline_dict):
+    """Top Strengths & Gaps across TGVs - Bar Plot"""
+    if len(rankings) == 0 or not baseline_dict:
+        return go.Figure()
+    
+    top_candidate = rankings.iloc[0]
+    
+    # TGV mapping untuk display
+    tgv_display_names = {
+        'tv_cognitive': 'Cognitive Complexity',
+        'tv_leadership': 'Leadership & Influence', 
+        'tv_adaptability': 'Adaptability & Stress',
+        'tv_motivation': 'Motivation & Drive',
+        'tv_creativity': 'Creativity & Innovation',
+        'tv_conscientiousness': 'Conscientiousness',
+        'tv_social': 'Social Orientation',
+        'tv_cultural_values': 'Cultural Values'
+    }
+    
+    gap_data = []
+    
+    for tv_key, display_name in tgv_display_names.items():
+        if tv_key in top_candidate:
+            baseline_key = tv_key.replace('tv_', '')
+            if baseline_key in baseline_dict:
+                candidate_score = top_candidate[tv_key]
+                baseline_score = baseline_dict[baseline_key]
+                gap = candidate_score - baseline_score
+                
+                gap_data.append({
+                    'TGV': display_name,
+                    'Candidate_Score': candidate_score,
+                    'Benchmark_Score': baseline_score,
+                    'Gap': gap,
+                    'Type': 'Strength' if gap > 0 else 'Gap'
+                })
+    
+    if not gap_data:
+        return go.Figure()
+        
+    df = pd.DataFrame(gap_data)
+    
+    fig = go.Figure()
+    
+    # Add benchmark bars
+    fig.add_trace(go.Bar(
+        name='Benchmark',
+        x=df['TGV'],
+        y=df['Benchmark_Score'],
+        marker_color='lightblue',
+        opacity=0.7,
+        text=df['Benchmark_Score'].round(3),
+        textposition='auto'
+    ))
+    
+    # Add candidate bars
+    fig.add_trace(go.Bar(
+        name='Top Candidate',
+        x=df['TGV'],
+        y=df['Candidate_Score'],
+        marker_color='lightcoral',
+        opacity=0.7,
+        text=df['Candidate_Score'].round(3),
+        textposition='auto'
+    ))
+    
+    fig.update_layout(
+        title='Top Candidate vs Benchmark: TGV Comparison',
+        xaxis_tickangle=-45,
+        yaxis_title="Score",
+        barmode='group',
+        showlegend=True,
+        height=500
+    )
+    
+    return fig
+
+def create_benchmark_comparison_radar(rankings, baseline_dict, top_n=3):
+    """Benchmark vs Candidate Comparisons - Radar Chart"""
+    if len(rankings) == 0 or not baseline_dict:
+        return go.Figure()
+    
+    # Select top N candidates
+    top_candidates = rankings.head(top_n)
+    
+    # TGV categories untuk radar chart
+    radar_categories = [
+        'Cognitive', 'Leadership', 'Adaptability', 
+        'Motivation', 'Creativity', 'Conscientiousness'
+    ]
+    
+    radar_keys = [
+        'cognitive_complexity', 'leadership_influence', 'adaptability_stress',
+        'motivation_drive', 'creativity_innovation', 'conscientiousness'
+    ]
+    
+    fig = go.Figure()
+    
+    # Add benchmark trace
+    benchmark_scores = [baseline_dict.get(key, 0) for key in radar_keys]
+    fig.add_trace(go.Scatterpolar(
+        r=benchmark_scores + [benchmark_scores[0]],
+        theta=radar_categories + [radar_categories[0]],
+        fill='toself',
+        name='Benchmark Profile',
+        line=dict(color='blue', width=3),
+        opacity=0.3
+    ))
+    
+    # Colors for top candidates
+    colors = ['red', 'orange', 'green']
+    
+    # Add top candidates traces
+    for i, (_, candidate) in enumerate(top_candidates.iterrows()):
+        candidate_scores = []
+        for key in radar_keys:
+            candidate_key = f"tv_{key.split('_')[0]}"
+            candidate_scores.append(candidate.get(candidate_key, 0))
+        
+        fig.add_trace(go.Scatterpolar(
+            r=candidate_scores + [candidate_scores[0]],
+            theta=radar_categories + [radar_categories[0]],
+            fill='toself',
+            name=f"{candidate['fullname']} ({candidate['final_match_rate']:.1f}%)",
+            line=dict(color=colors[i], width=2),
+            opacity=0.5
+        ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1]
+            )),
+        showlegend=True,
+        title="Benchmark vs Top Candidates - Radar Comparison",
+        height=500
+    )
+    
+    return fig
+
+def create_tgv_heatmap_comparison(rankings, baseline_dict, top_n=5):
+    """TGV Heatmap - Candidate vs Benchmark Comparison"""
+    if len(rankings) == 0 or not baseline_dict:
+        return go.Figure()
+    
+    top_candidates = rankings.head(top_n)
+    
+    # TGV mapping
+    tgv_mapping = {
+        'tv_cognitive': 'Cognitive',
+        'tv_leadership': 'Leadership',
+        'tv_adaptability': 'Adaptability',
+        'tv_motivation': 'Motivation',
+        'tv_creativity': 'Creativity',
+        'tv_conscientiousness': 'Conscientiousness',
+        'tv_social': 'Social',
+        'tv_cultural_values': 'Cultural'
+    }
+    
+    # Prepare data for heatmap
+    candidates_data = []
+    candidate_names = []
+    
+    for _, candidate in top_candidates.iterrows():
+        candidate_scores = []
+        for tv_key, tgv_name in tgv_mapping.items():
+            if tv_key in candidate:
+                baseline_key = tv_key.replace('tv_', '')
+                baseline_score = baseline_dict.get(baseline_key, 0)
+                candidate_score = candidate[tv_key]
+                
+                # Calculate gap percentage
+                if baseline_score > 0:
+                    gap_pct = ((candidate_score - baseline_score) / baseline_score) * 100
+                else:
+                    gap_pct = 0
+                
+                candidate_scores.append(gap_pct)
+        
+        candidates_data.append(candidate_scores)
+        candidate_names.append(f"{candidate['fullname']} ({candidate['final_match_rate']:.1f}%)")
+    
+    if not candidates_data:
+        return go.Figure()
+    
+    # Create heatmap
+    fig = go.Figure(data=go.Heatmap(
+        z=candidates_data,
+        x=list(tgv_mapping.values()),
+        y=candidate_names,
+        colorscale='RdBu',
+        zmid=0,
+        text=[[f"{val:.1f}%" for val in row] for row in candidates_data],
+        texttemplate="%{text}",
+        textfont={"size": 10},
+        hoverinfo="text",
+        hovertemplate="Candidate: %{y}<br>TGV: %{x}<br>Gap: %{z:.1f}%<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title='TGV Gap Analysis: Candidates vs Benchmark (%)',
+        xaxis_title="Talent Group Variables (TGV)",
+        yaxis_title="Top Candidates",
+        height=400
+    )
+    
+    return fig
+
+def create_match_rate_distribution(distribution):
+    """Match Rate Distribution - Histogram dari pre-aggregated bin counts"""
+    if not distribution or distribution['count'] == 0:
+        return go.Figure()
+    
+    edges = distribution['edges']
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=distribution['counts'],
+        width=np.diff(edges),
+        marker_color='#1f77b4',
+        opacity=0.7
+    ))
+    
+    # Add vertical line for average
+    avg_match_rate = distribution['mean']
+    fig.add_vline(
+        x=avg_match_rate, 
+        line_dash="dash", 
+        line_color="red",
+        annotation_text=f"Avg: {avg_match_rate:.1f}%"
+    )
+    
+    fig.update_layout(
+        title="Match Rate Distribution Across Candidates",
+        xaxis_title="Match Rate (%)",
+        yaxis_title="Number of Candidates",
+        showlegend=False,
+        height=400
+    )
+    
+    return fig
+
+def create_tgv_correlation_heatmap(corr_matrix):
+    """TGV Correlation Matrix - Heatmap dari pre-aggregated correlation matrix (TGV x TGV)"""
+    if corr_matrix is None or len(corr_matrix) < 2:
+        return go.Figure()
+    
+    # Rename columns for display
+    display_names = {
+        'tv_cognitive': 'Cognitive',
+        'tv_leadership': 'Leadership',
+        'tv_adaptability': 'Adaptability',
+        'tv_motivation': 'Motivation',
+        'tv_creativity': 'Creativity',
+        'tv_conscientiousness': 'Conscientiousness',
+        'tv_social': 'Social',
+        'tv_cultural_values': 'Cultural'
+    }
+    
+    corr_matrix_display = corr_matrix.rename(
+        index=display_names, 
+        columns=display_names
+    )
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=corr_matrix_display.values,
+        x=corr_matrix_display.columns,
+        y=corr_matrix_display.index,
+        colorscale='RdBu',
+        zmin=-1,
+        zmax=1,
+        text=corr_matrix_display.round(2).values,
+        texttemplate="%{text}",
+        textfont={"size": 12},
+        hoverinfo="text",
+        hovertemplate="TGV1: %{y}<br>TGV2: %{x}<br>Correlation: %{z:.2f}<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title='TGV Correlation Matrix',
+        xaxis_title="Talent Group Variables",
+        yaxis_title="Talent Group Variables",
+        height=500
+    )
+    
+    return fig
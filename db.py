@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool
+
+
+class ConnectionPool:
+    """Bounded, thread-safe PostgreSQL pool yang di-share oleh semua session.
+
+    Koneksi dicek (SELECT 1) sebelum dipinjam jika sudah idle lebih dari
+    ``health_check_interval`` detik; koneksi rusak dibuang dan diganti baru.
+    Jika semua koneksi sedang dipakai, caller menunggu hingga ``timeout`` detik.
+    """
+
+    def __init__(self, config, minconn=1, maxconn=10, timeout=30, health_check_interval=30):
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._pool = pool.ThreadedConnectionPool(
+            minconn,
+            maxconn,
+            host=config["host"],
+            port=config["port"],
+            database=config["database"],
+            user=config["user"],
+            password=config["password"],
+            sslmode=config.get("sslmode", "require"),
+            client_encoding='utf8'
+        )
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+        self._lock = threading.Lock()
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        with self._lock:
+            last_used = self._last_used.get(id(conn), 0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+
+    def _checkout(self):
+        # Satu kali reconnect: koneksi pertama bisa saja sudah diputus server
+        for _ in range(2):
+            conn = self._pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+        return self._pool.getconn()
+
+    @contextmanager
+    def connection(self):
+        """Pinjam satu koneksi; otomatis rollback dan dikembalikan ke pool"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pool.PoolError(f"No database connection available within {self.timeout}s")
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            if conn is not None:
+                self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                    with self._lock:
+                        self._last_used[id(conn)] = time.monotonic()
+                    self._pool.putconn(conn)
+                except psycopg2.Error:
+                    self._discard(conn)
+            self._slots.release()
+
+    def close(self):
+        self._pool.closeall()
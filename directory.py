@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+EMPLOYEE_DIRECTORY_QUERY = """
+SELECT e.employee_id, e.fullname, p.name as position
+FROM employees e
+LEFT JOIN dim_positions p ON e.position_id = p.position_id
+WHERE e.fullname IS NOT NULL
+"""
+
+
+def load_employee_directory(conn):
+    return pd.read_sql(EMPLOYEE_DIRECTORY_QUERY, conn)
+
+
+class EmployeeDirectory:
+    """In-memory employee directory dengan search index untuk benchmark picker.
+
+    Setiap kata dari name, position dan employee ID masuk ke token array yang
+    di-sort, sehingga prefix search cukup dua binary search per kata. Jika hasil
+    prefix kurang dari ``limit``, dilengkapi dengan substring match.
+    """
+
+    def __init__(self, employees):
+        employees = employees.dropna(subset=['fullname']).drop_duplicates('employee_id')
+        self.employee_ids = employees['employee_id'].astype(str).to_numpy(dtype=object)
+        self.names = employees['fullname'].astype(str).to_numpy(dtype=object)
+        self.positions = employees['position'].fillna('N/A').astype(str).to_numpy(dtype=object)
+        self._row_index = {employee_id: i for i, employee_id in enumerate(self.employee_ids)}
+        # Urutan tampil hasil search: alfabetis berdasarkan nama
+        self._name_rank = np.argsort(np.argsort(self.names.astype(str), kind='stable'))
+
+        self._search_text = pd.Series(
+            self.names + ' ' + self.positions + ' ' + self.employee_ids, dtype=object
+        ).str.lower()
+
+        tokens = self._search_text.str.split().explode()
+        tokens = tokens[tokens.notna() & (tokens != '')]
+        order = np.argsort(tokens.to_numpy(dtype=str), kind='stable')
+        self._tokens = tokens.to_numpy(dtype=str)[order]
+        self._token_rows = tokens.index.to_numpy(dtype=np.int64)[order]
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    def __contains__(self, employee_id):
+        return employee_id in self._row_index
+
+    def label(self, employee_id):
+        """Display string untuk picker, mis. 'Budi Santoso - Data Analyst (EMP001)'"""
+        row = self._row_index.get(employee_id)
+        if row is None:
+            return str(employee_id)
+        return f"{self.names[row]} - {self.positions[row]} ({employee_id})"
+
+    def _prefix_rows(self, term):
+        lo = np.searchsorted(self._tokens, term, side='left')
+        hi = np.searchsorted(self._tokens, term + '\U0010ffff', side='left')
+        return np.unique(self._token_rows[lo:hi])
+
+    def _substring_rows(self, terms):
+        mask = np.ones(len(self), dtype=bool)
+        for term in terms:
+            mask &= self._search_text.str.contains(term, regex=False).to_numpy(dtype=bool)
+        return np.flatnonzero(mask)
+
+    def _by_name(self, rows):
+        return rows[np.argsort(self._name_rank[rows], kind='stable')]
+
+    def search(self, query, limit=50):
+        """Employee IDs yang cocok dengan query (semua kata harus match).
+
+        Urutan: exact employee ID, prefix match, lalu substring match; masing-masing
+        alfabetis berdasarkan nama.
+        """
+        terms = str(query or '').lower().split()
+        if not terms or not len(self):
+            return []
+
+        rows = self._prefix_rows(terms[0])
+        for term in terms[1:]:
+            rows = np.intersect1d(rows, self._prefix_rows(term), assume_unique=True)
+        rows = self._by_name(rows)
+
+        if len(rows) < limit:
+            substring = np.setdiff1d(self._substring_rows(terms), rows, assume_unique=True)
+            rows = np.concatenate([rows, self._by_name(substring)])
+
+        exact = self._row_index.get(str(query).strip())
+        if exact is not None:
+            rows = np.concatenate([[exact], rows[rows != exact]])
+
+        return self.employee_ids[rows[:limit]].tolist()
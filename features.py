@@ -0,0 +1,371 @@
+import hashlib
+
+import pandas as pd
+
+PAPI_COLUMNS = [
+    'papi_t', 'papi_e', 'papi_i', 'papi_c', 'papi_d',
+    'papi_z', 'papi_l', 'papi_p', 'papi_a', 'papi_s'
+]
+
+STRENGTH_COLUMNS = [
+    'strength_adaptability', 'strength_connectedness', 'strength_analytical',
+    'strength_strategic', 'strength_deliberative', 'strength_discipline',
+    'strength_futuristic', 'strength_ideation', 'strength_belief',
+    'strength_arranger', 'strength_command', 'strength_self_assurance',
+    'strength_developer', 'strength_achiever', 'strength_communication',
+    'strength_woo', 'strength_relator'
+]
+
+# Semua kolom TV mentah yang disimpan di feature store (urutan = urutan output)
+TV_FEATURE_COLUMNS = (
+    ['disc', 'mbti', 'gtq', 'tiki', 'iq', 'pauli']
+    + PAPI_COLUMNS + STRENGTH_COLUMNS + ['top_strengths']
+)
+
+# PAPI dan strengths di-pivot masing-masing per employee sebelum di-join,
+# sehingga setiap join 1:1 dan tidak ada fan-out papi x strengths.
+# {where} dipakai untuk membatasi pivot ke employee tertentu (incremental refresh).
+PAPI_PIVOT_QUERY = """
+    SELECT
+        employee_id,
+        MAX(CASE WHEN scale_code = 'Papi_T' THEN score::numeric END) as papi_t,
+        MAX(CASE WHEN scale_code = 'Papi_E' THEN score::numeric END) as papi_e,
+        MAX(CASE WHEN scale_code = 'Papi_I' THEN score::numeric END) as papi_i,
+        MAX(CASE WHEN scale_code = 'Papi_C' THEN score::numeric END) as papi_c,
+        MAX(CASE WHEN scale_code = 'Papi_D' THEN score::numeric END) as papi_d,
+        MAX(CASE WHEN scale_code = 'Papi_Z' THEN score::numeric END) as papi_z,
+        MAX(CASE WHEN scale_code = 'Papi_L' THEN score::numeric END) as papi_l,
+        MAX(CASE WHEN scale_code = 'Papi_P' THEN score::numeric END) as papi_p,
+        MAX(CASE WHEN scale_code = 'Papi_A' THEN score::numeric END) as papi_a,
+        MAX(CASE WHEN scale_code = 'Papi_S' THEN score::numeric END) as papi_s
+    FROM papi_scores
+    {where}
+    GROUP BY employee_id
+"""
+
+STRENGTHS_PIVOT_QUERY = """
+    SELECT
+        employee_id,
+        MAX(CASE WHEN theme = 'Adaptability' THEN 1 ELSE 0 END) as strength_adaptability,
+        MAX(CASE WHEN theme = 'Connectedness' THEN 1 ELSE 0 END) as strength_connectedness,
+        MAX(CASE WHEN theme = 'Analytical' THEN 1 ELSE 0 END) as strength_analytical,
+        MAX(CASE WHEN theme = 'Strategic' THEN 1 ELSE 0 END) as strength_strategic,
+        MAX(CASE WHEN theme = 'Deliberative' THEN 1 ELSE 0 END) as strength_deliberative,
+        MAX(CASE WHEN theme = 'Discipline' THEN 1 ELSE 0 END) as strength_discipline,
+        MAX(CASE WHEN theme = 'Futuristic' THEN 1 ELSE 0 END) as strength_futuristic,
+        MAX(CASE WHEN theme = 'Ideation' THEN 1 ELSE 0 END) as strength_ideation,
+        MAX(CASE WHEN theme = 'Belief' THEN 1 ELSE 0 END) as strength_belief,
+        MAX(CASE WHEN theme = 'Arranger' THEN 1 ELSE 0 END) as strength_arranger,
+        MAX(CASE WHEN theme = 'Command' THEN 1 ELSE 0 END) as strength_command,
+        MAX(CASE WHEN theme = 'Self-Assurance' THEN 1 ELSE 0 END) as strength_self_assurance,
+        MAX(CASE WHEN theme = 'Developer' THEN 1 ELSE 0 END) as strength_developer,
+        MAX(CASE WHEN theme = 'Achiever' THEN 1 ELSE 0 END) as strength_achiever,
+        MAX(CASE WHEN theme = 'Communication' THEN 1 ELSE 0 END) as strength_communication,
+        MAX(CASE WHEN theme = 'Woo' THEN 1 ELSE 0 END) as strength_woo,
+        MAX(CASE WHEN theme = 'Relator' THEN 1 ELSE 0 END) as strength_relator,
+        -- Strengths (Top 3), dihitung dalam aggregate yang sama
+        STRING_AGG(theme, ', ' ORDER BY rank) FILTER (WHERE rank <= 3) as top_strengths
+    FROM strengths
+    {where}
+    GROUP BY employee_id
+"""
+
+# TV features mentah, satu baris per employee
+TV_FEATURES_QUERY = """
+SELECT
+    e.employee_id,
+    pp.disc,
+    pp.mbti,
+    pp.gtq,
+    pp.tiki,
+    pp.iq,
+    pp.pauli,
+    -- PAPI scores (pre-aggregated, 1 row per employee)
+    papi.papi_t,
+    papi.papi_e,
+    papi.papi_i,
+    papi.papi_c,
+    papi.papi_d,
+    papi.papi_z,
+    papi.papi_l,
+    papi.papi_p,
+    papi.papi_a,
+    papi.papi_s,
+    -- Strengths flags (pre-aggregated, 1 row per employee)
+    COALESCE(st.strength_adaptability, 0) as strength_adaptability,
+    COALESCE(st.strength_connectedness, 0) as strength_connectedness,
+    COALESCE(st.strength_analytical, 0) as strength_analytical,
+    COALESCE(st.strength_strategic, 0) as strength_strategic,
+    COALESCE(st.strength_deliberative, 0) as strength_deliberative,
+    COALESCE(st.strength_discipline, 0) as strength_discipline,
+    COALESCE(st.strength_futuristic, 0) as strength_futuristic,
+    COALESCE(st.strength_ideation, 0) as strength_ideation,
+    COALESCE(st.strength_belief, 0) as strength_belief,
+    COALESCE(st.strength_arranger, 0) as strength_arranger,
+    COALESCE(st.strength_command, 0) as strength_command,
+    COALESCE(st.strength_self_assurance, 0) as strength_self_assurance,
+    COALESCE(st.strength_developer, 0) as strength_developer,
+    COALESCE(st.strength_achiever, 0) as strength_achiever,
+    COALESCE(st.strength_communication, 0) as strength_communication,
+    COALESCE(st.strength_woo, 0) as strength_woo,
+    COALESCE(st.strength_relator, 0) as strength_relator,
+    st.top_strengths
+FROM employees e
+LEFT JOIN profiles_psych pp ON e.employee_id = pp.employee_id
+LEFT JOIN ({papi}) papi ON e.employee_id = papi.employee_id
+LEFT JOIN ({strengths}) st ON e.employee_id = st.employee_id
+{where}
+"""
+
+# Performance Rating terbaru per employee (set-based, satu pass atas performance_yearly)
+LATEST_PERFORMANCE_QUERY = """
+    SELECT DISTINCT ON (employee_id) employee_id, rating
+    FROM performance_yearly
+    ORDER BY employee_id, year DESC
+"""
+
+# Employee + dimensi organisasi + TV features dari {tv_source} (live query atau store)
+EMPLOYEE_FEATURES_TEMPLATE = """
+SELECT
+    e.employee_id,
+    e.fullname,
+    p.name as position,
+    d.name as department,
+    div.name as division,
+    dir.name as directorate,
+    g.name as grade,
+    {tv_columns},
+    perf.rating as latest_performance
+FROM employees e
+LEFT JOIN {tv_source} tv ON e.employee_id = tv.employee_id
+LEFT JOIN ({latest_performance}) perf ON e.employee_id = perf.employee_id
+LEFT JOIN dim_positions p ON e.position_id = p.position_id
+LEFT JOIN dim_departments d ON e.department_id = d.department_id
+LEFT JOIN dim_divisions div ON e.division_id = div.division_id
+LEFT JOIN dim_directorates dir ON e.directorate_id = dir.directorate_id
+LEFT JOIN dim_grades g ON e.grade_id = g.grade_id
+"""
+
+
+def tv_features_query(filtered=False):
+    """TV features query; filtered=True membatasi ke %(employee_ids)s"""
+    if not filtered:
+        return TV_FEATURES_QUERY.format(
+            papi=PAPI_PIVOT_QUERY.format(where=""),
+            strengths=STRENGTHS_PIVOT_QUERY.format(where=""),
+            where=""
+        )
+    return TV_FEATURES_QUERY.format(
+        papi=PAPI_PIVOT_QUERY.format(where="WHERE employee_id = ANY(%(employee_ids)s)"),
+        strengths=STRENGTHS_PIVOT_QUERY.format(where="WHERE employee_id = ANY(%(employee_ids)s)"),
+        where="WHERE e.employee_id = ANY(%(employee_ids)s)"
+    )
+
+
+def _employee_features_query(tv_source):
+    return EMPLOYEE_FEATURES_TEMPLATE.format(
+        tv_columns=",\n    ".join(f"tv.{column}" for column in TV_FEATURE_COLUMNS),
+        tv_source=tv_source,
+        latest_performance=LATEST_PERFORMANCE_QUERY
+    )
+
+
+EMPLOYEE_FEATURES_QUERY = _employee_features_query(f"({tv_features_query()})")
+
+STORED_EMPLOYEE_FEATURES_QUERY = _employee_features_query("employee_tv_features")
+
+
+def employee_features_query(stored=False, filtered=False, ordered=False):
+    """Employee features query; filtered=True membatasi ke %(employee_ids)s,
+    ordered=True mengurutkan per employee_id (urutan stabil untuk streaming)"""
+    tv_source = "employee_tv_features" if stored else f"({tv_features_query(filtered=filtered)})"
+    query = _employee_features_query(tv_source)
+    if filtered:
+        query += "WHERE e.employee_id = ANY(%(employee_ids)s)\n"
+    if ordered:
+        query += "ORDER BY e.employee_id\n"
+    return query
+
+# =============================================================================
+# MATERIALIZED FEATURE STORE: employee_tv_features
+# =============================================================================
+
+# Trigger pada tabel sumber menandai employee_id yang berubah sebagai "dirty";
+# refresh hanya menghitung ulang employee yang dirty atau belum ada di store.
+FEATURE_STORE_DDL = """
+CREATE TABLE IF NOT EXISTS employee_tv_features (
+    employee_id TEXT PRIMARY KEY,
+    disc TEXT,
+    mbti TEXT,
+    gtq REAL,
+    tiki REAL,
+    iq REAL,
+    pauli REAL,
+    papi_t REAL,
+    papi_e REAL,
+    papi_i REAL,
+    papi_c REAL,
+    papi_d REAL,
+    papi_z REAL,
+    papi_l REAL,
+    papi_p REAL,
+    papi_a REAL,
+    papi_s REAL,
+    strength_adaptability SMALLINT,
+    strength_connectedness SMALLINT,
+    strength_analytical SMALLINT,
+    strength_strategic SMALLINT,
+    strength_deliberative SMALLINT,
+    strength_discipline SMALLINT,
+    strength_futuristic SMALLINT,
+    strength_ideation SMALLINT,
+    strength_belief SMALLINT,
+    strength_arranger SMALLINT,
+    strength_command SMALLINT,
+    strength_self_assurance SMALLINT,
+    strength_developer SMALLINT,
+    strength_achiever SMALLINT,
+    strength_communication SMALLINT,
+    strength_woo SMALLINT,
+    strength_relator SMALLINT,
+    top_strengths TEXT,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS employee_tv_features_dirty (
+    employee_id TEXT PRIMARY KEY,
+    marked_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION mark_employee_tv_features_dirty() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO employee_tv_features_dirty (employee_id)
+        VALUES (OLD.employee_id) ON CONFLICT DO NOTHING;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO employee_tv_features_dirty (employee_id)
+        VALUES (NEW.employee_id) ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS profiles_psych_tv_features_dirty ON profiles_psych;
+CREATE TRIGGER profiles_psych_tv_features_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON profiles_psych
+    FOR EACH ROW EXECUTE FUNCTION mark_employee_tv_features_dirty();
+
+DROP TRIGGER IF EXISTS papi_scores_tv_features_dirty ON papi_scores;
+CREATE TRIGGER papi_scores_tv_features_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON papi_scores
+    FOR EACH ROW EXECUTE FUNCTION mark_employee_tv_features_dirty();
+
+DROP TRIGGER IF EXISTS strengths_tv_features_dirty ON strengths;
+CREATE TRIGGER strengths_tv_features_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON strengths
+    FOR EACH ROW EXECUTE FUNCTION mark_employee_tv_features_dirty();
+"""
+
+# Dirty employees + employees baru yang belum pernah di-materialize
+CLAIM_STALE_EMPLOYEES_QUERY = """
+WITH dirty AS (
+    DELETE FROM employee_tv_features_dirty RETURNING employee_id
+)
+SELECT employee_id FROM dirty
+UNION
+SELECT e.employee_id
+FROM employees e
+LEFT JOIN employee_tv_features f ON e.employee_id = f.employee_id
+WHERE f.employee_id IS NULL
+"""
+
+DELETE_ORPHAN_FEATURES_QUERY = """
+DELETE FROM employee_tv_features f
+WHERE NOT EXISTS (SELECT 1 FROM employees e WHERE e.employee_id = f.employee_id)
+"""
+
+
+def _upsert_features_query():
+    columns = ", ".join(TV_FEATURE_COLUMNS)
+    updates = ",\n    ".join(f"{column} = EXCLUDED.{column}" for column in TV_FEATURE_COLUMNS)
+    return f"""
+INSERT INTO employee_tv_features (employee_id, {columns})
+SELECT employee_id, {columns} FROM ({tv_features_query(filtered=True)}) src
+ON CONFLICT (employee_id) DO UPDATE SET
+    {updates},
+    refreshed_at = now()
+"""
+
+
+UPSERT_FEATURES_QUERY = _upsert_features_query()
+
+
+# Semua tabel yang dibaca employee_features_query (termasuk feature store jika ada)
+SOURCE_TABLES = [
+    'employees', 'profiles_psych', 'papi_scores', 'strengths', 'performance_yearly',
+    'dim_positions', 'dim_departments', 'dim_divisions', 'dim_directorates', 'dim_grades',
+    'employee_tv_features'
+]
+
+# Write counters per tabel dari pg_stat_user_tables: naik setiap insert / update / delete
+# yang di-commit, tanpa scan tabel. Tabel yang belum ada menghasilkan counter 0.
+SOURCE_DATA_VERSION_QUERY = """
+SELECT t.name, COALESCE(s.n_tup_ins, 0), COALESCE(s.n_tup_upd, 0), COALESCE(s.n_tup_del, 0)
+FROM unnest(%(tables)s::text[]) AS t(name)
+LEFT JOIN pg_stat_user_tables s ON s.relid = to_regclass(t.name)
+ORDER BY t.name
+"""
+
+
+def source_data_version(conn):
+    """Data-version stamp untuk source tables tanpa me-load data (dipakai streaming mode).
+
+    Berubah setelah ada write yang di-commit ke salah satu ``SOURCE_TABLES``;
+    statistics collector bisa tertinggal beberapa detik di belakang commit.
+    """
+    with conn.cursor() as cur:
+        cur.execute(SOURCE_DATA_VERSION_QUERY, {'tables': SOURCE_TABLES})
+        rows = cur.fetchall()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(rows).encode())
+    return digest.hexdigest()
+
+
+def feature_store_exists(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('employee_tv_features') IS NOT NULL")
+        return cur.fetchone()[0]
+
+
+def create_feature_store(conn):
+    """Buat tabel employee_tv_features, dirty queue, dan trigger pada tabel sumber"""
+    with conn.cursor() as cur:
+        cur.execute(FEATURE_STORE_DDL)
+    conn.commit()
+
+
+def refresh_employee_tv_features(conn):
+    """Incremental refresh: hanya employee yang source rows-nya berubah sejak refresh terakhir.
+
+    Returns jumlah employee yang di-materialize ulang.
+    """
+    with conn.cursor() as cur:
+        cur.execute(CLAIM_STALE_EMPLOYEES_QUERY)
+        employee_ids = [row[0] for row in cur.fetchall()]
+        if employee_ids:
+            cur.execute(UPSERT_FEATURES_QUERY, {'employee_ids': employee_ids})
+        cur.execute(DELETE_ORPHAN_FEATURES_QUERY)
+    conn.commit()
+    return len(employee_ids)
+
+
+def load_employee_features(conn):
+    """Load satu baris fitur mentah per employee (DISC, MBTI, kognitif, PAPI, strengths)
+
+    Membaca dari employee_tv_features jika store sudah dibuat, selain itu
+    menghitung langsung dari tabel sumber.
+    """
+    if feature_store_exists(conn):
+        return pd.read_sql(STORED_EMPLOYEE_FEATURES_QUERY, conn)
+    return pd.read_sql(EMPLOYEE_FEATURES_QUERY, conn)
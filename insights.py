@@ -0,0 +1,374 @@
+import numpy as np
+import pandas as pd
+
+# Kolom TGV (ranking) -> nama pendek untuk tabel, urutan = urutan tie-break
+TGV_DISPLAY_NAMES = {
+    'tv_cognitive': 'Cognitive',
+    'tv_leadership': 'Leadership',
+    'tv_adaptability': 'Adaptability',
+    'tv_motivation': 'Motivation',
+    'tv_creativity': 'Creativity',
+    'tv_conscientiousness': 'Conscientiousness',
+    'tv_social': 'Social',
+    'tv_cultural_values': 'Cultural'
+}
+
+# (label, kolom numerik, divisor) — score = value / divisor jika value > 0
+COGNITIVE_TVS = [('GTQ', 'gtq', 100), ('TIKI', 'tiki', 100), ('IQ', 'iq', 100), ('Pauli', 'pauli', 100)]
+
+# (label, kolom teks, huruf, score) — score diberikan jika huruf ada di kolom
+TYPE_TVS = [
+    ('DISC-D', 'disc', 'D', 1.0), ('DISC-I', 'disc', 'I', 1.0),
+    ('DISC-S', 'disc', 'S', 1.0), ('DISC-C', 'disc', 'C', 1.0),
+    ('MBTI-E', 'mbti', 'E', 1.0), ('MBTI-I', 'mbti', 'I', 0.8),
+    ('MBTI-S', 'mbti', 'S', 1.0), ('MBTI-N', 'mbti', 'N', 1.0),
+    ('MBTI-T', 'mbti', 'T', 1.0), ('MBTI-F', 'mbti', 'F', 1.0),
+    ('MBTI-J', 'mbti', 'J', 1.0), ('MBTI-P', 'mbti', 'P', 1.0)
+]
+
+PAPI_TVS = [
+    ('PAPI-T', 'papi_t', 10), ('PAPI-E', 'papi_e', 10), ('PAPI-I', 'papi_i', 10),
+    ('PAPI-C', 'papi_c', 10), ('PAPI-D', 'papi_d', 10), ('PAPI-Z', 'papi_z', 10),
+    ('PAPI-L', 'papi_l', 10), ('PAPI-P', 'papi_p', 10), ('PAPI-A', 'papi_a', 10),
+    ('PAPI-S', 'papi_s', 10)
+]
+
+STRENGTH_TVS = [
+    ('Str-Adaptability', 'strength_adaptability'),
+    ('Str-Connectedness', 'strength_connectedness'),
+    ('Str-Analytical', 'strength_analytical'),
+    ('Str-Strategic', 'strength_strategic'),
+    ('Str-Deliberative', 'strength_deliberative'),
+    ('Str-Discipline', 'strength_discipline'),
+    ('Str-Futuristic', 'strength_futuristic'),
+    ('Str-Ideation', 'strength_ideation'),
+    ('Str-Belief', 'strength_belief'),
+    ('Str-Arranger', 'strength_arranger'),
+    ('Str-Command', 'strength_command'),
+    ('Str-SelfAssurance', 'strength_self_assurance'),
+    ('Str-Developer', 'strength_developer'),
+    ('Str-Achiever', 'strength_achiever'),
+    ('Str-Communication', 'strength_communication'),
+    ('Str-Woo', 'strength_woo'),
+    ('Str-Relator', 'strength_relator')
+]
+
+
+def _numeric(rankings, column):
+    if column not in rankings:
+        return np.full(len(rankings), np.nan)
+    return pd.to_numeric(rankings[column], errors='coerce').to_numpy(dtype=float)
+
+
+def _contains(rankings, column, letter):
+    if column not in rankings:
+        return np.zeros(len(rankings), dtype=bool)
+    text = rankings[column].astype('string')
+    return text.str.contains(letter, regex=False).fillna(False).to_numpy(dtype=bool)
+
+
+def _format_parts(labels, values, template):
+    """Array label + score terformat per elemen, mis. 'Cognitive(0.53)'"""
+    scores = np.char.mod(template, values)
+    return np.char.add(np.char.add(np.char.add(labels, '('), scores), ')')
+
+
+def _join_valid(parts, valid, empty_label):
+    """Gabungkan kolom parts yang valid (kiri ke kanan) dengan ', '"""
+    joined = np.full(parts.shape[0], '', dtype=object)
+    for j in range(parts.shape[1]):
+        column = parts[:, j].astype(object)
+        joined = np.where(valid[:, j], np.where(joined == '', column, joined + ', ' + column), joined)
+    return np.where(joined == '', empty_label, joined).astype(object)
+
+
+def _top3_strings(scores, labels, empty_label):
+    """Top 3 score per baris (NaN = tidak ada) sebagai 'Label(0.00), ...'.
+
+    Sort stabil per baris, sehingga tie mengikuti urutan kolom seperti
+    list.sort pada versi per-candidate.
+    """
+    if scores.shape[0] == 0:
+        return np.empty(0, dtype=object)
+
+    masked = np.where(np.isnan(scores), -np.inf, scores)
+    order = np.argsort(-masked, axis=1, kind='stable')[:, :3]
+    top_scores = np.take_along_axis(masked, order, axis=1)
+    valid = np.isfinite(top_scores)
+    parts = _format_parts(np.asarray(labels)[order], np.where(valid, top_scores, 0.0), '%.2f')
+    return _join_valid(parts, valid, empty_label)
+
+
+# Versi per kandidat (satu row / dict); builder tabel memakai versi vectorized di bawah
+def get_top_tvs(candidate):
+    """Get top 3 Talent Variables (specific assessments) for a candidate"""
+    tv_scores = []
+    
+    # Cognitive assessments
+    if pd.notna(candidate.get('gtq')) and candidate['gtq'] > 0:
+        tv_scores.append(('GTQ', candidate['gtq']/100))
+    if pd.notna(candidate.get('tiki')) and candidate['tiki'] > 0:
+        tv_scores.append(('TIKI', candidate['tiki']/100))
+    if pd.notna(candidate.get('iq')) and candidate['iq'] > 0:
+        tv_scores.append(('IQ', candidate['iq']/100))
+    if pd.notna(candidate.get('pauli')) and candidate['pauli'] > 0:
+        tv_scores.append(('Pauli', candidate['pauli']/100))
+    
+    # DISC profile scores
+    if pd.notna(candidate.get('disc')):
+        disc = candidate['disc']
+        if 'D' in disc:
+            tv_scores.append(('DISC-D', 1.0))
+        if 'I' in disc:
+            tv_scores.append(('DISC-I', 1.0))
+        if 'S' in disc:
+            tv_scores.append(('DISC-S', 1.0))
+        if 'C' in disc:
+            tv_scores.append(('DISC-C', 1.0))
+    
+    # MBTI dimensions
+    if pd.notna(candidate.get('mbti')):
+        mbti = str(candidate['mbti'])
+        if 'E' in mbti:
+            tv_scores.append(('MBTI-E', 1.0))
+        if 'I' in mbti:
+            tv_scores.append(('MBTI-I', 0.8))
+        if 'S' in mbti:
+            tv_scores.append(('MBTI-S', 1.0))
+        if 'N' in mbti:
+            tv_scores.append(('MBTI-N', 1.0))
+        if 'T' in mbti:
+            tv_scores.append(('MBTI-T', 1.0))
+        if 'F' in mbti:
+            tv_scores.append(('MBTI-F', 1.0))
+        if 'J' in mbti:
+            tv_scores.append(('MBTI-J', 1.0))
+        if 'P' in mbti:
+            tv_scores.append(('MBTI-P', 1.0))
+    
+    # PAPI scores
+    papi_mapping = {
+        'papi_t': 'PAPI-T', 'papi_e': 'PAPI-E', 'papi_i': 'PAPI-I',
+        'papi_c': 'PAPI-C', 'papi_d': 'PAPI-D', 'papi_z': 'PAPI-Z',
+        'papi_l': 'PAPI-L', 'papi_p': 'PAPI-P', 'papi_a': 'PAPI-A',
+        'papi_s': 'PAPI-S'
+    }
+    
+    for papi_key, papi_name in papi_mapping.items():
+        if pd.notna(candidate.get(papi_key)) and candidate[papi_key] > 0:
+            tv_scores.append((papi_name, candidate[papi_key]/10))
+    
+    # Strengths
+    strength_mapping = {
+        'strength_adaptability': 'Str-Adaptability',
+        'strength_connectedness': 'Str-Connectedness',
+        'strength_analytical': 'Str-Analytical',
+        'strength_strategic': 'Str-Strategic',
+        'strength_deliberative': 'Str-Deliberative',
+        'strength_discipline': 'Str-Discipline',
+        'strength_futuristic': 'Str-Futuristic',
+        'strength_ideation': 'Str-Ideation',
+        'strength_belief': 'Str-Belief',
+        'strength_arranger': 'Str-Arranger',
+        'strength_command': 'Str-Command',
+        'strength_self_assurance': 'Str-SelfAssurance',
+        'strength_developer': 'Str-Developer',
+        'strength_achiever': 'Str-Achiever',
+        'strength_communication': 'Str-Communication',
+        'strength_woo': 'Str-Woo',
+        'strength_relator': 'Str-Relator'
+    }
+    
+    for strength_key, strength_name in strength_mapping.items():
+        if pd.notna(candidate.get(strength_key)) and candidate[strength_key] > 0:
+            tv_scores.append((strength_name, 1.0))
+    
+    # Sort by score and get top 3
+    tv_scores.sort(key=lambda x: x[1], reverse=True)
+    top_tvs = tv_scores[:3]
+    
+    # Format as string
+    if top_tvs:
+        return ', '.join([f"{name}({score:.2f})" for name, score in top_tvs])
+    else:
+        return "No TV data"
+
+
+def get_top_tgvs(candidate):
+    """Get top 3 Talent Group Variables for a candidate"""
+    tgv_mapping = {
+        'tv_cognitive': 'Cognitive',
+        'tv_leadership': 'Leadership',
+        'tv_adaptability': 'Adaptability',
+        'tv_motivation': 'Motivation',
+        'tv_creativity': 'Creativity',
+        'tv_conscientiousness': 'Conscientiousness',
+        'tv_social': 'Social',
+        'tv_cultural_values': 'Cultural'
+    }
+    
+    tgv_scores = []
+    for tgv_key, tgv_name in tgv_mapping.items():
+        if pd.notna(candidate.get(tgv_key)) and candidate[tgv_key] > 0:
+            tgv_scores.append((tgv_name, candidate[tgv_key]))
+    
+    # Sort by score and get top 3
+    tgv_scores.sort(key=lambda x: x[1], reverse=True)
+    top_tgvs = tgv_scores[:3]
+    
+    # Format as string
+    if top_tgvs:
+        return ', '.join([f"{name}({score:.2f})" for name, score in top_tgvs])
+    else:
+        return "No TGV data"
+
+
+def top_tgv_strings(rankings):
+    """Vectorized get_top_tgvs untuk semua kandidat sekaligus"""
+    labels, columns = [], []
+    for tgv_key, tgv_name in TGV_DISPLAY_NAMES.items():
+        values = _numeric(rankings, tgv_key)
+        columns.append(np.where(values > 0, values, np.nan))
+        labels.append(tgv_name)
+    return _top3_strings(np.column_stack(columns), labels, "No TGV data")
+
+
+def top_tv_strings(rankings):
+    """Vectorized get_top_tvs untuk semua kandidat sekaligus"""
+    labels, columns = [], []
+
+    for label, column, divisor in COGNITIVE_TVS:
+        values = _numeric(rankings, column)
+        columns.append(np.where(values > 0, values / divisor, np.nan))
+        labels.append(label)
+
+    for label, column, letter, score in TYPE_TVS:
+        columns.append(np.where(_contains(rankings, column, letter), score, np.nan))
+        labels.append(label)
+
+    for label, column, divisor in PAPI_TVS:
+        values = _numeric(rankings, column)
+        columns.append(np.where(values > 0, values / divisor, np.nan))
+        labels.append(label)
+
+    for label, column in STRENGTH_TVS:
+        values = _numeric(rankings, column)
+        columns.append(np.where(values > 0, 1.0, np.nan))
+        labels.append(label)
+
+    return _top3_strings(np.column_stack(columns), labels, "No TV data")
+
+
+def benchmark_gap_strings(rankings, baseline_dict, threshold=0.1):
+    """Strengths dan gaps per kandidat terhadap baseline (|gap| > threshold)"""
+    n = len(rankings)
+    strength_parts, gap_parts, strength_valid, gap_valid = [], [], [], []
+
+    for tv_key, tgv_name in TGV_DISPLAY_NAMES.items():
+        baseline_key = tv_key.replace('tv_', '')
+        if tv_key not in rankings or baseline_key not in baseline_dict:
+            continue
+        gap = _numeric(rankings, tv_key) - float(baseline_dict[baseline_key])
+        labels = np.full(n, tgv_name)
+        strength_parts.append(_format_parts(labels, gap, '+%.2f'))
+        gap_parts.append(_format_parts(labels, gap, '%.2f'))
+        strength_valid.append(gap > threshold)
+        gap_valid.append(gap < -threshold)
+
+    if not strength_parts:
+        none = np.full(n, 'None', dtype=object)
+        return none, none.copy()
+
+    strengths = _join_valid(np.column_stack(strength_parts), np.column_stack(strength_valid), 'None')
+    gaps = _join_valid(np.column_stack(gap_parts), np.column_stack(gap_valid), 'None')
+    return strengths, gaps
+
+
+def build_ranked_talent_table(rankings, baseline_dict):
+    """Columnar builder tabel Tab 1: top TGVs, top TVs, strengths dan gaps vs benchmark"""
+    strengths, gaps = benchmark_gap_strings(rankings, baseline_dict)
+    return pd.DataFrame({
+        'employee_id': rankings['employee_id'].to_numpy(),
+        'name': rankings['fullname'].to_numpy(),
+        'final_match_rate': rankings['final_match_rate'].to_numpy(),
+        'top_tgvs': top_tgv_strings(rankings),
+        'top_tvs': top_tv_strings(rankings),
+        'strengths': strengths,
+        'gaps': gaps,
+        'position': rankings['position'].to_numpy() if 'position' in rankings else 'N/A',
+        'department': rankings['department'].to_numpy() if 'department' in rankings else 'N/A'
+    })
+
+
+def generate_detailed_insights(rankings, baseline_dict):
+    """Generate Detailed Insights dengan Top Strengths & Gaps"""
+    if len(rankings) == 0:
+        return "No data available for insights."
+
+    top_candidate = rankings.iloc[0]
+
+    insights = []
+    insights.append(f"## Detailed Analysis: {top_candidate['fullname']}")
+    insights.append(f"**Overall Match Rate:** {top_candidate['final_match_rate']:.1f}%")
+    insights.append(f"**Position:** {top_candidate.get('position', 'N/A')}")
+    insights.append(f"**Department:** {top_candidate.get('department', 'N/A')}")
+    insights.append("")
+
+    # Top Strengths Analysis
+    strengths = []
+    gaps = []
+
+    tgv_analysis = {
+        'tv_cognitive': 'Cognitive Complexity',
+        'tv_leadership': 'Leadership & Influence',
+        'tv_adaptability': 'Adaptability & Stress Tolerance',
+        'tv_motivation': 'Motivation & Drive',
+        'tv_creativity': 'Creativity & Innovation',
+        'tv_conscientiousness': 'Conscientiousness & Reliability'
+    }
+
+    for tv_key, tgv_name in tgv_analysis.items():
+        if tv_key in top_candidate:
+            baseline_key = tv_key.replace('tv_', '')
+            if baseline_key in baseline_dict:
+                gap = top_candidate[tv_key] - baseline_dict[baseline_key]
+                if gap > 0.15:
+                    strengths.append(f"**{tgv_name}**: +{gap:.3f} above benchmark")
+                elif gap < -0.15:
+                    gaps.append(f"**{tgv_name}**: {gap:.3f} below benchmark")
+
+    if strengths:
+        insights.append("### Top Strengths vs Benchmark:")
+        insights.extend([f"• {strength}" for strength in strengths])
+        insights.append("")
+
+    if gaps:
+        insights.append("### Development Areas:")
+        insights.extend([f"• {gap}" for gap in gaps])
+        insights.append("")
+
+    # Behavioral Insights
+    if 'top_strengths' in top_candidate and pd.notna(top_candidate['top_strengths']):
+        insights.append("### Behavioral Strengths Profile:")
+        insights.append(f"**Top CliftonStrengths:** {top_candidate['top_strengths']}")
+        insights.append("")
+
+    # Performance Context
+    if 'latest_performance' in top_candidate and pd.notna(top_candidate['latest_performance']):
+        insights.append("### Performance Context:")
+        insights.append(f"**Latest Performance Rating:** {top_candidate['latest_performance']}")
+        insights.append("")
+
+    # Recommendation
+    match_rate = top_candidate['final_match_rate']
+    if match_rate >= 85:
+        insights.append("### Recommendation: STRONG MATCH")
+        insights.append("Excellent alignment with benchmark profiles across multiple TGVs.")
+    elif match_rate >= 70:
+        insights.append("### Recommendation: GOOD MATCH")
+        insights.append("Solid alignment with key competencies, some development areas identified.")
+    else:
+        insights.append("### Recommendation: MODERATE MATCH")
+        insights.append("Some alignment present but significant gaps require development.")
+
+    return "\n".join(insights)
@@ -0,0 +1,167 @@
+"""Headless talent matching pipeline: baseline -> ranking -> insights.
+
+Bisa di-import sebagai library atau dijalankan sebagai CLI tanpa Streamlit::
+
+    python pipeline.py --benchmarks EMP001 EMP002 --top-k 100 --output out/ranking.parquet
+    python pipeline.py --vacancy VAC001 VAC002 --output out/vacancies.csv --write-db
+    python pipeline.py --all-vacancies --output out/all.json
+
+Import modul ini tidak membuka koneksi database dan tidak memuat Streamlit,
+Plotly atau psycopg2; driver database baru di-load saat ``connect`` dipanggil.
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from batch import export_match_results, load_vacancy_benchmarks, match_vacancies, write_match_results
+from features import feature_store_exists, load_employee_features, refresh_employee_tv_features
+from insights import build_ranked_talent_table, generate_detailed_insights
+from scoring import TGV_COLUMNS, TGVScoringEngine, compile_weights
+from sharding import ShardedScorer
+
+DEFAULT_SECRETS_PATH = os.path.join(".streamlit", "secrets.toml")
+
+# Kolom identitas yang ikut di output ranking (selain TGV dan final_match_rate)
+RANKING_ID_COLUMNS = ['employee_id', 'fullname', 'position', 'department', 'directorate', 'grade']
+
+
+def load_postgres_config(path=DEFAULT_SECRETS_PATH):
+    """Section [postgres] dari secrets.toml yang sama dengan yang dipakai app"""
+    import tomllib
+
+    with open(path, 'rb') as f:
+        return tomllib.load(f)["postgres"]
+
+
+def connect(config, maxconn=2):
+    """ConnectionPool ke database (psycopg2 baru di-import di sini)"""
+    from db import ConnectionPool
+
+    return ConnectionPool(config, minconn=1, maxconn=maxconn)
+
+
+def load_scoring_engine(pool, population_stats=None):
+    """Refresh feature store (jika ada) lalu bangun TGVScoringEngine dari employee features.
+
+    ``population_stats`` (PopulationStats yang bertahan lintas reload) di-sync
+    incremental ke populasi baru dan dipasang di engine.
+    """
+    with pool.connection() as conn:
+        # Incremental refresh: hanya employee yang source rows-nya berubah
+        if feature_store_exists(conn):
+            refresh_employee_tv_features(conn)
+        engine = TGVScoringEngine(load_employee_features(conn))
+    if population_stats is not None:
+        population_stats.sync(engine)
+        engine.population_stats = population_stats
+    return engine
+
+
+def match_benchmarks(engine, benchmark_ids, top_k=100, workers=1, shard_by=None, weights=None):
+    """Baseline, top-K ranking dan insights markdown untuk satu benchmark set.
+
+    Return ``(baseline_dict, rankings, insights)``; rankings kosong jika tidak
+    ada benchmark dengan data psikometrik. ``workers`` > 1 memakai sharded
+    scoring di process pool (hasil identik dengan single process);
+    ``weights`` (MatchWeights) mengaktifkan weighted matching di kedua mode.
+    """
+    baseline_dict = engine.compute_baseline(benchmark_ids, weights)
+    if not baseline_dict:
+        return {}, pd.DataFrame(), "No data available for insights."
+
+    if workers > 1:
+        with ShardedScorer(engine, workers=workers, shard_by=shard_by, weights=weights) as scorer:
+            rankings = scorer.top(baseline_dict, top_k)
+    else:
+        rankings = engine.ranking(baseline_dict, weights).top(top_k)
+    return baseline_dict, rankings, generate_detailed_insights(rankings, baseline_dict)
+
+
+def ranking_summary(rankings, baseline_dict):
+    """Tabel output: rank, identitas, TGV scores, match rate + top TGV/TV dan strengths/gaps"""
+    table = build_ranked_talent_table(rankings, baseline_dict)
+    columns = [column for column in RANKING_ID_COLUMNS if column in rankings]
+    summary = rankings[columns + TGV_COLUMNS + ['final_match_rate']].copy()
+    summary.insert(0, 'rank', range(1, len(summary) + 1))
+    for column in ['top_tgvs', 'top_tvs', 'strengths', 'gaps']:
+        summary[column] = table[column].to_numpy()
+    return summary
+
+
+def write_text(text, path):
+    if path == '-':
+        sys.stdout.write(text + "\n")
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + "\n")
+
+
+def write_results(results, path, fmt=None):
+    """Tulis DataFrame ke file (csv / parquet / json) atau stdout jika path '-'"""
+    if path == '-':
+        if (fmt or 'csv') == 'json':
+            sys.stdout.write(results.to_json(orient='records', indent=2, force_ascii=False) + "\n")
+        else:
+            results.to_csv(sys.stdout, index=False)
+        return
+    export_match_results(results, path, fmt)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Talent matching tanpa web app (baseline -> ranking -> insights)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--benchmarks", nargs="+", metavar="EMPLOYEE_ID", help="Benchmark employee IDs")
+    source.add_argument("--vacancy", nargs="+", metavar="JOB_VACANCY_ID", help="Vacancy IDs dari talent_benchmarks")
+    source.add_argument("--all-vacancies", action="store_true", help="Semua vacancy di talent_benchmarks")
+    parser.add_argument("--top-k", type=int, default=100, help="Jumlah kandidat per benchmark set (default 100)")
+    parser.add_argument("--output", default="-", help="Path output (.csv, .parquet, .json) atau '-' untuk stdout")
+    parser.add_argument("--format", choices=["csv", "parquet", "json"], help="Override format output")
+    parser.add_argument("--insights", metavar="PATH", help="Tulis insights markdown (mode --benchmarks)")
+    parser.add_argument("--write-db", action="store_true", help="Simpan hasil vacancy ke talent_match_results")
+    parser.add_argument("--weights", metavar="JSON", help="weights_config JSON, mis. '{\"TGV\": {\"Leadership & Influence\": 2}}'")
+    parser.add_argument("--workers", type=int, default=1, help="Jumlah process untuk sharded scoring (mode --benchmarks)")
+    parser.add_argument("--shard-by", metavar="COLUMN", help="Shard per nilai kolom (mis. directorate) alih-alih blok employee_id")
+    parser.add_argument("--secrets", default=DEFAULT_SECRETS_PATH, help="Path secrets.toml dengan section [postgres]")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    pool = connect(load_postgres_config(args.secrets))
+    try:
+        engine = load_scoring_engine(pool)
+
+        if args.benchmarks:
+            baseline_dict, rankings, insights = match_benchmarks(
+                engine, args.benchmarks, args.top_k, workers=args.workers, shard_by=args.shard_by,
+                weights=compile_weights(args.weights) if args.weights else None
+            )
+            if rankings.empty:
+                print("No psychometric data found for selected benchmarks", file=sys.stderr)
+                return 1
+            write_results(ranking_summary(rankings, baseline_dict), args.output, args.format)
+            if args.insights:
+                write_text(insights, args.insights)
+            return 0
+
+        with pool.connection() as conn:
+            benchmark_sets, weights = load_vacancy_benchmarks(conn, None if args.all_vacancies else args.vacancy)
+            results = match_vacancies(engine, benchmark_sets, top_k=args.top_k, weights=weights)
+            if results.empty:
+                print("No vacancies with valid benchmark employees found", file=sys.stderr)
+                return 1
+            if args.write_db:
+                write_match_results(conn, results)
+        write_results(results, args.output, args.format)
+        return 0
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
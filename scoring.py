@@ -0,0 +1,1097 @@
+import hashlib
+import heapq
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# TV -> TGV MAPPING (8 TGV, 38 TV)
+# =============================================================================
+
+# Urutan TGV mengikuti key baseline dan kolom ranking
+TGV_KEYS = [
+    'adaptability_stress', 'cognitive_complexity', 'conscientiousness',
+    'creativity_innovation', 'cultural_values', 'leadership_influence',
+    'motivation_drive', 'social_orientation'
+]
+
+TGV_COLUMNS = [
+    'tv_adaptability', 'tv_cognitive', 'tv_conscientiousness',
+    'tv_creativity', 'tv_cultural_values', 'tv_leadership',
+    'tv_motivation', 'tv_social'
+]
+
+# kind: 'equals' (column == arg), 'contains' (arg in column), 'prefix'
+# (column starts with arg) atau 'scale' (numeric column / arg)
+TVSpec = namedtuple('TVSpec', ['key', 'tgv', 'kind', 'column', 'arg', 'value'])
+
+TV_SPECS = [
+    # 1. Adaptability & Stress Tolerance (4 TV)
+    TVSpec('disc_s', 'adaptability_stress', 'equals', 'disc', 'S', 1.0),
+    TVSpec('papi_t', 'adaptability_stress', 'scale', 'papi_t', 10, 1.0),
+    TVSpec('papi_e', 'adaptability_stress', 'scale', 'papi_e', 10, 1.0),
+    TVSpec('strength_adaptability', 'adaptability_stress', 'scale', 'strength_adaptability', 1, 1.0),
+    # 2. Cognitive Complexity & Problem-Solving (7 TV)
+    TVSpec('gtq', 'cognitive_complexity', 'scale', 'gtq', 100, 1.0),
+    TVSpec('tiki', 'cognitive_complexity', 'scale', 'tiki', 100, 1.0),
+    TVSpec('iq', 'cognitive_complexity', 'scale', 'iq', 100, 1.0),
+    TVSpec('papi_i', 'cognitive_complexity', 'scale', 'papi_i', 10, 1.0),
+    TVSpec('strength_connectedness', 'cognitive_complexity', 'scale', 'strength_connectedness', 1, 1.0),
+    TVSpec('strength_analytical', 'cognitive_complexity', 'scale', 'strength_analytical', 1, 1.0),
+    TVSpec('strength_strategic', 'cognitive_complexity', 'scale', 'strength_strategic', 1, 1.0),
+    # 3. Conscientiousness & Reliability (5 TV)
+    TVSpec('disc_c', 'conscientiousness', 'equals', 'disc', 'C', 1.0),
+    TVSpec('papi_c', 'conscientiousness', 'scale', 'papi_c', 10, 1.0),
+    TVSpec('papi_d', 'conscientiousness', 'scale', 'papi_d', 10, 1.0),
+    TVSpec('strength_deliberative', 'conscientiousness', 'scale', 'strength_deliberative', 1, 1.0),
+    TVSpec('strength_discipline', 'conscientiousness', 'scale', 'strength_discipline', 1, 1.0),
+    # 4. Creativity & Innovation Orientation (4 TV)
+    TVSpec('mbti_n', 'creativity_innovation', 'contains', 'mbti', 'N', 1.0),
+    TVSpec('papi_z', 'creativity_innovation', 'scale', 'papi_z', 10, 1.0),
+    TVSpec('strength_futuristic', 'creativity_innovation', 'scale', 'strength_futuristic', 1, 1.0),
+    TVSpec('strength_ideation', 'creativity_innovation', 'scale', 'strength_ideation', 1, 1.0),
+    # 5. Cultural & Values Urgency (1 TV)
+    TVSpec('strength_belief', 'cultural_values', 'scale', 'strength_belief', 1, 1.0),
+    # 6. Leadership & Influence (9 TV)
+    TVSpec('mbti_e', 'leadership_influence', 'prefix', 'mbti', 'E', 1.0),
+    TVSpec('mbti_i', 'leadership_influence', 'prefix', 'mbti', 'I', 0.5),
+    TVSpec('disc_d', 'leadership_influence', 'equals', 'disc', 'D', 1.0),
+    TVSpec('papi_l', 'leadership_influence', 'scale', 'papi_l', 10, 1.0),
+    TVSpec('papi_p', 'leadership_influence', 'scale', 'papi_p', 10, 1.0),
+    TVSpec('strength_arranger', 'leadership_influence', 'scale', 'strength_arranger', 1, 1.0),
+    TVSpec('strength_command', 'leadership_influence', 'scale', 'strength_command', 1, 1.0),
+    TVSpec('strength_self_assurance', 'leadership_influence', 'scale', 'strength_self_assurance', 1, 1.0),
+    TVSpec('strength_developer', 'leadership_influence', 'scale', 'strength_developer', 1, 1.0),
+    # 7. Motivation & Drive (3 TV)
+    TVSpec('pauli', 'motivation_drive', 'scale', 'pauli', 100, 1.0),
+    TVSpec('papi_a', 'motivation_drive', 'scale', 'papi_a', 10, 1.0),
+    TVSpec('strength_achiever', 'motivation_drive', 'scale', 'strength_achiever', 1, 1.0),
+    # 8. Social Orientation & Collaboration (5 TV)
+    TVSpec('disc_i', 'social_orientation', 'equals', 'disc', 'I', 1.0),
+    TVSpec('papi_s', 'social_orientation', 'scale', 'papi_s', 10, 1.0),
+    TVSpec('strength_communication', 'social_orientation', 'scale', 'strength_communication', 1, 1.0),
+    TVSpec('strength_woo', 'social_orientation', 'scale', 'strength_woo', 1, 1.0),
+    TVSpec('strength_relator', 'social_orientation', 'scale', 'strength_relator', 1, 1.0),
+]
+
+TV_KEYS = [spec.key for spec in TV_SPECS]
+
+# Nama TGV / TV seperti di tgv_tv_mapping dan weights_config (Script_StudyCase2.sql)
+TGV_NAMES = {
+    'Adaptability & Stress Tolerance': 'adaptability_stress',
+    'Cognitive Complexity & Problem-Solving': 'cognitive_complexity',
+    'Conscientiousness & Reliability': 'conscientiousness',
+    'Creativity & Innovation Orientation': 'creativity_innovation',
+    'Cultural & Values Urgency': 'cultural_values',
+    'Leadership & Influence': 'leadership_influence',
+    'Motivation & Drive': 'motivation_drive',
+    'Social Orientation & Collaboration': 'social_orientation'
+}
+
+# Urutan sama dengan TV_SPECS
+TV_NAMES = dict(zip([
+    'DISC: Steadiness', 'PAPI Kostick: Papi_T', 'PAPI Kostick: Papi_E', 'CliftonStrengths: Adaptability',
+    'GTQ: Overall GTQ Score', 'TIKI: Overall TIKI Score', 'IQ: Overall IQ Score', 'PAPI Kostick: Papi_I',
+    'CliftonStrengths: Connectedness', 'CliftonStrengths: Analytical', 'CliftonStrengths: Strategic',
+    'DISC: Compliance', 'PAPI Kostick: Papi_C', 'PAPI Kostick: Papi_D', 'CliftonStrengths: Deliberative',
+    'CliftonStrengths: Discipline',
+    'MBTI: Intuition', 'PAPI Kostick: Papi_Z', 'CliftonStrengths: Futuristic', 'CliftonStrengths: Ideation',
+    'CliftonStrengths: Belief',
+    'MBTI: Extraversion', 'MBTI: Introversion', 'DISC: Dominance', 'PAPI Kostick: Papi_L',
+    'PAPI Kostick: Papi_P', 'CliftonStrengths: Arranger', 'CliftonStrengths: Command',
+    'CliftonStrengths: Self-Assurance', 'CliftonStrengths: Developer',
+    'Pauli: Initial Performance', 'PAPI Kostick: Papi_A', 'CliftonStrengths: Achiever',
+    'DISC: Influence', 'PAPI Kostick: Papi_S', 'CliftonStrengths: Communication',
+    'CliftonStrengths: Woo', 'CliftonStrengths: Relator'
+], TV_KEYS))
+
+
+def _build_tv_tgv_matrix(tv_weights=None):
+    """Matrix (38 TV x 8 TGV): setiap TGV adalah rata-rata (berbobot) TV anggotanya"""
+    matrix = np.zeros((len(TV_SPECS), len(TGV_KEYS)), dtype=np.float32)
+    for i, spec in enumerate(TV_SPECS):
+        matrix[i, TGV_KEYS.index(spec.tgv)] = 1.0 if tv_weights is None else tv_weights[i]
+    totals = matrix.sum(axis=0, keepdims=True)
+    # TGV dengan total bobot 0 kembali ke equal weights (sama seperti SQL fallback)
+    if (totals <= 0).any():
+        equal = _build_tv_tgv_matrix()
+        matrix[:, totals[0] <= 0] = equal[:, totals[0] <= 0]
+        totals = matrix.sum(axis=0, keepdims=True)
+    return matrix / totals
+
+
+TV_TGV_MATRIX = _build_tv_tgv_matrix()
+
+# =============================================================================
+# MATCH WEIGHTS (talent_benchmarks.weights_config)
+# =============================================================================
+
+# tv_tgv_matrix: None = TV_TGV_MATRIX; tgv_scale: None = equal TGV weights;
+# fingerprint membedakan konfigurasi untuk cache key
+MatchWeights = namedtuple('MatchWeights', ['tv_tgv_matrix', 'tgv_scale', 'fingerprint'])
+
+
+def _weight_vector(config, names, keys):
+    """Bobot per key dari config (nama SQL atau key internal); default 1.0 seperti COALESCE"""
+    weights = np.ones(len(keys), dtype=np.float64)
+    for name, value in (config or {}).items():
+        key = names.get(name, name)
+        if key in keys and value is not None:
+            weights[keys.index(key)] = max(float(value), 0.0)
+    return weights
+
+
+def compile_weights(weights_config):
+    """weights_config {'TGV': {...}, 'TV': {...}} -> MatchWeights, dikompilasi sekali per vacancy.
+
+    TV weights menjadi weighted average TV di dalam tiap TGV. TGV weights
+    menjadi weighted Euclidean distance, dinormalisasi agar total bobot = 8,
+    sehingga equal weights menghasilkan match rate yang persis sama. Return
+    None jika tidak ada bobot yang mengubah hasil.
+    """
+    if isinstance(weights_config, str):
+        weights_config = json.loads(weights_config)
+    weights_config = weights_config or {}
+
+    tv_weights = _weight_vector(weights_config.get('TV'), TV_NAMES, TV_KEYS)
+    tv_tgv_matrix = None
+    if not np.all(tv_weights == 1.0):
+        tv_tgv_matrix = _build_tv_tgv_matrix(tv_weights)
+
+    tgv_weights = _weight_vector(weights_config.get('TGV'), TGV_NAMES, TGV_KEYS)
+    tgv_scale = None
+    if tgv_weights.sum() > 0 and not np.all(tgv_weights == tgv_weights[0]):
+        tgv_scale = np.sqrt(tgv_weights * len(TGV_KEYS) / tgv_weights.sum()).astype(np.float32)
+
+    if tv_tgv_matrix is None and tgv_scale is None:
+        return None
+
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(tv_weights.tobytes())
+    digest.update(tgv_weights.tobytes())
+    return MatchWeights(tv_tgv_matrix, tgv_scale, digest.hexdigest())
+
+
+def build_tv_matrix(employee_data):
+    """Build dense float32 matrix (employees x 38 TV) dari raw employee features"""
+    tv_matrix = np.zeros((len(employee_data), len(TV_SPECS)), dtype=np.float32)
+
+    for i, spec in enumerate(TV_SPECS):
+        if spec.column not in employee_data:
+            continue
+        column = employee_data[spec.column]
+
+        if spec.kind == 'scale':
+            values = pd.to_numeric(column, errors='coerce').astype(float).fillna(0).to_numpy() / spec.arg
+        else:
+            text = column.astype('string')
+            if spec.kind == 'equals':
+                hits = text.eq(spec.arg).fillna(False)
+            elif spec.kind == 'contains':
+                hits = text.str.contains(spec.arg, regex=False).fillna(False)
+            else:
+                hits = text.str.startswith(spec.arg).fillna(False)
+            values = hits.to_numpy(dtype=bool) * spec.value
+
+        tv_matrix[:, i] = values
+
+    return tv_matrix
+
+
+def tv_to_tgv(tv_matrix, tv_tgv_matrix=TV_TGV_MATRIX, block_rows=8192):
+    """TV matrix -> TGV matrix (rata-rata berbobot TV per TGV).
+
+    Dijumlahkan per kolom dengan urutan tetap (bukan BLAS matmul), sehingga
+    hasil per baris tidak bergantung pada jumlah baris: chunk / stream
+    menghasilkan nilai yang persis sama dengan full matrix.
+    """
+    tv_matrix = np.asarray(tv_matrix, dtype=np.float32)
+    pairs = list(zip(*np.nonzero(tv_tgv_matrix)))
+    tgv_matrix = np.empty((len(tv_matrix), tv_tgv_matrix.shape[1]), dtype=np.float32)
+    for start in range(0, len(tv_matrix), block_rows):
+        # Blok kecil di-transpose agar setiap langkah contiguous dan tetap di cache
+        tv_columns = np.ascontiguousarray(tv_matrix[start:start + block_rows].T)
+        tgv_columns = np.zeros((tv_tgv_matrix.shape[1], tv_columns.shape[1]), dtype=np.float32)
+        for i, j in pairs:
+            tgv_columns[j] += tv_columns[i] * tv_tgv_matrix[i, j]
+        tgv_matrix[start:start + block_rows] = tgv_columns.T
+    return tgv_matrix
+
+
+# =============================================================================
+# COMPACT EMPLOYEE / RESULT FRAME
+# =============================================================================
+
+# Dimensi organisasi dan tipe kepribadian: sedikit nilai unik -> categorical
+CATEGORY_COLUMNS = ['position', 'department', 'division', 'directorate', 'grade', 'disc', 'mbti']
+
+# Flag 0/1 CliftonStrengths -> int8 (NULL dianggap 0, sama seperti build_tv_matrix)
+FLAG_COLUMNS = sorted({spec.column for spec in TV_SPECS if spec.column.startswith('strength_')})
+
+# Rating bulat (1-5, bisa NULL) -> nullable Int8 agar tetap tampil sebagai integer
+INTEGER_COLUMNS = ['latest_performance']
+
+# Kolom teks bebas yang tidak dikonversi
+TEXT_COLUMNS = ['employee_id', 'fullname', 'top_strengths']
+
+
+def compact_frame(df):
+    """Typed, compact copy: float32 untuk numeric (termasuk Decimal dari read_sql),
+    categorical untuk dimensi organisasi, int8 untuk strength flags dan nullable
+    Int8 untuk rating"""
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if column in TEXT_COLUMNS:
+            columns[column] = values
+        elif column in CATEGORY_COLUMNS:
+            columns[column] = values.astype('category')
+        elif column in FLAG_COLUMNS:
+            columns[column] = pd.to_numeric(values, errors='coerce').fillna(0).astype(np.int8)
+        elif column in INTEGER_COLUMNS:
+            numeric = pd.to_numeric(values, errors='coerce')
+            # Rating pecahan (tidak diharapkan) tetap float32 daripada dibulatkan diam-diam
+            integral = numeric.dropna().mod(1).eq(0).all()
+            columns[column] = numeric.astype('Int8' if integral else np.float32)
+        elif values.dtype == object or pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(values):
+            numeric = pd.to_numeric(values, errors='coerce')
+            # Kolom teks yang tidak dikenal dibiarkan apa adanya
+            if numeric.notna().sum() == values.notna().sum():
+                columns[column] = numeric.astype(np.float32)
+            else:
+                columns[column] = values
+        else:
+            columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def baseline_vector(baseline_dict):
+    """Baseline dict -> vector 8 TGV (key yang hilang dianggap 0)"""
+    return np.array(
+        [float(baseline_dict.get(key) or 0) for key in TGV_KEYS],
+        dtype=np.float32
+    )
+
+
+def match_rates(tgv_matrix, baseline, tgv_scale=None):
+    """Final match rate: (1 - ||tgv - baseline||2 / 8) * 100 untuk semua baris sekaligus.
+
+    ``tgv_scale`` (sqrt bobot TGV, lihat ``compile_weights``) membuat distance berbobot.
+    """
+    diff = tgv_matrix - baseline
+    if tgv_scale is not None:
+        diff *= tgv_scale
+    distance = np.sqrt(np.square(diff).sum(axis=1))
+    return (1 - distance / len(TGV_KEYS)) * 100
+
+
+def batch_match_rates(tgv_matrix, baselines, tgv_scales=None):
+    """Match rate matrix (employees x vacancies) terhadap banyak baseline sekaligus"""
+    diff = tgv_matrix[:, None, :] - baselines[None, :, :]
+    if tgv_scales is not None:
+        diff *= tgv_scales[None, :, :]
+    distance = np.sqrt(np.square(diff).sum(axis=2))
+    return (1 - distance / len(TGV_KEYS)) * 100
+
+
+def batch_top_k(tgv_matrix, rows, baselines, k, chunk_bytes=64 * 1024 * 1024, tgv_scales=None):
+    """Top-k (rows, scores) per baseline dalam satu pass atas ``rows``.
+
+    Employees diproses per chunk agar distance tensor (chunk x vacancies x 8)
+    tetap di bawah ``chunk_bytes``. Urutan dan tie-break sama dengan ``Ranking``.
+    """
+    n_baselines = len(baselines)
+    best_rows = [np.empty(0, dtype=np.intp) for _ in range(n_baselines)]
+    best_scores = [np.empty(0, dtype=np.float32) for _ in range(n_baselines)]
+    if k <= 0 or n_baselines == 0:
+        return best_rows, best_scores
+
+    bytes_per_row = max(n_baselines * len(TGV_KEYS) * 4, 1)
+    chunk = max(chunk_bytes // bytes_per_row, k, 1)
+
+    for start in range(0, len(rows), chunk):
+        chunk_rows = rows[start:start + chunk]
+        scores = batch_match_rates(tgv_matrix[chunk_rows], baselines, tgv_scales)
+        if len(chunk_rows) > k:
+            kth = -np.partition(-scores, k - 1, axis=0)[k - 1]
+        else:
+            kth = scores.min(axis=0)
+
+        for j in range(n_baselines):
+            # Semua kandidat >= nilai ke-k agar tie-break tetap row terkecil dulu
+            candidates = np.flatnonzero(scores[:, j] >= kth[j])
+            merged_rows = np.concatenate([best_rows[j], chunk_rows[candidates]])
+            merged_scores = np.concatenate([best_scores[j], scores[candidates, j]])
+            order = np.lexsort((merged_rows, -merged_scores))[:k]
+            best_rows[j], best_scores[j] = merged_rows[order], merged_scores[order]
+
+    return best_rows, best_scores
+
+
+# =============================================================================
+# SUMMARY STATISTICS: histogram + covariance yang bisa di-merge antar chunk / shard
+# =============================================================================
+
+class ScoreHistogram:
+    """Histogram match rate dengan bin tetap selebar ``width`` (di-anchor di 0).
+
+    Counts bisa di-update per chunk dan di-merge antar shard tanpa menyimpan
+    scores; ``distribution`` menggabungkannya menjadi paling banyak ``bins``
+    bin sama lebar yang edges-nya jatuh di batas bin ``width``.
+    """
+
+    def __init__(self, width=0.05):
+        self.width = width
+        self._offset = 0
+        self._counts = np.zeros(0, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+
+    @property
+    def nbytes(self):
+        return self._counts.nbytes
+
+    def _extend(self, low, high):
+        """Perluas range bin sampai mencakup index [low, high]"""
+        if len(self._counts) == 0:
+            self._offset, self._counts = low, np.zeros(high - low + 1, dtype=np.int64)
+            return
+        new_offset = min(low, self._offset)
+        new_end = max(high + 1, self._offset + len(self._counts))
+        if new_offset == self._offset and new_end == self._offset + len(self._counts):
+            return
+        counts = np.zeros(new_end - new_offset, dtype=np.int64)
+        counts[self._offset - new_offset:self._offset - new_offset + len(self._counts)] = self._counts
+        self._offset, self._counts = new_offset, counts
+
+    def add(self, scores):
+        if len(scores) == 0:
+            return self
+        index = np.floor(np.asarray(scores, dtype=np.float64) / self.width).astype(np.int64)
+        self._extend(int(index.min()), int(index.max()))
+        self._counts += np.bincount(index - self._offset, minlength=len(self._counts))
+        self.count += len(scores)
+        self.total += float(np.sum(scores, dtype=np.float64))
+        return self
+
+    def merge(self, other):
+        """Gabungkan histogram lain (lebar bin harus sama) ke histogram ini"""
+        if other.width != self.width:
+            raise ValueError("Cannot merge histograms with different bin widths")
+        if other.count == 0:
+            return self
+        self._extend(other._offset, other._offset + len(other._counts) - 1)
+        start = other._offset - self._offset
+        self._counts[start:start + len(other._counts)] += other._counts
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def distribution(self, bins=20):
+        """Aggregate ringan untuk histogram: counts, bin edges, mean dan jumlah kandidat
+
+        Setiap bin chart adalah gabungan beberapa bin ``width`` yang berurutan,
+        sehingga counts-nya exact (bukan rebin dari titik tengah bin).
+        """
+        if self.count == 0:
+            return {'counts': np.zeros(0, dtype=np.int64), 'edges': np.zeros(0), 'mean': 0.0, 'count': 0}
+
+        filled = np.flatnonzero(self._counts)
+        fine = self._counts[filled[0]:filled[-1] + 1]
+        # Jumlah bin width per bin chart: cukup untuk menutup range dengan <= bins bin
+        group = -(-len(fine) // bins)
+        n_bins = -(-len(fine) // group)
+        padded = np.zeros(n_bins * group, dtype=np.int64)
+        padded[:len(fine)] = fine
+        counts = padded.reshape(n_bins, group).sum(axis=1)
+        edges = (self._offset + filled[0] + np.arange(n_bins + 1) * group) * self.width
+        return {
+            'counts': counts,
+            'edges': edges,
+            'mean': self.total / self.count,
+            'count': self.count
+        }
+
+
+class TGVMoments:
+    """Count, mean dan co-moment TGV (streaming covariance), mergeable antar chunk / shard.
+
+    Merge memakai update pairwise (Chan et al.), sehingga hasil per shard
+    bisa digabung tanpa data baris; ``correlation`` sama dengan
+    ``DataFrame.corr()`` atas seluruh baris.
+    """
+
+    def __init__(self, n_features=len(TGV_KEYS)):
+        self.count = 0
+        self.mean = np.zeros(n_features, dtype=np.float64)
+        self.comoment = np.zeros((n_features, n_features), dtype=np.float64)
+
+    def _merge(self, count, mean, comoment):
+        if count == 0:
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment = self.comoment + comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+        return self
+
+    def add(self, tgv_matrix, block_rows=65536):
+        """Tambah baris TGV; diproses per blok agar temporary float64 tetap kecil"""
+        for start in range(0, len(tgv_matrix), block_rows):
+            block = np.asarray(tgv_matrix[start:start + block_rows], dtype=np.float64)
+            mean = block.mean(axis=0)
+            centered = block - mean
+            self._merge(len(block), mean, centered.T @ centered)
+        return self
+
+    @classmethod
+    def from_sums(cls, count, sums, cross_products):
+        """Moments dari sufficient statistics: count, sum dan sum of cross-products"""
+        moments = cls(len(sums))
+        if count > 0:
+            moments.count = count
+            moments.mean = sums / count
+            moments.comoment = cross_products - count * np.outer(moments.mean, moments.mean)
+        return moments
+
+    def merge(self, other):
+        return self._merge(other.count, other.mean, other.comoment)
+
+    def covariance(self, ddof=1):
+        if self.count <= ddof:
+            return np.full(self.comoment.shape, np.nan)
+        return self.comoment / (self.count - ddof)
+
+    def correlation(self, columns=TGV_COLUMNS):
+        """Pearson correlation matrix (DataFrame); TGV tanpa variance -> NaN"""
+        covariance = self.covariance()
+        std = np.sqrt(np.diag(covariance))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = covariance / np.outer(std, std)
+        correlation[~np.isfinite(correlation)] = np.nan
+        return pd.DataFrame(np.clip(correlation, -1, 1), index=columns, columns=columns)
+
+
+# =============================================================================
+# POPULATION STATISTICS: sufficient statistics TGV yang di-update incremental
+# =============================================================================
+
+class PopulationStats:
+    """Count, sums dan cross-products 8 TGV untuk rankable population.
+
+    Statistik disimpan untuk seluruh populasi dan per nilai ``group_columns``
+    (mis. directorate, grade). ``sync`` membandingkan engine baru dengan
+    engine terakhir dan hanya mengurangi / menambah employee yang TGV, grup
+    atau status rankable-nya berubah. Query correlation O(1) terhadap jumlah
+    employee. Store ini hanya untuk TGV tanpa TV weights.
+    """
+
+    def __init__(self, group_columns=('directorate', 'grade')):
+        self.group_columns = tuple(group_columns)
+        self.data_version = None
+        self._stats = {}
+        self._employee_ids = None
+        self._vectors = None
+        self._included = None
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def _group_values(self, employee_data):
+        """Nilai grup per baris sebagai object array (None jika kolom tidak ada / NULL)"""
+        groups = {}
+        for column in self.group_columns:
+            if column in employee_data:
+                values = employee_data[column].astype(object)
+                groups[column] = values.where(values.notna(), None).to_numpy(dtype=object)
+            else:
+                groups[column] = np.full(len(employee_data), None, dtype=object)
+        return groups
+
+    def _same_groups(self, groups):
+        return all(
+            column in self._groups and len(self._groups[column]) == len(values)
+            and np.array_equal(self._groups[column], values)
+            for column, values in groups.items()
+        )
+
+    def _accumulate(self, key, vectors, sign, block_rows=65536):
+        if len(vectors) == 0:
+            return
+        count, sums, cross_products = self._stats.get(key) or (
+            0, np.zeros(len(TGV_KEYS)), np.zeros((len(TGV_KEYS), len(TGV_KEYS)))
+        )
+        for start in range(0, len(vectors), block_rows):
+            block = np.asarray(vectors[start:start + block_rows], dtype=np.float64)
+            sums = sums + sign * block.sum(axis=0)
+            cross_products = cross_products + sign * (block.T @ block)
+        count += sign * len(vectors)
+        if count > 0:
+            self._stats[key] = (count, sums, cross_products)
+        else:
+            self._stats.pop(key, None)
+
+    def _apply(self, vectors, groups, rows, sign):
+        """Tambah (sign=1) atau kurangi (sign=-1) baris ``rows`` di semua statistik"""
+        if len(rows) == 0:
+            return
+        vectors = vectors[rows]
+        self._accumulate(None, vectors, sign)
+        for column, values in groups.items():
+            codes, uniques = pd.factorize(values[rows])
+            for code, value in enumerate(uniques):
+                if value is not None:
+                    self._accumulate((column, value), vectors[codes == code], sign)
+
+    def sync(self, engine):
+        """Samakan statistik dengan populasi engine; return jumlah employee yang di-update"""
+        with self._lock:
+            groups = self._group_values(engine.employee_data)
+            # Early return hanya jika grup juga sama: membership bisa berubah tanpa TGV berubah
+            if engine.data_version == self.data_version and self._same_groups(groups):
+                return 0
+
+            ids = engine.employee_ids
+            vectors = engine.tgv_matrix
+            included = engine.rankable
+
+            previous = None if self._employee_ids is None else pd.Index(self._employee_ids)
+            if previous is None or not previous.is_unique or not pd.Index(ids).is_unique:
+                # Build awal (atau ID tidak unik): hitung ulang dari seluruh populasi
+                self._stats = {}
+                added = np.flatnonzero(included)
+                self._apply(vectors, groups, added, 1)
+                changed = len(added)
+            else:
+                positions = previous.get_indexer(ids)
+                matched = np.flatnonzero(positions >= 0)
+                old = positions[matched]
+                same = (self._included[old] == included[matched]) & np.all(self._vectors[old] == vectors[matched], axis=1)
+                for column in self.group_columns:
+                    same &= self._groups[column][old] == groups[column][matched]
+
+                unchanged_new = np.zeros(len(ids), dtype=bool)
+                unchanged_new[matched[same]] = True
+                unchanged_old = np.zeros(len(self._employee_ids), dtype=bool)
+                unchanged_old[old[same]] = True
+
+                removed = np.flatnonzero(~unchanged_old & self._included)
+                added = np.flatnonzero(~unchanged_new & included)
+                self._apply(self._vectors, self._groups, removed, -1)
+                self._apply(vectors, groups, added, 1)
+                changed = len(np.union1d(self._employee_ids[removed].astype(str), ids[added].astype(str)))
+
+            self._employee_ids = ids
+            self._vectors = vectors
+            self._included = included
+            self._groups = groups
+            self.data_version = engine.data_version
+            return changed
+
+    def count(self, group=None):
+        """Jumlah employee di populasi atau di grup ``(column, value)``"""
+        entry = self._stats.get(group)
+        return 0 if entry is None else entry[0]
+
+    def group_values(self, column):
+        """Nilai grup yang punya statistik untuk ``column`` (sorted)"""
+        return sorted(key[1] for key in list(self._stats) if key is not None and key[0] == column)
+
+    def moments(self, group=None):
+        """TGVMoments untuk populasi atau grup ``(column, value)``"""
+        entry = self._stats.get(group)
+        if entry is None:
+            return TGVMoments()
+        return TGVMoments.from_sums(*entry)
+
+    def correlation(self, group=None):
+        return self.moments(group).correlation()
+
+
+# =============================================================================
+# NEAREST-NEIGHBOUR INDEX
+# =============================================================================
+
+class TGVIndex:
+    """KD-tree atas TGV vectors untuk query "top-K paling dekat ke baseline".
+
+    Final match rate turun monoton terhadap jarak Euclidean, jadi best-first
+    search per node (dengan bounding box) bisa berhenti begitu upper bound
+    match rate node berikutnya di bawah kandidat ke-K. Hasil exact: score dan
+    tie-break (row terkecil dulu) sama dengan ``Ranking``.
+    """
+
+    # Toleransi pruning (dalam satuan match rate) untuk pembulatan float32
+    PRUNE_TOLERANCE = 1e-3
+
+    def __init__(self, vectors, leaf_size=512):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._vectors = vectors
+        self.leaf_size = leaf_size
+        self._perm = np.arange(len(vectors), dtype=np.intp)
+
+        starts, ends, children, mins, maxs = [], [], [], [], []
+        stack = [(0, len(vectors), -1, 0)]
+        while stack:
+            start, end, parent, side = stack.pop()
+            node = len(starts)
+            if parent >= 0:
+                children[parent][side] = node
+
+            points = vectors[self._perm[start:end]]
+            low = points.min(axis=0) if end > start else np.zeros(vectors.shape[1], dtype=np.float32)
+            high = points.max(axis=0) if end > start else low
+            starts.append(start)
+            ends.append(end)
+            children.append([-1, -1])
+            mins.append(low)
+            maxs.append(high)
+
+            spread = high - low
+            if end - start <= leaf_size or not spread.any():
+                continue
+
+            # Split di median pada dimensi dengan spread terbesar
+            dim = int(np.argmax(spread))
+            mid = (start + end) // 2
+            segment = self._perm[start:end]
+            split = np.argpartition(vectors[segment, dim], mid - start, kind='introselect')
+            self._perm[start:end] = segment[split]
+            stack.append((mid, end, node, 1))
+            stack.append((start, mid, node, 0))
+
+        self._starts = np.array(starts, dtype=np.intp)
+        self._ends = np.array(ends, dtype=np.intp)
+        self._children = np.array(children, dtype=np.intp).reshape(-1, 2)
+        self._mins = np.array(mins, dtype=np.float32).reshape(-1, vectors.shape[1])
+        self._maxs = np.array(maxs, dtype=np.float32).reshape(-1, vectors.shape[1])
+        # Points disusun ulang per leaf supaya scan leaf adalah slice contiguous
+        self._points = vectors[self._perm]
+
+    def __len__(self):
+        return len(self._perm)
+
+    def _upper_bounds(self, nodes, baseline):
+        """Match rate maksimum yang mungkin di dalam bounding box tiap node"""
+        below = np.clip(self._mins[nodes] - baseline, 0, None)
+        above = np.clip(baseline - self._maxs[nodes], 0, None)
+        distance = np.sqrt(np.square(below + above).sum(axis=1))
+        return (1 - distance / len(TGV_KEYS)) * 100
+
+    @staticmethod
+    def _top(rows, scores, k):
+        order = np.lexsort((rows, -scores))[:k]
+        return rows[order], scores[order]
+
+    def query(self, baseline, k, mask=None):
+        """Row positions dan match rates dari k vector terdekat, urut descending.
+
+        ``mask`` (bool per row) membatasi kandidat, mis. hasil filter grade.
+        """
+        baseline = np.asarray(baseline, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.intp)
+        best_scores = np.empty(0, dtype=np.float32)
+        if k <= 0 or len(self) == 0:
+            return best_rows, best_scores
+
+        if mask is not None:
+            selected = np.flatnonzero(mask)
+            # Filter yang sangat selektif: brute force atas subset lebih murah
+            if len(selected) * 8 <= len(self):
+                return self._top(selected, match_rates(self._vectors[selected], baseline), k)
+
+        heap = [(-self._upper_bounds([0], baseline)[0], 0)]
+        while heap:
+            neg_bound, node = heapq.heappop(heap)
+            if len(best_rows) == k and -neg_bound < best_scores[-1] - self.PRUNE_TOLERANCE:
+                break
+
+            left, right = self._children[node]
+            if left >= 0:
+                bounds = self._upper_bounds([left, right], baseline)
+                heapq.heappush(heap, (-bounds[0], int(left)))
+                heapq.heappush(heap, (-bounds[1], int(right)))
+                continue
+
+            start, end = self._starts[node], self._ends[node]
+            rows = self._perm[start:end]
+            points = self._points[start:end]
+            if mask is not None:
+                keep = mask[rows]
+                rows, points = rows[keep], points[keep]
+            if len(rows) == 0:
+                continue
+
+            scores = match_rates(points, baseline)
+            if len(best_rows) == k:
+                # Hanya baris yang bisa masuk top-k yang di-merge (>= agar tie-break tetap benar)
+                keep = scores >= best_scores[-1]
+                if not keep.any():
+                    continue
+                rows, scores = rows[keep], scores[keep]
+
+            best_rows, best_scores = self._top(
+                np.concatenate([best_rows, rows]),
+                np.concatenate([best_scores, scores]),
+                k
+            )
+
+        return best_rows, best_scores
+
+
+# =============================================================================
+# SCORING ENGINE
+# =============================================================================
+
+class TGVScoringEngine:
+    """TV/TGV matrices untuk seluruh populasi employee, di-load sekali dan dipakai ulang"""
+
+    # KD-tree query mengunjungi ~k * n / candidates baris (baris di luar filter ikut
+    # ter-scan di leaf) dengan overhead per leaf di Python; scan vectorized biayanya
+    # ~candidates. Index dipakai jika candidates^2 >= ratio * k * n. Synthetic data
+    # (benchmark.py nearest_*), k=500: 1M tanpa filter index ~40 ms vs scan ~85 ms;
+    # 200k tanpa filter (~25 vs ~20 ms) dan 1M dengan filter directorate scan menang.
+    NEAREST_INDEX_RATIO = 1500
+
+    def __init__(self, employee_data):
+        employee_data = employee_data.reset_index(drop=True)
+        # TV matrix dari nilai asli (Decimal / float64), lalu simpan versi compact
+        self.tv_matrix = build_tv_matrix(employee_data)
+        self.employee_data = compact_frame(employee_data)
+        self.employee_ids = self.employee_data['employee_id'].to_numpy()
+        self.tgv_matrix = tv_to_tgv(self.tv_matrix)
+        self.rankable = self.employee_data['fullname'].notna().to_numpy()
+        self._row_index = {emp_id: i for i, emp_id in enumerate(self.employee_ids)}
+        self.data_version = self._fingerprint()
+        self._index = None
+        self._index_lock = threading.Lock()
+        # TGV matrix per konfigurasi TV weights (LRU kecil, di-share lintas request)
+        self._weighted_tgv = OrderedDict()
+        self._weighted_tgv_lock = threading.Lock()
+        # TGVMoments rankable population per (konfigurasi TV weights, grup)
+        self._moments = {}
+        # PopulationStats yang di-sync ke engine ini (lihat pipeline.load_scoring_engine)
+        self.population_stats = None
+
+    def _fingerprint(self):
+        """Data-version stamp atas semua kolom yang dikembalikan ``frame_for``.
+
+        Berubah jika employee set, TV values, atau kolom organisasi / display
+        (position, grade, fullname, latest_performance, ...) berubah.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update('\x00'.join(map(str, self.employee_data.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(self.employee_data, index=False).to_numpy().tobytes())
+        digest.update(self.tv_matrix.tobytes())
+        return digest.hexdigest()
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    def rows_for(self, employee_ids):
+        """Row positions untuk employee IDs (ID duplikat / tidak dikenal diabaikan)"""
+        rows = {self._row_index[emp_id] for emp_id in employee_ids if emp_id in self._row_index}
+        return np.array(sorted(rows), dtype=np.intp)
+
+    def tgv_matrix_for(self, weights=None, max_cached=32):
+        """TGV matrix untuk MatchWeights; TV weights dihitung sekali per konfigurasi lalu di-cache"""
+        if weights is None or weights.tv_tgv_matrix is None:
+            return self.tgv_matrix
+
+        with self._weighted_tgv_lock:
+            matrix = self._weighted_tgv.get(weights.fingerprint)
+            if matrix is not None:
+                self._weighted_tgv.move_to_end(weights.fingerprint)
+                return matrix
+
+        matrix = tv_to_tgv(self.tv_matrix, weights.tv_tgv_matrix)
+        with self._weighted_tgv_lock:
+            self._weighted_tgv[weights.fingerprint] = matrix
+            while len(self._weighted_tgv) > max_cached:
+                self._weighted_tgv.popitem(last=False)
+        return matrix
+
+    def tgv_moments(self, weights=None, group=None):
+        """Covariance accumulator TGV untuk rankable population atau grup ``(column, value)``.
+
+        Tanpa TV weights dibaca dari PopulationStats yang sudah di-sync (O(1));
+        selain itu dihitung sekali per konfigurasi lalu di-cache.
+        """
+        tv_fingerprint = None if weights is None or weights.tv_tgv_matrix is None else weights.fingerprint
+        stats = self.population_stats
+        if tv_fingerprint is None and stats is not None and stats.data_version == self.data_version:
+            if group is None or group[0] in stats.group_columns:
+                return stats.moments(group)
+
+        key = (tv_fingerprint, group)
+        moments = self._moments.get(key)
+        if moments is None:
+            mask = self.rankable if group is None else self.filter_mask({group[0]: [group[1]]})
+            moments = TGVMoments().add(self.tgv_matrix_for(weights)[mask])
+            with self._weighted_tgv_lock:
+                self._moments[key] = moments
+        return moments
+
+    def compute_baseline(self, benchmark_ids, weights=None):
+        """Baseline TGV = mean dari baris benchmark pada TGV matrix"""
+        rows = self.rows_for(benchmark_ids)
+        if len(rows) == 0:
+            return {}
+
+        # Akumulasi float64: identik dengan running sums di IncrementalBaseline
+        means = self.tgv_matrix_for(weights)[rows].sum(axis=0, dtype=np.float64) / len(rows)
+        baseline_dict = {key: float(value) for key, value in zip(TGV_KEYS, means)}
+        baseline_dict['benchmark_count'] = len(rows)
+        return baseline_dict
+
+    def batch_rank(self, benchmark_sets, k=100, weights=None):
+        """Top-k kandidat untuk banyak benchmark set (mis. per job_vacancy_id) sekaligus.
+
+        ``benchmark_sets`` adalah dict key -> employee IDs dan ``weights`` dict
+        opsional key -> MatchWeights. Return long DataFrame (``key``, ``rank`` +
+        kolom ``frame_for``); key tanpa benchmark valid dilewati.
+        """
+        weights = weights or {}
+        # Vacancy dengan TV weights yang sama memakai TGV matrix yang sama -> satu pass per grup
+        groups = OrderedDict()
+        for key, benchmark_ids in benchmark_sets.items():
+            key_weights = weights.get(key)
+            baseline_dict = self.compute_baseline(benchmark_ids, key_weights)
+            if not baseline_dict:
+                continue
+            tv_fingerprint = None if key_weights is None or key_weights.tv_tgv_matrix is None else key_weights.fingerprint
+            group = groups.setdefault(tv_fingerprint, {'weights': key_weights, 'keys': [], 'baselines': [], 'scales': []})
+            group['keys'].append(key)
+            group['baselines'].append(baseline_vector(baseline_dict))
+            group['scales'].append(
+                np.ones(len(TGV_KEYS), dtype=np.float32)
+                if key_weights is None or key_weights.tgv_scale is None else key_weights.tgv_scale
+            )
+
+        if not groups:
+            return pd.DataFrame()
+
+        rows = np.flatnonzero(self.rankable)
+        frames = []
+        for group in groups.values():
+            scales = np.vstack(group['scales'])
+            best_rows, best_scores = batch_top_k(
+                self.tgv_matrix_for(group['weights']), rows, np.vstack(group['baselines']), k,
+                tgv_scales=None if np.all(scales == 1.0) else scales
+            )
+            # Satu frame_for per grup (bukan satu DataFrame per vacancy)
+            counts = [len(best) for best in best_rows]
+            df = self.frame_for(np.concatenate(best_rows), np.concatenate(best_scores), group['weights'])
+            df.insert(0, 'rank', np.concatenate([np.arange(1, count + 1) for count in counts]))
+            df.insert(0, 'key', np.repeat(np.array(group['keys'], dtype=object), counts))
+            frames.append(df)
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def score(self, baseline_dict, weights=None, rows=None):
+        """Final match rate untuk setiap employee (urutan sesuai employee_data) atau hanya ``rows``"""
+        tgv_matrix = self.tgv_matrix_for(weights)
+        return match_rates(
+            tgv_matrix if rows is None else tgv_matrix[rows],
+            baseline_vector(baseline_dict),
+            None if weights is None else weights.tgv_scale
+        )
+
+    def ranking(self, baseline_dict, weights=None, filters=None):
+        """Ranking object: scores dihitung sekali, halaman diambil on demand.
+
+        ``filters`` (mis. {'grade': ['IV', 'V']}) membatasi kandidat seperti ``filter_mask``.
+        """
+        return Ranking(self, baseline_dict, weights, filters)
+
+    def rank(self, baseline_dict, weights=None):
+        """Ranked DataFrame: employee features + kolom TGV + final_match_rate, urut descending"""
+        ranking = self.ranking(baseline_dict, weights)
+        return ranking.page(0, len(ranking))
+
+    @property
+    def index(self):
+        """KD-tree atas TGV matrix, dibangun sekali saat pertama dipakai"""
+        with self._index_lock:
+            if self._index is None:
+                self._index = TGVIndex(self.tgv_matrix)
+            return self._index
+
+    def filter_values(self, column):
+        """Nilai unik (sorted) dari kolom organisasi, untuk pilihan filter"""
+        if column not in self.employee_data:
+            return []
+        return sorted(self.employee_data.loc[self.rankable, column].dropna().unique().tolist())
+
+    def filter_mask(self, filters=None):
+        """Rankable rows yang cocok dengan filters, mis. {'grade': ['IV', 'V']}"""
+        mask = self.rankable.copy()
+        for column, values in (filters or {}).items():
+            if not values:
+                continue
+            if isinstance(values, str) or not hasattr(values, '__iter__'):
+                values = [values]
+            if column not in self.employee_data:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.employee_data[column].isin(list(values)).to_numpy(dtype=bool)
+        return mask
+
+    def nearest(self, baseline_dict, k=100, filters=None, weights=None):
+        """Top-k kandidat terdekat ke baseline di dalam subset ``filters``.
+
+        TGVIndex hanya dipakai jika k kecil relatif terhadap jumlah kandidat
+        (lihat ``NEAREST_INDEX_RATIO``); selain itu masked ``Ranking`` scan
+        lebih cepat. Hasil kedua jalur sama persis.
+        """
+        mask = self.filter_mask(filters)
+        candidates = int(mask.sum())
+        # Index dibangun di ruang TGV tanpa bobot: weighted mode selalu scan
+        if weights is None and candidates ** 2 >= self.NEAREST_INDEX_RATIO * k * len(self):
+            rows, scores = self.index.query(baseline_vector(baseline_dict), k, mask=mask)
+            return self.frame_for(rows, scores)
+        return self.ranking(baseline_dict, weights, filters).top(k)
+
+    def frame_for(self, rows, scores, weights=None):
+        """Bangun output DataFrame untuk row positions tertentu"""
+        df = self.employee_data.iloc[rows].reset_index(drop=True)
+        tgv_values = self.tgv_matrix_for(weights)[rows]
+        for i, column in enumerate(TGV_COLUMNS):
+            df[column] = tgv_values[:, i]
+        df['final_match_rate'] = np.asarray(scores, dtype=np.float32)
+        return df
+
+
+class Ranking:
+    """Final match rate semua employee (atau subset ``filters``) untuk satu baseline.
+
+    Hanya prefix yang diminta yang di-sort (argpartition), sehingga top-K dan
+    halaman berikutnya tidak perlu menghitung ulang scores.
+    """
+
+    def __init__(self, engine, baseline_dict, weights=None, filters=None):
+        self.engine = engine
+        self.baseline_dict = baseline_dict
+        self.weights = weights
+        self.filters = filters or {}
+        self.rows = np.flatnonzero(engine.filter_mask(self.filters))
+        if self.filters:
+            # Hanya baris yang lolos filter yang di-score
+            self.scores = engine.score(baseline_dict, weights, rows=self.rows)
+        else:
+            self.scores = engine.score(baseline_dict, weights)[self.rows]
+        self._order = np.empty(0, dtype=np.intp)
+        # Histogram dihitung di scoring pass: chart tidak perlu scores per baris
+        self.histogram = ScoreHistogram().add(self.scores)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def available(self):
+        """Jumlah peringkat yang bisa di-page (semua kandidat)"""
+        return len(self.rows)
+
+    @property
+    def nbytes(self):
+        """Perkiraan memory, termasuk ruang untuk order hasil full sort"""
+        return 2 * self.rows.nbytes + self.scores.nbytes + self.histogram.nbytes
+
+    def _sorted_prefix(self, n):
+        """Posisi (ke self.scores) dari n score tertinggi, urut descending dan stabil"""
+        n = min(n, len(self.scores))
+        order = self._order
+        if n <= len(order):
+            return order[:n]
+
+        if n == len(self.scores):
+            order = np.argsort(-self.scores, kind='stable')
+        else:
+            # Ambil semua kandidat >= nilai ke-n agar tie-break sama dengan full stable sort
+            kth = np.partition(-self.scores, n - 1)[n - 1]
+            candidates = np.flatnonzero(-self.scores <= kth)
+            order = candidates[np.lexsort((candidates, -self.scores[candidates]))][:n]
+
+        # Ranking bisa di-share lintas session: hanya ganti dengan prefix yang lebih panjang
+        if len(order) > len(self._order):
+            self._order = order
+        return order
+
+    def page(self, offset=0, limit=100):
+        """DataFrame untuk peringkat [offset, offset + limit)"""
+        positions = self._sorted_prefix(offset + limit)[offset:offset + limit]
+        return self.engine.frame_for(self.rows[positions], self.scores[positions], self.weights)
+
+    def top(self, k):
+        return self.page(0, k)
+
+    def distribution(self, bins=20):
+        """Aggregate ringan untuk histogram: counts, bin edges, mean dan jumlah kandidat"""
+        return self.histogram.distribution(bins)
+
+    def tgv_correlation(self, group=None):
+        """TGV correlation matrix populasi (atau grup ``(column, value)``) tanpa data baris"""
+        return self.engine.tgv_moments(self.weights, group).correlation()
+
+
+class IncrementalBaseline:
+    """Baseline TGV dengan running sums, untuk eksplorasi "what if" di benchmark picker.
+
+    Tambah / hapus satu benchmark employee hanya meng-update jumlah TGV (O(TGV));
+    re-score memakai TGV matrix engine yang sudah di-cache. ``baseline_dict()``
+    sama persis dengan ``engine.compute_baseline`` untuk benchmark set yang sama.
+    """
+
+    def __init__(self, engine, benchmark_ids=(), weights=None):
+        self.engine = engine
+        self.weights = weights
+        self._tgv_matrix = engine.tgv_matrix_for(weights)
+        self._sum = np.zeros(len(TGV_KEYS), dtype=np.float64)
+        self._members = {}
+        self.sync(benchmark_ids)
+
+    @property
+    def benchmark_ids(self):
+        return list(self._members)
+
+    def add(self, employee_id):
+        """Tambah satu benchmark; False jika ID tidak dikenal atau sudah ada"""
+        row = self.engine._row_index.get(employee_id)
+        if row is None or employee_id in self._members:
+            return False
+        self._members[employee_id] = row
+        self._sum += self._tgv_matrix[row]
+        return True
+
+    def remove(self, employee_id):
+        row = self._members.pop(employee_id, None)
+        if row is None:
+            return False
+        self._sum -= self._tgv_matrix[row]
+        if not self._members:
+            self._sum[:] = 0
+        return True
+
+    def sync(self, benchmark_ids):
+        """Samakan dengan pilihan baru: hanya selisih yang di-add / remove"""
+        wanted = dict.fromkeys(benchmark_ids)
+        for employee_id in [employee_id for employee_id in self._members if employee_id not in wanted]:
+            self.remove(employee_id)
+        for employee_id in wanted:
+            self.add(employee_id)
+
+    def baseline_dict(self):
+        if not self._members:
+            return {}
+        means = self._sum / len(self._members)
+        baseline_dict = {key: float(value) for key, value in zip(TGV_KEYS, means)}
+        baseline_dict['benchmark_count'] = len(self._members)
+        return baseline_dict
+
+    def ranking(self):
+        """Ranking terhadap baseline saat ini (None jika belum ada benchmark)"""
+        baseline_dict = self.baseline_dict()
+        if not baseline_dict:
+            return None
+        return self.engine.ranking(baseline_dict, self.weights)
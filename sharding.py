@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from scoring import TGV_KEYS, ScoreHistogram, baseline_vector, match_rates
+
+# =============================================================================
+# SHARDED SCORING: TGV scores + local top-K + summary per shard di process pool
+# =============================================================================
+
+# State worker process: TGV matrix dan row ids di shared memory (zero-copy)
+_WORKER = {}
+
+
+def select_top_k(rows, scores, k):
+    """Top-k (rows, scores): score descending, tie-break row terkecil dulu (sama dengan Ranking)"""
+    if len(scores) > k:
+        kth = np.partition(-scores, k - 1)[k - 1]
+        candidates = np.flatnonzero(-scores <= kth)
+        rows, scores = rows[candidates], scores[candidates]
+    order = np.lexsort((rows, -scores))[:k]
+    return rows[order], scores[order]
+
+
+def _attach_shared(vectors_name, rows_name, n_rows):
+    vectors_shm = shared_memory.SharedMemory(name=vectors_name)
+    rows_shm = shared_memory.SharedMemory(name=rows_name)
+    _WORKER['shm'] = (vectors_shm, rows_shm)
+    _WORKER['vectors'] = np.ndarray((n_rows, len(TGV_KEYS)), dtype=np.float32, buffer=vectors_shm.buf)
+    _WORKER['rows'] = np.ndarray((n_rows,), dtype=np.intp, buffer=rows_shm.buf)
+
+
+def _shard_top_k(start, end, baseline, k, tgv_scale=None):
+    scores = match_rates(_WORKER['vectors'][start:end], baseline, tgv_scale)
+    rows, top_scores = select_top_k(_WORKER['rows'][start:end].copy(), scores, k)
+    return rows, top_scores, ScoreHistogram().add(scores)
+
+
+class ShardedScorer:
+    """Scoring paralel untuk populasi besar: employees dibagi ke shard, setiap shard
+    menghitung TGV scores + local top-K di process pool, lalu di-merge jadi global top-K.
+
+    Shard dibuat per blok ``employee_id`` (urut) atau per nilai kolom ``shard_by``
+    (mis. company / directorate). TGV matrix ditaruh sekali di shared memory,
+    sehingga setiap query hanya mengirim baseline ke worker. ``weights``
+    (MatchWeights) dipakai untuk semua query scorer ini. Hasil identik dengan
+    ``Ranking.top(k)`` dengan weights yang sama.
+    """
+
+    def __init__(self, engine, workers=None, shards=None, shard_by=None, weights=None):
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.weights = weights
+        self._tgv_scale = None if weights is None else weights.tgv_scale
+
+        rows = np.flatnonzero(engine.rankable)
+        if shard_by is not None and shard_by in engine.employee_data:
+            keys = engine.employee_data[shard_by].iloc[rows].astype('string').fillna('').to_numpy(dtype=str)
+            order = np.lexsort((rows, keys))
+            rows, keys = rows[order], keys[order]
+            bounds = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1, len(rows)]
+            self.shards = [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+        else:
+            ids = engine.employee_ids[rows].astype(str)
+            rows = rows[np.argsort(ids, kind='stable')]
+            n_shards = shards or self.workers
+            bounds = np.linspace(0, len(rows), n_shards + 1).astype(np.intp)
+            self.shards = [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+        self._vectors_shm = shared_memory.SharedMemory(create=True, size=max(len(rows) * len(TGV_KEYS) * 4, 1))
+        self._rows_shm = shared_memory.SharedMemory(create=True, size=max(rows.nbytes, 1))
+        np.ndarray((len(rows), len(TGV_KEYS)), dtype=np.float32, buffer=self._vectors_shm.buf)[:] = engine.tgv_matrix_for(weights)[rows]
+        np.ndarray((len(rows),), dtype=np.intp, buffer=self._rows_shm.buf)[:] = rows
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_attach_shared,
+            initargs=(self._vectors_shm.name, self._rows_shm.name, len(rows))
+        )
+
+    def scan(self, baseline_dict, k=100):
+        """Global top-k (engine rows, scores) + ScoreHistogram populasi dari merge hasil setiap shard"""
+        baseline = baseline_vector(baseline_dict)
+        futures = [
+            self._executor.submit(_shard_top_k, start, end, baseline, k, self._tgv_scale)
+            for start, end in self.shards
+        ]
+        results = [future.result() for future in futures]
+        histogram = ScoreHistogram()
+        if not results:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32), histogram
+
+        for _, _, shard_histogram in results:
+            histogram.merge(shard_histogram)
+        rows = np.concatenate([rows for rows, _, _ in results])
+        scores = np.concatenate([scores for _, scores, _ in results])
+        return (*select_top_k(rows, scores, k), histogram)
+
+    def top_k(self, baseline_dict, k=100):
+        """Global top-k (engine rows, scores) dari merge local top-k setiap shard"""
+        rows, scores, _ = self.scan(baseline_dict, k)
+        return rows, scores
+
+    def top(self, baseline_dict, k=100):
+        """Top-k DataFrame (sama dengan ``Ranking.top``)"""
+        rows, scores = self.top_k(baseline_dict, k)
+        return self.engine.frame_for(rows, scores, self.weights)
+
+    def close(self):
+        self._executor.shutdown()
+        for shm in (self._vectors_shm, self._rows_shm):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
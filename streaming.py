@@ -0,0 +1,159 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from features import employee_features_query, feature_store_exists, refresh_employee_tv_features
+from scoring import (TGV_COLUMNS, TV_TGV_MATRIX, ScoreHistogram, TGVMoments, TGVScoringEngine, baseline_vector,
+                     build_tv_matrix, compact_frame, match_rates, tv_to_tgv)
+
+# =============================================================================
+# STREAMING RANKING: server-side cursor, running top-K + histogram + TGV moments
+# =============================================================================
+
+
+def prepare_feature_source(conn):
+    """Drain dirty queue feature store (jika ada) sebelum dibaca; return True jika store dipakai.
+
+    Tanpa refresh, employee yang berubah atau baru sejak refresh terakhir
+    di-score dari baris store lama / tanpa baris store (TV nol).
+    """
+    if not feature_store_exists(conn):
+        return False
+    refresh_employee_tv_features(conn)
+    return True
+
+
+def iter_employee_features(conn, chunk_size=5000, stored=None):
+    """Employee features per chunk lewat named (server-side) cursor, urut employee_id.
+
+    Hanya ``chunk_size`` baris yang ada di memory client pada satu waktu.
+    ``stored`` hasil ``prepare_feature_source``; None berarti refresh di sini.
+    """
+    if stored is None:
+        stored = prepare_feature_source(conn)
+    query = employee_features_query(stored=stored, ordered=True)
+    with conn.cursor(name=f"employee_features_{uuid.uuid4().hex}") as cur:
+        cur.itersize = chunk_size
+        cur.execute(query)
+        columns = None
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            if columns is None:
+                columns = [desc[0] for desc in cur.description]
+            yield pd.DataFrame(rows, columns=columns)
+
+
+def load_benchmark_features(conn, benchmark_ids, stored=None):
+    """Features untuk benchmark employees saja (untuk baseline tanpa load populasi)"""
+    if stored is None:
+        stored = prepare_feature_source(conn)
+    query = employee_features_query(stored=stored, filtered=True)
+    with conn.cursor() as cur:
+        cur.execute(query, {'employee_ids': list(benchmark_ids)})
+        columns = [desc[0] for desc in cur.description]
+        return pd.DataFrame(cur.fetchall(), columns=columns)
+
+
+class StreamedRanking:
+    """Hasil streaming: top-K kandidat + histogram dan TGV moments populasi.
+
+    Interface sama dengan ``Ranking`` untuk bagian yang dipakai dashboard
+    (``top``, ``page``, ``available``, ``distribution``, ``tgv_correlation``),
+    tetapi hanya K baris teratas yang disimpan.
+    """
+
+    def __init__(self, baseline_dict, top_frame, histogram, moments):
+        self.baseline_dict = baseline_dict
+        self._top = top_frame
+        self.histogram = histogram
+        self.moments = moments
+
+    def __len__(self):
+        return self.histogram.count
+
+    @property
+    def available(self):
+        """Jumlah peringkat yang bisa di-page: hanya top-K yang disimpan"""
+        return len(self._top)
+
+    @property
+    def nbytes(self):
+        return int(self._top.memory_usage(deep=True).sum()) + self.histogram.nbytes
+
+    def page(self, offset=0, limit=100):
+        return self._top.iloc[offset:offset + limit].reset_index(drop=True)
+
+    def top(self, k):
+        return self.page(0, k)
+
+    def distribution(self, bins=20):
+        return self.histogram.distribution(bins)
+
+    def tgv_correlation(self, group=None):
+        """TGV correlation matrix seluruh populasi yang di-stream (tanpa statistik per grup)"""
+        if group is not None:
+            raise ValueError("Streamed ranking has no per-group TGV statistics")
+        return self.moments.correlation()
+
+
+def stream_baseline(conn, benchmark_ids, weights=None, stored=None):
+    """Baseline TGV dari benchmark rows saja; hasil sama dengan ``engine.compute_baseline``"""
+    benchmark_data = load_benchmark_features(conn, benchmark_ids, stored)
+    if benchmark_data.empty:
+        return {}
+    return TGVScoringEngine(benchmark_data).compute_baseline(benchmark_ids, weights)
+
+
+def stream_ranking(conn, baseline_dict, k=500, chunk_size=5000, weights=None, stored=None):
+    """Score seluruh populasi per chunk dengan memory terbatas (chunk + K baris).
+
+    Histogram dan TGV moments di-update per chunk di pass yang sama.
+
+    Top-K dan tie-break (urutan employee_id) sama dengan ``Ranking`` atas data
+    yang di-load dengan urutan yang sama.
+    """
+    tv_tgv_matrix = TV_TGV_MATRIX if weights is None or weights.tv_tgv_matrix is None else weights.tv_tgv_matrix
+    tgv_scale = None if weights is None else weights.tgv_scale
+    baseline = baseline_vector(baseline_dict)
+
+    histogram = ScoreHistogram()
+    moments = TGVMoments()
+    top_frame = None
+    top_order = np.empty(0, dtype=np.int64)
+    position = 0
+
+    for chunk in iter_employee_features(conn, chunk_size, stored):
+        tgv = tv_to_tgv(build_tv_matrix(chunk), tv_tgv_matrix)
+        rankable = chunk['fullname'].notna().to_numpy()
+        order = np.arange(position, position + len(chunk))
+        position += len(chunk)
+
+        chunk, tgv, order = chunk[rankable].reset_index(drop=True), tgv[rankable], order[rankable]
+        scores = match_rates(tgv, baseline, tgv_scale)
+        histogram.add(scores)
+        moments.add(tgv)
+
+        # Hanya kandidat yang bisa masuk top-K yang di-merge dengan top-K sebelumnya
+        if len(scores) > k:
+            kth = np.partition(-scores, k - 1)[k - 1]
+            keep = np.flatnonzero(-scores <= kth)
+            chunk, tgv, order, scores = chunk.iloc[keep].reset_index(drop=True), tgv[keep], order[keep], scores[keep]
+
+        candidates = chunk.copy()
+        for i, column in enumerate(TGV_COLUMNS):
+            candidates[column] = tgv[:, i]
+        candidates['final_match_rate'] = scores.astype(np.float32)
+
+        if top_frame is not None:
+            candidates = pd.concat([top_frame, candidates], ignore_index=True)
+            order = np.concatenate([top_order, order])
+        best = np.lexsort((order, -candidates['final_match_rate'].to_numpy()))[:k]
+        top_frame, top_order = candidates.iloc[best].reset_index(drop=True), order[best]
+
+    if top_frame is None:
+        top_frame = pd.DataFrame(columns=TGV_COLUMNS + ['final_match_rate'])
+    # Compact sekali di akhir: categories per chunk berbeda sehingga concat jadi object
+    return StreamedRanking(baseline_dict, compact_frame(top_frame), histogram, moments)
@@ -0,0 +1,276 @@
+"""Deterministic synthetic talent data untuk benchmark dan development lokal.
+
+``generate_tables(n)`` membuat tabel sumber yang dibaca feature query app:
+``employees``, ``profiles_psych``, ``papi_scores``, ``strengths``,
+``performance_yearly`` dan ``dim_positions`` / ``dim_departments`` /
+``dim_divisions`` / ``dim_directorates`` / ``dim_grades``. Tabel competency
+tidak dibuat karena tidak dipakai scoring. Seed yang sama selalu menghasilkan
+data yang sama, di mesin mana pun.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from features import PAPI_COLUMNS, STRENGTH_COLUMNS, TV_FEATURE_COLUMNS
+
+# =============================================================================
+# DIMENSION VALUES
+# =============================================================================
+
+DIRECTORATES = ['Commercial', 'Technology', 'Operations', 'Finance', 'Human Capital']
+
+DIVISIONS = [
+    'Sales', 'Marketing', 'Engineering', 'Data & Analytics', 'Supply Chain',
+    'Customer Service', 'Accounting', 'Talent Management'
+]
+
+DEPARTMENTS = [
+    'Retail Sales', 'Corporate Sales', 'Brand', 'Digital Marketing', 'Platform',
+    'Mobile', 'Data Engineering', 'Business Intelligence', 'Procurement',
+    'Logistics', 'Contact Center', 'Controllership', 'Tax', 'Recruitment', 'Learning'
+]
+
+POSITIONS = [
+    'Sales Executive', 'Account Manager', 'Brand Manager', 'Marketing Specialist',
+    'Software Engineer', 'Senior Software Engineer', 'Engineering Manager',
+    'Data Analyst', 'Data Scientist', 'Data Engineer', 'BI Developer',
+    'Procurement Officer', 'Logistics Coordinator', 'Customer Service Officer',
+    'Accountant', 'Tax Specialist', 'Recruiter', 'HR Business Partner',
+    'Learning Specialist', 'Operations Supervisor'
+]
+
+GRADES = ['III', 'IV', 'V', 'VI', 'VII']
+
+FIRST_NAMES = [
+    'Budi', 'Siti', 'Agus', 'Dewi', 'Rina', 'Andi', 'Putri', 'Eko', 'Sri', 'Hendra',
+    'Wulan', 'Fajar', 'Indah', 'Rizky', 'Ayu', 'Dimas', 'Lestari', 'Yoga', 'Maya', 'Bayu'
+]
+
+LAST_NAMES = [
+    'Santoso', 'Wijaya', 'Pratama', 'Saputra', 'Hidayat', 'Kusuma', 'Nugroho', 'Lestari',
+    'Siregar', 'Simanjuntak', 'Purnama', 'Setiawan', 'Halim', 'Rahmawati', 'Gunawan'
+]
+
+DISC_TYPES = ['D', 'I', 'S', 'C', 'DI', 'DC', 'IS', 'SC']
+
+MBTI_TYPES = [
+    'ISTJ', 'ISFJ', 'INFJ', 'INTJ', 'ISTP', 'ISFP', 'INFP', 'INTP',
+    'ESTP', 'ESFP', 'ENFP', 'ENTP', 'ESTJ', 'ESFJ', 'ENFJ', 'ENTJ'
+]
+
+# 34 CliftonStrengths themes; 17 pertama dipetakan ke TV (STRENGTH_COLUMNS)
+STRENGTH_THEMES = [
+    'Adaptability', 'Connectedness', 'Analytical', 'Strategic', 'Deliberative', 'Discipline',
+    'Futuristic', 'Ideation', 'Belief', 'Arranger', 'Command', 'Self-Assurance', 'Developer',
+    'Achiever', 'Communication', 'Woo', 'Relator',
+    'Activator', 'Competition', 'Consistency', 'Context', 'Empathy', 'Focus', 'Harmony',
+    'Includer', 'Individualization', 'Input', 'Intellection', 'Learner', 'Maximizer',
+    'Positivity', 'Responsibility', 'Restorative', 'Significance'
+]
+
+PAPI_SCALES = ['Papi_' + column.split('_')[1].upper() for column in PAPI_COLUMNS]
+
+PERFORMANCE_YEARS = [2021, 2022, 2023, 2024, 2025]
+
+# Jumlah strengths theme per employee (rank 1..N)
+STRENGTHS_PER_EMPLOYEE = 5
+
+
+# =============================================================================
+# GENERATOR
+# =============================================================================
+
+def parse_scale(scale):
+    """'1k' -> 1000, '1m' -> 1000000, '2500' -> 2500"""
+    text = str(scale).strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+def _dimension(prefix, names):
+    return pd.DataFrame({f'{prefix}_id': np.arange(1, len(names) + 1), 'name': names})
+
+
+def _with_nulls(rng, values, rate):
+    """Object array dengan ``rate`` bagian di-set NULL (None)"""
+    values = np.asarray(values, dtype=object)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+def generate_tables(n_employees, seed=42):
+    """Semua tabel sumber untuk ``n_employees`` employee sebagai dict nama -> DataFrame.
+
+    Baris long-format (PAPI, strengths, performance) dibuat vectorized sehingga
+    skala 1M tetap beberapa detik; setiap tabel hanya bergantung pada seed.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_employees)
+    employee_ids = np.char.add('EMP', np.char.zfill(np.arange(1, n + 1).astype(str), 7)).astype(object)
+
+    tables = {
+        'dim_directorates': _dimension('directorate', DIRECTORATES),
+        'dim_divisions': _dimension('division', DIVISIONS),
+        'dim_departments': _dimension('department', DEPARTMENTS),
+        'dim_positions': _dimension('position', POSITIONS),
+        'dim_grades': _dimension('grade', GRADES),
+    }
+
+    # Sekitar 2% employee tanpa fullname (tidak masuk ranking, sama seperti data asli)
+    fullnames = np.char.add(
+        np.char.add(np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), n)], ' '),
+        np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), n)]
+    )
+    tables['employees'] = pd.DataFrame({
+        'employee_id': employee_ids,
+        'fullname': _with_nulls(rng, fullnames, 0.02),
+        'directorate_id': rng.integers(1, len(DIRECTORATES) + 1, n),
+        'division_id': rng.integers(1, len(DIVISIONS) + 1, n),
+        'department_id': rng.integers(1, len(DEPARTMENTS) + 1, n),
+        'position_id': rng.integers(1, len(POSITIONS) + 1, n),
+        'grade_id': rng.integers(1, len(GRADES) + 1, n),
+        'years_of_service_months': rng.integers(1, 360, n),
+    })
+
+    # Psikometrik: ~95% employee punya profile, dengan sebagian nilai NULL
+    has_profile = np.flatnonzero(rng.random(n) < 0.95)
+    m = len(has_profile)
+    tables['profiles_psych'] = pd.DataFrame({
+        'employee_id': employee_ids[has_profile],
+        'disc': _with_nulls(rng, np.array(DISC_TYPES)[rng.integers(0, len(DISC_TYPES), m)], 0.05),
+        'mbti': _with_nulls(rng, np.array(MBTI_TYPES)[rng.integers(0, len(MBTI_TYPES), m)], 0.05),
+        'iq': np.clip(np.round(rng.normal(105, 12, m)), 70, 145),
+        'gtq': np.clip(np.round(rng.normal(28, 5, m)), 10, 40),
+        'tiki': np.clip(np.round(rng.normal(6, 2, m)), 1, 10),
+        'pauli': np.clip(np.round(rng.normal(60, 15, m)), 10, 100),
+        'faxtor': np.clip(np.round(rng.normal(50, 10, m)), 10, 90),
+    })
+    for column in ['iq', 'gtq', 'tiki', 'pauli']:
+        tables['profiles_psych'].loc[rng.random(m) < 0.03, column] = np.nan
+
+    # PAPI Kostick: satu baris per (employee, scale), score 0..9
+    papi_employees = has_profile[rng.random(m) < 0.9]
+    tables['papi_scores'] = pd.DataFrame({
+        'employee_id': np.repeat(employee_ids[papi_employees], len(PAPI_SCALES)),
+        'scale_code': np.tile(np.array(PAPI_SCALES, dtype=object), len(papi_employees)),
+        'score': rng.integers(0, 10, len(papi_employees) * len(PAPI_SCALES)),
+    })
+
+    # CliftonStrengths: top-N theme berbeda per employee (argsort random keys)
+    strength_employees = has_profile[rng.random(m) < 0.85]
+    themes = np.argsort(rng.random((len(strength_employees), len(STRENGTH_THEMES))), axis=1)[:, :STRENGTHS_PER_EMPLOYEE]
+    tables['strengths'] = pd.DataFrame({
+        'employee_id': np.repeat(employee_ids[strength_employees], STRENGTHS_PER_EMPLOYEE),
+        'rank': np.tile(np.arange(1, STRENGTHS_PER_EMPLOYEE + 1), len(strength_employees)),
+        'theme': np.array(STRENGTH_THEMES, dtype=object)[themes.ravel()],
+    })
+
+    # Performance rating 1..5 per tahun; employee baru hanya punya tahun terakhir
+    first_year = rng.integers(0, len(PERFORMANCE_YEARS), n)
+    years_per_employee = len(PERFORMANCE_YEARS) - first_year
+    rows = np.repeat(np.arange(n), years_per_employee)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(years_per_employee) - years_per_employee, years_per_employee)
+    tables['performance_yearly'] = pd.DataFrame({
+        'employee_id': employee_ids[rows],
+        'year': np.array(PERFORMANCE_YEARS)[first_year[rows] + offsets],
+        'rating': rng.choice([1, 2, 3, 4, 5], len(rows), p=[0.05, 0.15, 0.45, 0.25, 0.10]),
+    })
+
+    return tables
+
+
+# =============================================================================
+# LOADERS: SQLite stand-in / PostgreSQL
+# =============================================================================
+
+def load_sqlite(conn, tables):
+    """Tulis semua tabel ke SQLite (replace) dengan index employee_id"""
+    for name, df in tables.items():
+        df.to_sql(name, conn, if_exists='replace', index=False, chunksize=100_000)
+        if 'employee_id' in df:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_employee_id ON {name} (employee_id)")
+    conn.commit()
+
+
+def read_sqlite(conn, names=None):
+    """Baca kembali tabel sumber dari SQLite sebagai dict nama -> DataFrame"""
+    names = names or [
+        'employees', 'profiles_psych', 'papi_scores', 'strengths', 'performance_yearly',
+        'dim_directorates', 'dim_divisions', 'dim_departments', 'dim_positions', 'dim_grades'
+    ]
+    return {name: pd.read_sql(f"SELECT * FROM {name}", conn) for name in names}
+
+
+def _postgres_type(dtype):
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'BIGINT'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'DOUBLE PRECISION'
+    return 'TEXT'
+
+
+def load_postgres(conn, tables, schema='talent_bench'):
+    """Buat ulang tabel di ``schema`` (terpisah dari data asli) lalu COPY semua baris.
+
+    Query app dijalankan terhadap schema ini dengan ``SET search_path``.
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        cur.execute(f"CREATE SCHEMA {schema}")
+        for name, df in tables.items():
+            columns = ', '.join(f'"{column}" {_postgres_type(dtype)}' for column, dtype in df.dtypes.items())
+            cur.execute(f"CREATE TABLE {schema}.{name} ({columns})")
+            # COPY per blok agar buffer CSV tidak sebesar seluruh tabel
+            for start in range(0, len(df), 200_000):
+                buffer = io.StringIO()
+                df.iloc[start:start + 200_000].to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cur.copy_expert(f"COPY {schema}.{name} FROM STDIN WITH (FORMAT csv)", buffer)
+            if 'employee_id' in df:
+                cur.execute(f"CREATE INDEX ON {schema}.{name} (employee_id)")
+            cur.execute(f"ANALYZE {schema}.{name}")
+    conn.commit()
+
+
+# =============================================================================
+# FEATURES STAND-IN: EMPLOYEE_FEATURES_QUERY dalam pandas (untuk SQLite)
+# =============================================================================
+
+def employee_features_from_tables(tables):
+    """Hasil yang sama dengan ``load_employee_features`` tanpa PostgreSQL.
+
+    Pivot PAPI / strengths, latest performance dan join dimensi dilakukan di
+    pandas; kolom dan urutannya sama dengan EMPLOYEE_FEATURES_QUERY.
+    """
+    employees = tables['employees']
+
+    papi = tables['papi_scores'].groupby(['employee_id', 'scale_code'])['score'].max().unstack()
+    papi.columns = [str(column).lower() for column in papi.columns]
+    papi = papi.reindex(columns=PAPI_COLUMNS)
+
+    strengths = tables['strengths']
+    theme_columns = {theme: 'strength_' + theme.lower().replace('-', '_') for theme in STRENGTH_THEMES}
+    flags = strengths.assign(flag=1).groupby(['employee_id', 'theme'])['flag'].max().unstack(fill_value=0)
+    flags = flags.rename(columns=theme_columns).reindex(columns=STRENGTH_COLUMNS, fill_value=0)
+    top = strengths[strengths['rank'] <= 3].sort_values(['employee_id', 'rank'])
+    flags['top_strengths'] = top.groupby('employee_id')['theme'].agg(', '.join)
+
+    latest = tables['performance_yearly'].sort_values(['employee_id', 'year']).drop_duplicates('employee_id', keep='last')
+
+    df = employees[['employee_id', 'fullname']].copy()
+    for prefix, dimension in [('position', 'dim_positions'), ('department', 'dim_departments'),
+                              ('division', 'dim_divisions'), ('directorate', 'dim_directorates'),
+                              ('grade', 'dim_grades')]:
+        names = tables[dimension].set_index(f'{prefix}_id')['name']
+        df[prefix] = employees[f'{prefix}_id'].map(names).to_numpy()
+
+    df = df.merge(tables['profiles_psych'], on='employee_id', how='left')
+    df = df.merge(papi, left_on='employee_id', right_index=True, how='left')
+    df = df.merge(flags, left_on='employee_id', right_index=True, how='left')
+    df[STRENGTH_COLUMNS] = df[STRENGTH_COLUMNS].fillna(0).astype(np.int64)
+    df = df.merge(latest[['employee_id', 'rating']], on='employee_id', how='left')
+    df = df.rename(columns={'rating': 'latest_performance'})
+
+    columns = ['employee_id', 'fullname', 'position', 'department', 'division', 'directorate', 'grade']
+    return df[columns + TV_FEATURE_COLUMNS + ['latest_performance']]
@@ -0,0 +1,172 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_profile import JOB_PROFILE_MODEL, StreamBuffer, fallback_job_profile, stream_job_profile
+from cache import JobProfileCache
+
+# =============================================================================
+# STUB OPENROUTER SERVER
+# =============================================================================
+
+PROFILE_DELTAS = ["Job requirements\n", "• SQL\n", "• Python\n\n", "Job description\n", "Builds dashboards."]
+
+
+def sse_event(payload):
+    return f"data: {json.dumps(payload)}\n\n".encode()
+
+
+def delta_event(content, finish_reason=None):
+    return sse_event({'choices': [{'delta': {'content': content}, 'finish_reason': finish_reason}]})
+
+
+def complete_stream():
+    # Keep-alive comment dan delta kosong harus diabaikan parser
+    body = b": OPENROUTER PROCESSING\n\n" + sse_event({'choices': [{'delta': {'role': 'assistant'}}]})
+    body += b"".join(delta_event(content) for content in PROFILE_DELTAS)
+    body += delta_event("", finish_reason="stop") + b"data: [DONE]\n\n"
+    return 200, body, None
+
+
+def unfinished_stream():
+    """Koneksi ditutup setelah dua delta, tanpa finish_reason / [DONE]"""
+    return 200, b"".join(delta_event(content) for content in PROFILE_DELTAS[:2]), None
+
+
+def truncated_stream():
+    """Content-Length lebih besar dari body: koneksi putus di tengah response"""
+    body = delta_event(PROFILE_DELTAS[0])
+    return 200, body, len(body) + 512
+
+
+def error_event_stream():
+    return 200, delta_event(PROFILE_DELTAS[0]) + sse_event({'error': {'message': 'upstream overloaded'}}), None
+
+
+def server_error():
+    return 500, b'{"error": {"message": "internal"}}', None
+
+
+class StubOpenRouter:
+    """HTTP server lokal yang merekam request dan menjawab dengan skenario SSE berurutan"""
+
+    def __init__(self, *scenarios):
+        self.scenarios = list(scenarios)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                stub.requests.append({'headers': dict(self.headers), 'body': json.loads(body)})
+                status, payload, content_length = stub.scenarios.pop(0)()
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/event-stream' if status == 200 else 'application/json')
+                if content_length is not None:
+                    self.send_header('Content-Length', str(content_length))
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(payload)
+                self.wfile.flush()
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/api/v1/chat/completions"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def profile_cache(tmp_path):
+    return JobProfileCache(str(tmp_path / "job_profiles.sqlite3"))
+
+
+def profile_stream(stub, cache=None):
+    return stream_job_profile(
+        "test-key", "Data Analyst", "Senior", "Turn data into decisions",
+        benchmark_context="Benchmark employees:\n• Ayu Lestari - Analyst (Data)",
+        api_url=stub.url, timeout=5, cache=cache
+    )
+
+
+def run_stream(stub, cache=None):
+    return list(profile_stream(stub, cache))
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_request_payload_and_headers():
+    with StubOpenRouter(complete_stream) as stub:
+        run_stream(stub)
+
+    request = stub.requests[0]
+    assert request['headers']['Authorization'] == "Bearer test-key"
+    body = request['body']
+    assert body['model'] == JOB_PROFILE_MODEL
+    assert body['stream'] is True
+    assert body['max_tokens'] == 800
+    assert [message['role'] for message in body['messages']] == ['user']
+    prompt = body['messages'][0]['content']
+    assert "Data Analyst position at Senior level" in prompt
+    assert "ROLE PURPOSE: Turn data into decisions" in prompt
+    assert "Ayu Lestari - Analyst (Data)" in prompt
+
+
+def test_deltas_render_incrementally_and_final_profile_is_cached(profile_cache):
+    with StubOpenRouter(complete_stream) as stub:
+        snapshots = run_stream(stub, profile_cache)
+        # Request identik dijawab dari cache tanpa HTTP call
+        cached = run_stream(stub, profile_cache)
+
+    expected = [''.join(PROFILE_DELTAS[:i + 1]) for i in range(len(PROFILE_DELTAS))]
+    assert snapshots == expected
+    assert snapshots[-1].startswith("Job requirements\n• SQL")
+    assert cached == [expected[-1]]
+    assert len(stub.requests) == 1
+
+
+@pytest.mark.parametrize('scenario', [unfinished_stream, truncated_stream, error_event_stream, server_error])
+def test_broken_stream_falls_back_and_is_not_cached(profile_cache, scenario):
+    fallback = fallback_job_profile("Data Analyst", "Turn data into decisions")
+    with StubOpenRouter(scenario, complete_stream) as stub:
+        snapshots = run_stream(stub, profile_cache)
+        # Fallback tidak disimpan: request berikutnya memanggil API lagi
+        retried = run_stream(stub, profile_cache)
+
+    assert snapshots[-1] == fallback
+    assert all(snapshot.startswith(PROFILE_DELTAS[0]) for snapshot in snapshots[:-1])
+    assert retried[-1] == ''.join(PROFILE_DELTAS)
+    assert len(stub.requests) == 2
+
+
+def test_unreachable_server_falls_back():
+    with StubOpenRouter() as stub:
+        url = stub.url
+    snapshots = list(stream_job_profile("test-key", "Data Analyst", "Senior", "Turn data into decisions",
+                                        api_url=url, timeout=2))
+    assert snapshots == [fallback_job_profile("Data Analyst", "Turn data into decisions")]
+
+
+def test_stream_buffer_consumed_in_background():
+    buffer = StreamBuffer()
+    with StubOpenRouter(complete_stream) as stub:
+        thread = threading.Thread(target=buffer.consume, args=(profile_stream(stub),))
+        thread.start()
+        assert buffer.wait(5)
+        thread.join()
+    assert buffer.done()
+    assert buffer.text == ''.join(PROFILE_DELTAS)
@@ -0,0 +1,505 @@
+import math
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import streaming
+from features import PAPI_COLUMNS, STRENGTH_COLUMNS
+from scoring import (TGV_COLUMNS, TGV_KEYS, TGV_NAMES, IncrementalBaseline, PopulationStats, ScoreHistogram, TGVIndex,
+                     TGVScoringEngine, baseline_vector, compile_weights)
+from sharding import ShardedScorer
+
+# =============================================================================
+# SQL REFERENCE: formula TV / TGV / final match rate dari query lama di app.py
+# =============================================================================
+
+# tgv_calculations + match_calculations dari get_ranked_talent_with_tv_tgv_details
+# (baseline commit), hanya ``::numeric`` yang dihapus agar jalan di SQLite
+TGV_CALCULATIONS_SQL = """
+    SELECT
+        *,
+        (
+            COALESCE((CASE WHEN disc = 'S' THEN 1.0 ELSE 0.0 END), 0) +
+            COALESCE(papi_t/10, 0) +
+            COALESCE(papi_e/10, 0) +
+            COALESCE(strength_adaptability, 0)
+        ) / 4 AS tv_adaptability,
+        (
+            COALESCE(gtq/100, 0) +
+            COALESCE(tiki/100, 0) +
+            COALESCE(iq/100, 0) +
+            COALESCE(papi_i/10, 0) +
+            COALESCE(strength_connectedness, 0) +
+            COALESCE(strength_analytical, 0) +
+            COALESCE(strength_strategic, 0)
+        ) / 7 AS tv_cognitive,
+        (
+            COALESCE((CASE WHEN disc = 'C' THEN 1.0 ELSE 0.0 END), 0) +
+            COALESCE(papi_c/10, 0) +
+            COALESCE(papi_d/10, 0) +
+            COALESCE(strength_deliberative, 0) +
+            COALESCE(strength_discipline, 0)
+        ) / 5 AS tv_conscientiousness,
+        (
+            COALESCE((CASE WHEN mbti LIKE '%N%' THEN 1.0 ELSE 0.0 END), 0) +
+            COALESCE(papi_z/10, 0) +
+            COALESCE(strength_futuristic, 0) +
+            COALESCE(strength_ideation, 0)
+        ) / 4 AS tv_creativity,
+        COALESCE(strength_belief, 0) AS tv_cultural_values,
+        (
+            COALESCE((CASE WHEN mbti LIKE 'E%' THEN 1.0 ELSE 0.0 END), 0) +
+            COALESCE((CASE WHEN mbti LIKE 'I%' THEN 0.5 ELSE 0.0 END), 0) +
+            COALESCE((CASE WHEN disc = 'D' THEN 1.0 ELSE 0.0 END), 0) +
+            COALESCE(papi_l/10, 0) +
+            COALESCE(papi_p/10, 0) +
+            COALESCE(strength_arranger, 0) +
+            COALESCE(strength_command, 0) +
+            COALESCE(strength_self_assurance, 0) +
+            COALESCE(strength_developer, 0)
+        ) / 9 AS tv_leadership,
+        (
+            COALESCE(pauli/100, 0) +
+            COALESCE(papi_a/10, 0) +
+            COALESCE(strength_achiever, 0)
+        ) / 3 AS tv_motivation,
+        (
+            COALESCE((CASE WHEN disc = 'I' THEN 1.0 ELSE 0.0 END), 0) +
+            COALESCE(papi_s/10, 0) +
+            COALESCE(strength_communication, 0) +
+            COALESCE(strength_woo, 0) +
+            COALESCE(strength_relator, 0)
+        ) / 5 AS tv_social
+    FROM employee_data
+"""
+
+RANKING_SQL = f"""
+WITH tgv_calculations AS ({TGV_CALCULATIONS_SQL} WHERE fullname IS NOT NULL)
+SELECT
+    employee_id,
+    {', '.join(TGV_COLUMNS)},
+    (1 - (SQRT(
+        POW(COALESCE(tv_adaptability, 0) - ?, 2) +
+        POW(COALESCE(tv_cognitive, 0) - ?, 2) +
+        POW(COALESCE(tv_conscientiousness, 0) - ?, 2) +
+        POW(COALESCE(tv_creativity, 0) - ?, 2) +
+        POW(COALESCE(tv_cultural_values, 0) - ?, 2) +
+        POW(COALESCE(tv_leadership, 0) - ?, 2) +
+        POW(COALESCE(tv_motivation, 0) - ?, 2) +
+        POW(COALESCE(tv_social, 0) - ?, 2)
+    ) / 8)) * 100 AS final_match_rate
+FROM tgv_calculations
+ORDER BY final_match_rate DESC
+"""
+
+BASELINE_SQL = f"""
+WITH tgv_calculations AS ({{tgv_calculations}})
+SELECT {', '.join(f'AVG({column})' for column in TGV_COLUMNS)}
+FROM tgv_calculations
+WHERE employee_id IN ({{placeholders}})
+"""
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def employee_data():
+    """Raw employee features dengan kombinasi DISC / MBTI, NULL dan strengths yang berbeda"""
+    rows = [
+        ('EMP001', 'Ayu Lestari', 'S', 'ENFP', 30, 7, 110, 60, 'Adaptability Woo Achiever'),
+        ('EMP002', 'Budi Santoso', 'C', 'INTJ', 35, 9, 125, 75, 'Analytical Strategic Deliberative'),
+        ('EMP003', 'Citra Dewi', None, None, None, None, None, None, ''),
+        ('EMP004', 'Dimas Pratama', 'DI', 'ISTP', 22, 5, 98, 40, 'Command Belief'),
+        ('EMP005', 'Eka Putri', 'I', 'ENTJ', 28, None, 104, 55, 'Communication Relator Developer Ideation'),
+        ('EMP006', 'Fajar Nugroho', 'D', 'ESFJ', 31, 6, None, 80, 'Arranger Self-Assurance Futuristic'),
+        ('EMP007', None, 'S', 'INFP', 26, 4, 101, 50, 'Connectedness Discipline'),
+    ]
+    records = []
+    for i, (employee_id, fullname, disc, mbti, gtq, tiki, iq, pauli, themes) in enumerate(rows):
+        record = {
+            'employee_id': employee_id, 'fullname': fullname, 'disc': disc, 'mbti': mbti,
+            'gtq': gtq, 'tiki': tiki, 'iq': iq, 'pauli': pauli
+        }
+        # Sebagian PAPI scale NULL (employee tanpa PAPI sama sekali: EMP003)
+        for j, column in enumerate(PAPI_COLUMNS):
+            record[column] = None if employee_id == 'EMP003' or (i + j) % 5 == 0 else (i * 3 + j * 7) % 10
+        flags = {theme.lower().replace('-', '_') for theme in themes.split()}
+        for column in STRENGTH_COLUMNS:
+            record[column] = int(column[len('strength_'):] in flags)
+        records.append(record)
+
+    df = pd.DataFrame(records)
+    numeric = ['gtq', 'tiki', 'iq', 'pauli'] + PAPI_COLUMNS
+    df[numeric] = df[numeric].astype(float)
+    return df
+
+
+@pytest.fixture
+def sql_conn(employee_data):
+    conn = sqlite3.connect(':memory:')
+    conn.create_function('SQRT', 1, math.sqrt)
+    conn.create_function('POW', 2, math.pow)
+    # LIKE di PostgreSQL case-sensitive
+    conn.execute('PRAGMA case_sensitive_like = ON')
+    employee_data.to_sql('employee_data', conn, index=False)
+    yield conn
+    conn.close()
+
+
+def sql_baseline(conn, benchmark_ids, tgv_calculations=TGV_CALCULATIONS_SQL):
+    query = BASELINE_SQL.format(placeholders=', '.join('?' * len(benchmark_ids)), tgv_calculations=tgv_calculations)
+    values = conn.execute(query, benchmark_ids).fetchone()
+    return dict(zip(TGV_KEYS, values))
+
+
+# =============================================================================
+# ENGINE == SQL
+# =============================================================================
+
+def test_baseline_matches_sql(employee_data, sql_conn):
+    benchmark_ids = ['EMP001', 'EMP002', 'EMP007']
+    baseline = TGVScoringEngine(employee_data).compute_baseline(benchmark_ids)
+    expected = sql_baseline(sql_conn, benchmark_ids)
+
+    assert baseline['benchmark_count'] == 3
+    np.testing.assert_allclose([baseline[key] for key in TGV_KEYS], [expected[key] for key in TGV_KEYS], atol=1e-6)
+
+
+@pytest.mark.parametrize('benchmark_ids', [['EMP001'], ['EMP002', 'EMP004'], ['EMP003', 'EMP005', 'EMP006']])
+def test_ranking_matches_sql(employee_data, sql_conn, benchmark_ids):
+    engine = TGVScoringEngine(employee_data)
+    baseline = engine.compute_baseline(benchmark_ids)
+    params = [baseline[key] for key in TGV_KEYS]
+    expected = pd.read_sql(RANKING_SQL, sql_conn, params=params)
+
+    ranked = engine.rank(baseline)
+
+    # Employee tanpa fullname tidak di-ranking, sama dengan WHERE e.fullname IS NOT NULL
+    assert sorted(ranked['employee_id']) == sorted(expected['employee_id'])
+    merged = ranked.merge(expected, on='employee_id', suffixes=('', '_sql'))
+    for column in TGV_COLUMNS:
+        np.testing.assert_allclose(merged[column], merged[f'{column}_sql'], atol=1e-6, err_msg=column)
+    np.testing.assert_allclose(merged['final_match_rate'], merged['final_match_rate_sql'], atol=1e-4)
+    np.testing.assert_allclose(
+        ranked['final_match_rate'].to_numpy(), np.sort(expected['final_match_rate'].to_numpy())[::-1], atol=1e-4
+    )
+
+
+
+# =============================================================================
+# DATA VERSION
+# =============================================================================
+
+@pytest.mark.parametrize('column, value', [
+    ('fullname', 'Ayu L.'), ('grade', 'V'), ('directorate', 'Finance'), ('latest_performance', 2), ('iq', 111.0)
+])
+def test_data_version_changes_with_any_returned_column(employee_data, column, value):
+    employee_data = employee_data.assign(grade='IV', directorate='Technology', latest_performance=4)
+    changed = employee_data.copy()
+    changed.loc[0, column] = value
+
+    # Stamp deterministik untuk data yang sama, berubah jika satu kolom display / organisasi berubah
+    assert TGVScoringEngine(employee_data).data_version == TGVScoringEngine(employee_data.copy()).data_version
+    assert TGVScoringEngine(changed).data_version != TGVScoringEngine(employee_data).data_version
+
+
+
+# =============================================================================
+# POPULATION STATS: incremental sync == recompute
+# =============================================================================
+
+def with_groups(employee_data):
+    return employee_data.assign(
+        directorate=['Technology', 'Finance', 'Technology', None, 'Finance', 'Technology', 'Finance'],
+        grade=['III', 'IV', 'IV', 'V', 'III', 'IV', 'V']
+    )
+
+
+def assert_stats_equal(stats, expected):
+    assert stats.count() == expected.count()
+    for column in expected.group_columns:
+        assert stats.group_values(column) == expected.group_values(column)
+    groups = [None] + [(column, value) for column in expected.group_columns for value in expected.group_values(column)]
+    for group in groups:
+        assert stats.count(group) == expected.count(group), group
+        np.testing.assert_allclose(stats.moments(group).mean, expected.moments(group).mean, atol=1e-9)
+        np.testing.assert_allclose(stats.moments(group).comoment, expected.moments(group).comoment, atol=1e-9)
+
+
+def move_grade(df):
+    return df.assign(grade='VI')
+
+
+def change_tv(df):
+    return df.assign(iq=df['iq'].where(df['employee_id'] != 'EMP002', 90.0))
+
+
+def remove_employee(df):
+    return df[df['employee_id'] != 'EMP004']
+
+
+def add_employee(df):
+    return pd.concat([df, df.iloc[[0]].assign(employee_id='EMP008', grade='V')], ignore_index=True)
+
+
+def drop_fullname(df):
+    return df.assign(fullname=df['fullname'].where(df['employee_id'] != 'EMP001', None))
+
+
+@pytest.mark.parametrize('change', [move_grade, change_tv, remove_employee, add_employee, drop_fullname])
+def test_population_stats_sync_matches_recompute(employee_data, change):
+    employee_data = with_groups(employee_data)
+    stats = PopulationStats()
+    stats.sync(TGVScoringEngine(employee_data))
+
+    engine = TGVScoringEngine(change(employee_data))
+    assert stats.sync(engine) > 0
+    expected = PopulationStats()
+    expected.sync(engine)
+    assert_stats_equal(stats, expected)
+    # Sync kedua dengan engine yang sama tidak mengubah apa pun
+    assert stats.sync(engine) == 0
+
+
+def test_population_stats_sync_catches_membership_only_change(employee_data):
+    employee_data = with_groups(employee_data)
+    stats = PopulationStats()
+    stats.sync(TGVScoringEngine(employee_data))
+
+    # Stamp yang sama (mis. versi yang tidak mencakup kolom grup) tidak boleh menahan update grup
+    engine = TGVScoringEngine(move_grade(employee_data))
+    engine.data_version = stats.data_version
+    assert stats.sync(engine) == stats.count()
+    assert stats.group_values('grade') == ['VI']
+    assert stats.count(('grade', 'VI')) == stats.count()
+
+# =============================================================================
+# SCORE HISTOGRAM
+# =============================================================================
+
+@pytest.mark.parametrize('n', [1, 7, 5000])
+def test_histogram_distribution_counts_are_exact(n):
+    scores = np.random.default_rng(n).normal(80, 6, n)
+    # Merge per chunk harus sama dengan satu histogram atas semua scores
+    histogram = ScoreHistogram()
+    for chunk in np.array_split(scores, 3):
+        histogram.merge(ScoreHistogram().add(chunk))
+    distribution = histogram.distribution(bins=20)
+
+    edges = distribution['edges']
+    assert len(distribution['counts']) <= 20
+    assert len(edges) == len(distribution['counts']) + 1
+    # Edges jatuh di batas bin 0.05: setiap score masuk tepat satu bin chart
+    np.testing.assert_allclose(edges / histogram.width, np.round(edges / histogram.width), atol=1e-6)
+    fine = np.floor(scores / histogram.width)
+    expected = [np.sum((fine >= round(lo / histogram.width)) & (fine < round(hi / histogram.width)))
+                for lo, hi in zip(edges[:-1], edges[1:])]
+    assert distribution['counts'].tolist() == expected
+    assert distribution['count'] == n
+    assert distribution['mean'] == pytest.approx(scores.mean())
+
+
+# =============================================================================
+# TGV INDEX: KD-tree query == full scan
+# =============================================================================
+
+def with_ties(employee_data):
+    """Setiap employee muncul dua kali (ID berbeda): semua score ber-tie, tie-break = urutan baris"""
+    grouped = with_groups(employee_data)
+    duplicate = grouped.assign(employee_id=grouped['employee_id'] + 'B')
+    return pd.concat([grouped, duplicate], ignore_index=True)
+
+
+@pytest.mark.parametrize('grades', [None, ['IV'], ['III', 'V']])
+@pytest.mark.parametrize('k', [1, 3, 6])
+def test_nearest_index_matches_sql(employee_data, sql_conn, grades, k):
+    grouped = with_groups(employee_data)
+    engine = TGVScoringEngine(grouped)
+    # Paksa jalur KD-tree walaupun populasi kecil
+    engine.NEAREST_INDEX_RATIO = 0
+    baseline = engine.compute_baseline(['EMP002', 'EMP005'])
+    filters = {'grade': grades} if grades else None
+
+    expected = pd.read_sql(RANKING_SQL, sql_conn, params=[baseline[key] for key in TGV_KEYS])
+    if grades:
+        expected = expected[expected['employee_id'].isin(grouped.loc[grouped['grade'].isin(grades), 'employee_id'])]
+    expected = expected.head(k)
+
+    nearest = engine.nearest(baseline, k=k, filters=filters)
+    assert nearest['employee_id'].tolist() == expected['employee_id'].tolist()
+    np.testing.assert_allclose(nearest['final_match_rate'], expected['final_match_rate'], atol=1e-4)
+
+
+@pytest.mark.parametrize('leaf_size', [1, 2, 512])
+@pytest.mark.parametrize('grades', [None, ['IV'], ['III', 'V']])
+@pytest.mark.parametrize('k', [1, 5, 14])
+def test_index_query_matches_ranking_with_ties(employee_data, leaf_size, grades, k):
+    engine = TGVScoringEngine(with_ties(employee_data))
+    baseline = engine.compute_baseline(['EMP001', 'EMP004'])
+    filters = {'grade': grades} if grades else None
+    index = TGVIndex(engine.tgv_matrix, leaf_size=leaf_size)
+
+    rows, scores = index.query(baseline_vector(baseline), k, mask=engine.filter_mask(filters))
+    expected = engine.ranking(baseline, filters=filters).top(k)
+    assert engine.employee_ids[rows].tolist() == expected['employee_id'].tolist()
+    np.testing.assert_array_equal(scores, expected['final_match_rate'].to_numpy())
+
+
+# =============================================================================
+# SHARDED SCORING: merge local top-K per shard == Ranking.top
+# =============================================================================
+
+@pytest.mark.parametrize('shard_by, shards', [(None, 1), (None, 3), (None, 14), ('grade', None), ('directorate', None)])
+def test_sharded_top_matches_ranking(employee_data, shard_by, shards):
+    engine = TGVScoringEngine(with_ties(employee_data))
+    baseline = engine.compute_baseline(['EMP002', 'EMP006'])
+
+    with ShardedScorer(engine, workers=2, shards=shards, shard_by=shard_by) as scorer:
+        for k in [1, 5, 14]:
+            pd.testing.assert_frame_equal(scorer.top(baseline, k), engine.ranking(baseline).top(k))
+        _, _, histogram = scorer.scan(baseline, 5)
+    assert histogram.distribution()['counts'].tolist() == engine.ranking(baseline).distribution()['counts'].tolist()
+
+
+# =============================================================================
+# WEIGHTED MATCHING: compile_weights == weighted SQL reference
+# =============================================================================
+
+# TV weight IQ = 3: IQ dihitung tiga kali di rata-rata Cognitive (7 TV -> total bobot 9)
+IQ_WEIGHTED_TGV_CALCULATIONS_SQL = TGV_CALCULATIONS_SQL.replace(
+    "COALESCE(iq/100, 0) +", "3 * COALESCE(iq/100, 0) +"
+).replace(") / 7 AS tv_cognitive", ") / 9 AS tv_cognitive")
+
+# TGV weights: squared distance per TGV dikali bobot yang dinormalisasi ke total 8
+WEIGHTED_RANKING_SQL = """
+WITH tgv_calculations AS ({tgv_calculations} WHERE fullname IS NOT NULL)
+SELECT
+    employee_id,
+    {columns},
+    (1 - (SQRT(
+        {distance}
+    ) / 8)) * 100 AS final_match_rate
+FROM tgv_calculations
+ORDER BY final_match_rate DESC
+"""
+
+
+def sql_weighted_ranking(conn, tgv_calculations, baseline, tgv_weights):
+    query = WEIGHTED_RANKING_SQL.format(
+        tgv_calculations=tgv_calculations,
+        columns=', '.join(TGV_COLUMNS),
+        distance=' +\n        '.join(f"? * POW(COALESCE({column}, 0) - ?, 2)" for column in TGV_COLUMNS)
+    )
+    scales = np.asarray(tgv_weights, dtype=float) * len(TGV_KEYS) / np.sum(tgv_weights)
+    params = [value for scale, key in zip(scales, TGV_KEYS) for value in (float(scale), baseline[key])]
+    return pd.read_sql(query, conn, params=params)
+
+
+@pytest.mark.parametrize('weights_config', [
+    {'TGV': {'Leadership & Influence': 2, 'Cognitive Complexity & Problem-Solving': 0.5}},
+    {'TV': {'IQ: Overall IQ Score': 3}},
+    {'TGV': {'Motivation & Drive': 3}, 'TV': {'IQ: Overall IQ Score': 3}},
+])
+def test_weighted_ranking_matches_sql(employee_data, sql_conn, weights_config):
+    weights = compile_weights(weights_config)
+    benchmark_ids = ['EMP002', 'EMP005']
+    tgv_calculations = TGV_CALCULATIONS_SQL
+    if 'TV' in weights_config:
+        assert IQ_WEIGHTED_TGV_CALCULATIONS_SQL != TGV_CALCULATIONS_SQL
+        tgv_calculations = IQ_WEIGHTED_TGV_CALCULATIONS_SQL
+    key_names = {key: name for name, key in TGV_NAMES.items()}
+    tgv_weights = [weights_config.get('TGV', {}).get(key_names[key], 1.0) for key in TGV_KEYS]
+
+    engine = TGVScoringEngine(employee_data)
+    baseline = engine.compute_baseline(benchmark_ids, weights)
+    expected_baseline = sql_baseline(sql_conn, benchmark_ids, tgv_calculations)
+    np.testing.assert_allclose([baseline[key] for key in TGV_KEYS], [expected_baseline[key] for key in TGV_KEYS], atol=1e-6)
+
+    expected = sql_weighted_ranking(sql_conn, tgv_calculations, baseline, tgv_weights)
+    ranked = engine.rank(baseline, weights)
+    assert ranked['employee_id'].tolist() == expected['employee_id'].tolist()
+    for column in TGV_COLUMNS:
+        np.testing.assert_allclose(ranked[column], expected[column], atol=1e-6, err_msg=column)
+    np.testing.assert_allclose(ranked['final_match_rate'], expected['final_match_rate'], atol=1e-4)
+
+
+def test_equal_weights_compile_to_unweighted():
+    assert compile_weights({'TGV': {name: 2 for name in TGV_NAMES}}) is None
+    assert compile_weights({'TV': {'IQ: Overall IQ Score': 1}}) is None
+    assert compile_weights('{}') is None
+
+
+# =============================================================================
+# INCREMENTAL BASELINE: add / remove per benchmark == compute_baseline
+# =============================================================================
+
+# Urutan pilihan benchmark di picker; ID tidak dikenal dan duplikat diabaikan
+BENCHMARK_SELECTIONS = [
+    ['EMP001'],
+    ['EMP001', 'EMP002'],
+    ['EMP001', 'EMP002', 'EMP003'],
+    ['EMP002', 'EMP003'],
+    ['EMP002', 'EMP003', 'EMP999'],
+    ['EMP003', 'EMP003', 'EMP006', 'EMP007'],
+    [],
+    ['EMP004'],
+]
+
+
+@pytest.mark.parametrize('weights_config', [None, {'TGV': {'Leadership & Influence': 2}, 'TV': {'IQ: Overall IQ Score': 3}}])
+def test_incremental_baseline_matches_compute_baseline(employee_data, sql_conn, weights_config):
+    engine = TGVScoringEngine(employee_data)
+    weights = compile_weights(weights_config)
+    incremental = IncrementalBaseline(engine, weights=weights)
+
+    for selection in BENCHMARK_SELECTIONS:
+        incremental.sync(selection)
+        expected = engine.compute_baseline(selection, weights)
+        assert incremental.baseline_dict() == expected, selection
+        if expected and weights is None:
+            known = [employee_id for employee_id in dict.fromkeys(selection) if employee_id != 'EMP999']
+            reference = sql_baseline(sql_conn, known)
+            np.testing.assert_allclose([expected[key] for key in TGV_KEYS], [reference[key] for key in TGV_KEYS], atol=1e-6)
+
+    ranking = incremental.ranking()
+    pd.testing.assert_frame_equal(ranking.top(7), engine.ranking(engine.compute_baseline(['EMP004'], weights), weights).top(7))
+
+
+# =============================================================================
+# STREAMING: chunked top-K + summaries == in-memory Ranking
+# =============================================================================
+
+@pytest.mark.parametrize('weights_config', [None, {'TGV': {'Leadership & Influence': 2}, 'TV': {'IQ: Overall IQ Score': 3}}])
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+@pytest.mark.parametrize('k', [1, 5, 14])
+def test_stream_ranking_matches_ranking(employee_data, monkeypatch, weights_config, chunk_size, k):
+    data = with_ties(employee_data)
+    # Server-side cursor diganti chunk dari DataFrame dengan urutan baris yang sama
+    monkeypatch.setattr(streaming, 'iter_employee_features', lambda conn, chunk_size=5000, stored=None: (
+        data.iloc[start:start + chunk_size].reset_index(drop=True) for start in range(0, len(data), chunk_size)
+    ))
+    monkeypatch.setattr(streaming, 'load_benchmark_features', lambda conn, benchmark_ids, stored=None: (
+        data[data['employee_id'].isin(benchmark_ids)].reset_index(drop=True)
+    ))
+    engine = TGVScoringEngine(data)
+    weights = compile_weights(weights_config)
+    benchmark_ids = ['EMP002', 'EMP006B']
+
+    baseline = streaming.stream_baseline(None, benchmark_ids, weights)
+    assert baseline == engine.compute_baseline(benchmark_ids, weights)
+
+    streamed = streaming.stream_ranking(None, baseline, k=k, chunk_size=chunk_size, weights=weights)
+    ranking = engine.ranking(baseline, weights)
+    columns = ['employee_id'] + TGV_COLUMNS + ['final_match_rate']
+    pd.testing.assert_frame_equal(streamed.top(k)[columns], ranking.top(k)[columns])
+    assert len(streamed) == len(ranking)
+    assert streamed.available == min(k, len(ranking))
+
+    distribution, expected = streamed.distribution(), ranking.distribution()
+    assert distribution['counts'].tolist() == expected['counts'].tolist()
+    assert distribution['mean'] == pytest.approx(expected['mean'])
+    pd.testing.assert_frame_equal(streamed.tgv_correlation(), ranking.tgv_correlation(), atol=1e-9)